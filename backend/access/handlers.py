@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CBACEntry
+
+
+@receiver([post_save, post_delete], sender=CBACEntry)
+def cbac_entry_post_save(sender, instance: CBACEntry, **kwargs):
+    CBACEntry.invalidate_cache(instance.user_id)  # type: ignore
@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, ClassVar
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.postgres.fields import HStoreField
+from django.core.cache import cache
 from django.db import models
 from django.utils.timezone import now
 
@@ -15,6 +16,7 @@ from intra.constants import SUPPORTED_APPS
 from ..constants import CBAC_VALID_AFTER_EVENT_DAYS
 
 Claims = dict[str, str]
+CachedEntry = tuple[datetime, datetime, Claims]  # valid_from, valid_until, claims
 logger = logging.getLogger("kompassi")
 
 
@@ -33,6 +35,9 @@ class CBACEntry(models.Model):
         "auth.Group", on_delete=models.CASCADE, null=True, blank=True, related_name="+"
     )
 
+    # bumped whenever any CBACEntry changes in this process; invalidates entries cached on user objects
+    _cache_generation: ClassVar[int] = 0
+
     def __str__(self):
         return ", ".join(f"{key}={value}" for (key, value) in dict(user=self.user.username, **self.claims).items())
 
@@ -80,9 +85,61 @@ class CBACEntry(models.Model):
 
         return queryset
 
+    @staticmethod
+    def get_cache_key(user_id: int) -> str:
+        return f"access.cbac_entries:{user_id}"
+
+    @classmethod
+    def get_cached_entries(cls, user: AbstractUser) -> list[CachedEntry]:
+        """
+        Returns the entries of the user that have not yet expired, loading them only once per request.
+
+        They are cached on the user object, which is request-scoped as request.user is recreated for every request.
+        If KOMPASSI_CBAC_CACHE_TTL_SECONDS is set, they are also cached across requests in the Django cache.
+        Both are invalidated when any CBACEntry of the user is saved or deleted (see access/handlers.py).
+        """
+        cached = getattr(user, "_cbac_entries_cache", None)
+        if cached is not None and cached[0] == cls._cache_generation:
+            return cached[1]
+
+        ttl: int = settings.KOMPASSI_CBAC_CACHE_TTL_SECONDS
+        cache_key = cls.get_cache_key(user.id)  # type: ignore
+
+        entries: list[CachedEntry] | None = cache.get(cache_key) if ttl else None
+        if entries is None:
+            entries = list(
+                cls.objects.filter(user=user, valid_until__gt=now()).values_list(
+                    "valid_from",
+                    "valid_until",
+                    "claims",
+                )
+            )
+            if ttl:
+                cache.set(cache_key, entries, ttl)
+
+        user._cbac_entries_cache = (cls._cache_generation, entries)  # type: ignore
+        return entries
+
     @classmethod
     def is_allowed(cls, user: AbstractUser, claims: Claims, t: datetime | None = None):
-        return cls.get_entries(user, claims, t=t).exists()
+        if t is not None:
+            # only entries that have not yet expired are cached
+            return cls.get_entries(user, claims, t=t).exists()
+
+        if not user.is_authenticated:
+            return False
+
+        # Python equivalent of get_entries(user, claims).exists()
+        t = now()
+        return any(
+            valid_from <= t < valid_until and all(claims.get(key) == value for key, value in entry_claims.items())
+            for valid_from, valid_until, entry_claims in cls.get_cached_entries(user)
+        )
+
+    @classmethod
+    def invalidate_cache(cls, user_id: int):
+        cls._cache_generation += 1
+        cache.delete(cls.get_cache_key(user_id))
 
     @classmethod
     def ensure_admin_group_privileges(cls, t: datetime | None = None):
@@ -105,3 +105,34 @@ def test_ensure_admin_group_privileges(db):
 
     assert not CBACEntry.is_allowed(person.user, get_claims(event, "labour"))
     assert not CBACEntry.is_allowed(person.user, get_claims(event, "programme"))
+
+
+def test_cbac_entries_cached_per_request(db, django_assert_num_queries):
+    """
+    Given a person with labour admin privileges for an event
+    When their permissions are checked multiple times with the same user object (as within a request)
+    Then their CBAC entries are loaded only once
+
+    When their CBAC entries are removed
+    Then the cached entries are no longer used
+    """
+
+    meta, unused = LabourEventMeta.get_or_create_dummy()
+    event = meta.event
+    person, unused = Person.get_or_create_dummy()
+
+    meta.admin_group.user_set.add(person.user)
+    CBACEntry.ensure_admin_group_privileges()
+
+    user = person.user
+    labour_claims = get_claims(event, "labour")
+    programme_claims = get_claims(event, "programme")
+
+    with django_assert_num_queries(1):
+        assert CBACEntry.is_allowed(user, labour_claims)
+        assert not CBACEntry.is_allowed(user, programme_claims)
+        assert CBACEntry.is_allowed(user, dict(labour_claims, field="responses"))
+
+    CBACEntry.objects.filter(user=user).delete()
+
+    assert not CBACEntry.is_allowed(user, labour_claims)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class BadgesAppConfig(AppConfig):
+    name = "badges"
+    verbose_name = _("Badges")
+
+    def ready(self):
+        from . import handlers  # noqa: F401
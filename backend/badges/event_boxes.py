@@ -0,0 +1,6 @@
+from core.event_box_registry import register
+
+from .views import badges_event_box_context
+
+# badge counts change in bulk updates that do not send signals, so the progress shown to admins is not cached
+register("badges", badges_event_box_context, cache=False)
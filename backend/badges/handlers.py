@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from labour.models import PersonnelClass
+
+from .models import Badge
+
+
+@receiver(post_save, sender=PersonnelClass)
+def personnel_class_post_save(sender, instance: PersonnelClass, *, created: bool, **kwargs):
+    # the name of the personnel class is printed on the badge
+    if not created:
+        Badge.refresh_moon_runes_qs(Badge.objects.filter(personnel_class=instance))
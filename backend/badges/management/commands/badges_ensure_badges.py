@@ -0,0 +1,47 @@
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    args = "[event_slug...]"
+    help = "Create missing and revoke out-of-date badges for everyone involved in the event"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "event_slugs",
+            nargs="+",
+            metavar="EVENT_SLUG",
+        )
+
+    def handle(self, *args, **options):
+        from badges.models import Badge
+        from core.models import Event, Person
+        from labour.models import Signup
+        from programme.models import ProgrammeRole
+
+        for event_slug in options["event_slugs"]:
+            event = Event.objects.get(slug=event_slug)
+
+            # People who have a badge but should no longer have one are included so that it gets revoked.
+            persons = Person.objects.filter(
+                Q(id__in=Signup.objects.filter(event=event).values("person_id"))
+                | Q(id__in=ProgrammeRole.objects.filter(programme__category__event=event).values("person_id"))
+                | Q(
+                    id__in=Badge.objects.filter(
+                        personnel_class__event=event,
+                        revoked_at__isnull=True,
+                    ).values("person_id")
+                )
+            ).order_by("id")
+
+            num_created = 0
+            for batch in batched(persons.iterator(), BATCH_SIZE):
+                num_created += sum(
+                    created for (badge, created) in Badge.ensure_many(event=event, persons=batch).values()
+                )
+
+            self.stdout.write(f"{event_slug}: {num_created} badges created")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    args = "[event_slug...]"
+    help = (
+        "Recompute the moon rune flag of badges (all events if none are given). "
+        "Needed once after deploying badges migration 0027. Personnel class renames are handled automatically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "event_slugs",
+            nargs="*",
+            metavar="EVENT_SLUG",
+        )
+
+    def handle(self, *args, **options):
+        from badges.models import Badge
+
+        badges = Badge.objects.all()
+        if options["event_slugs"]:
+            badges = badges.filter(personnel_class__event__slug__in=options["event_slugs"])
+
+        num_updated = Badge.refresh_moon_runes_qs(badges)
+
+        self.stdout.write(f"{num_updated} badges updated")
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("badges", "0026_remove_badgeseventmeta_badge_layout"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="badge",
+            name="has_moon_runes",
+            field=models.BooleanField(
+                default=False,
+                help_text="Set automatically when the badge is saved. A badge with moon runes is one whose contents cannot be encoded into ISO-8859-1.",
+                verbose_name="Has moon runes",
+            ),
+        ),
+    ]
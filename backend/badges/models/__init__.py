@@ -1,4 +1,4 @@
 from .badge import Badge
 from .badges_event_meta import BadgesEventMeta
 from .batch import Batch
-from .count_badges_mixin import CountBadgesMixin
+from .count_badges_mixin import BadgeCounts, CountBadgesMixin
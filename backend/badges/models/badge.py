@@ -1,10 +1,13 @@
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import batched
 
 from django.conf import settings
 from django.db import connection, models, transaction
 from django.utils.html import escape
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from pkg_resources import resource_string
 
@@ -14,6 +17,7 @@ from core.models.event import Event
 from core.utils import time_bool_property
 
 from ..proxies.badge.privacy import BadgePrivacyAdapter
+from .batch import contains_moon_runes
 
 logger = logging.getLogger("kompassi")
 
@@ -142,6 +146,18 @@ class Badge(models.Model, CsvExportMixin):
     is_printed_separately = time_bool_property("printed_separately_at")
     is_arrived = time_bool_property("arrived_at")
 
+    # Also refreshed when the personnel class is saved (see badges/handlers.py). Badges that existed before
+    # this field need `python manage.py badges_update_moon_runes` once. QuerySet.update paths (revoke_many,
+    # batch assignment) do not touch fields that end up in the badge, so they need no refresh.
+    has_moon_runes = models.BooleanField(
+        default=False,
+        verbose_name=_("Has moon runes"),
+        help_text=_(
+            "Set automatically when the badge is saved. "
+            "A badge with moon runes is one whose contents cannot be encoded into ISO-8859-1."
+        ),
+    )
+
     notes = models.TextField(
         default="",
         blank=True,
@@ -151,6 +167,38 @@ class Badge(models.Model, CsvExportMixin):
         ),
     )
 
+    def save(self, *args, **kwargs):
+        self.has_moon_runes = self.get_has_moon_runes()
+        return super().save(*args, **kwargs)
+
+    @classmethod
+    def refresh_moon_runes_qs(cls, badges: models.QuerySet["Badge"], batch_size: int = 1000) -> int:
+        """
+        Recomputes has_moon_runes of the badges and saves those that changed. Returns the number of those.
+        Needed when the contents of badges change without Badge.save (eg. the personnel class is renamed).
+        """
+        num_updated = 0
+        badges = badges.select_related("personnel_class").order_by("id")
+
+        for batch in batched(badges.iterator(chunk_size=batch_size), batch_size):
+            changed_badges = []
+
+            for badge in batch:
+                has_moon_runes = badge.get_has_moon_runes()
+                if badge.has_moon_runes != has_moon_runes:
+                    badge.has_moon_runes = has_moon_runes
+                    changed_badges.append(badge)
+
+            cls.objects.bulk_update(changed_badges, ["has_moon_runes"])
+            num_updated += len(changed_badges)
+
+        return num_updated
+
+    def get_has_moon_runes(self) -> bool:
+        # NOTE: Event is only used for many-to-many fields, of which badges have none
+        fields = self.get_csv_fields(None)
+        return contains_moon_runes("\n".join(str(value) for value in self.get_csv_row(None, fields, "comma_separated")))
+
     @property
     def row_css_class(self):
         return "success" if self.is_arrived else ""
@@ -236,6 +284,71 @@ class Badge(models.Model, CsvExportMixin):
 
             return badge, True
 
+    @classmethod
+    def ensure_many(cls, event, persons) -> dict[int, tuple["Badge | None", bool]]:
+        """
+        Like ensure, but for many persons of an event at once using a constant number of queries.
+
+        Returns a dictionary of person ID to what ensure would have returned for that person.
+        """
+        from badges.utils import default_badge_factory_many
+
+        persons = [person for person in persons if person]
+        if not persons:
+            return {}
+
+        with transaction.atomic():
+            existing_badges_by_person_id = defaultdict(list)
+            for badge in (
+                cls.objects.filter(
+                    personnel_class__event=event,
+                    person__in=persons,
+                    revoked_at__isnull=True,
+                )
+                .select_related("personnel_class")
+                .order_by("id")
+            ):
+                existing_badges_by_person_id[badge.person_id].append(badge)
+
+            expected_badge_opts_by_person_id = default_badge_factory_many(event, persons)
+
+            badges_to_revoke = []
+            badges_to_create = []
+            result = {}
+
+            for person in persons:
+                if person.id in result:
+                    continue
+
+                expected_badge_opts = expected_badge_opts_by_person_id[person.id]
+                existing_badges = existing_badges_by_person_id[person.id]
+
+                # There should be at most one un-revoked badge per person and event. Should there be more,
+                # keep the oldest one if it is up to date and revoke the rest.
+                if existing_badges and all(
+                    getattr(existing_badges[0], key) == value for (key, value) in expected_badge_opts.items()
+                ):
+                    badges_to_revoke.extend(existing_badges[1:])
+                    result[person.id] = existing_badges[0], False
+                    continue
+
+                badges_to_revoke.extend(existing_badges)
+
+                if expected_badge_opts.get("personnel_class") is None:
+                    # They should not have a badge.
+                    result[person.id] = None, False
+                    continue
+
+                badge = cls(**expected_badge_opts, person=person)
+                badge.has_moon_runes = badge.get_has_moon_runes()  # bulk_create does not call save
+                badges_to_create.append(badge)
+                result[person.id] = badge, True
+
+            cls.revoke_many(badges_to_revoke)
+            cls.objects.bulk_create(badges_to_create)
+
+        return result
+
     @classmethod
     def get_csv_fields(cls, event):
         return [
@@ -352,6 +465,30 @@ class Badge(models.Model, CsvExportMixin):
             self.delete()
             return None
 
+    @classmethod
+    def revoke_many(cls, badges, user=None):
+        """
+        Revokes many badges at once with the same semantics as revoke. Does not call save or delete on them.
+        """
+        ids_to_mark_revoked = []
+        ids_to_delete = []
+
+        for badge in badges:
+            if badge.is_revoked:
+                raise AssertionError("Already revoked")
+
+            if badge.is_printed_separately or badge.batch_id:
+                ids_to_mark_revoked.append(badge.id)
+            else:
+                ids_to_delete.append(badge.id)
+
+        if ids_to_mark_revoked:
+            t = now()
+            cls.objects.filter(id__in=ids_to_mark_revoked).update(revoked_at=t, revoked_by=user, updated_at=t)
+
+        if ids_to_delete:
+            cls.objects.filter(id__in=ids_to_delete).delete()
+
     def unrevoke(self):
         if not self.is_revoked:
             raise AssertionError("Not revoked")
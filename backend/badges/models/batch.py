@@ -54,32 +54,28 @@ class Batch(models.Model):
         else:
             badges = Badge.objects.filter(personnel_class__event=event)
 
+        badges = badges.filter(**BADGE_ELIGIBLE_FOR_BATCHING)
+
         if moon_rune_policy == "onlyinclude":
-            fields = Badge.get_csv_fields(event)
-            test = lambda badge: contains_moon_runes(badge.get_printable_text(fields))
+            badges = badges.filter(has_moon_runes=True)
         elif moon_rune_policy == "exclude":
-            fields = Badge.get_csv_fields(event)
-            test = lambda badge: not contains_moon_runes(badge.get_printable_text(fields))
+            badges = badges.filter(has_moon_runes=False)
         elif moon_rune_policy == "dontcare":
-            test = lambda badge: True
+            pass
         else:
             raise NotImplementedError(moon_rune_policy)
 
+        badge_ids = badges.order_by("created_at").values("id")
+        if max_items is not None:
+            badge_ids = badge_ids[:max_items]
+
         with transaction.atomic():
             batch = cls(personnel_class=personnel_class, event=event)
             batch.save()
 
-            badges = badges.filter(**BADGE_ELIGIBLE_FOR_BATCHING).order_by("created_at")
-            num_selected_badges = 0
-
-            for badge in badges:
-                if test(badge):
-                    badge.batch = batch
-                    badge.save()
-
-                    num_selected_badges += 1
-                    if max_items is not None and num_selected_badges >= max_items:
-                        break
+            # UPDATE ... WHERE id IN (SELECT ... LIMIT max_items)
+            # batch_id is checked again in case a concurrent batch got some of the badges first
+            Badge.objects.filter(id__in=badge_ids, batch__isnull=True).update(batch=batch, updated_at=now())
 
         return batch
 
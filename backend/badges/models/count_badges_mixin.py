@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from itertools import cycle
 
-from django.db.models import Q
+from django.db.models import Count, Q, QuerySet
 from django.utils.translation import gettext_lazy as _
 
 from .constants import BADGE_ELIGIBLE_FOR_BATCHING, PROGRESS_ELEMENT_MIN_WIDTH
@@ -17,27 +17,58 @@ class Progress:
     inflated: bool
 
 
-class CountBadgesMixin:
-    def count_printed_badges(self) -> int:
-        return (
-            self.badges.filter(
-                Q(batch__isnull=False, batch__printed_at__isnull=False) | Q(printed_separately_at__isnull=False)
-            )
-            .distinct()
-            .count()
+@dataclass
+class BadgeCounts:
+    """
+    Numbers of badges in different states. Computed with a single query using conditional aggregation.
+    """
+
+    total: int = 0
+    printed: int = 0
+    revoked: int = 0
+    waiting_in_batch: int = 0
+    awaiting_batch: int = 0
+
+    @staticmethod
+    def get_aggregates():
+        return dict(
+            total=Count("id"),
+            printed=Count(
+                "id",
+                filter=Q(batch__isnull=False, batch__printed_at__isnull=False) | Q(printed_separately_at__isnull=False),
+            ),
+            revoked=Count("id", filter=Q(revoked_at__isnull=False)),
+            waiting_in_batch=Count(
+                "id",
+                filter=Q(batch__isnull=False, batch__printed_at__isnull=True, revoked_at__isnull=True),
+            ),
+            awaiting_batch=Count("id", filter=Q(**BADGE_ELIGIBLE_FOR_BATCHING)),
         )
 
-    def count_badges_waiting_in_batch(self) -> int:
-        return self.badges.filter(batch__isnull=False, batch__printed_at__isnull=True, revoked_at__isnull=True).count()
-
-    def count_badges_awaiting_batch(self) -> int:
-        return self.badges.filter(**BADGE_ELIGIBLE_FOR_BATCHING).count()
-
-    def count_badges(self) -> int:
-        return self.badges.count()
+    @classmethod
+    def from_queryset(cls, badges: QuerySet) -> "BadgeCounts":
+        return cls(**badges.aggregate(**cls.get_aggregates()))
 
-    def count_revoked_badges(self) -> int:
-        return self.badges.filter(revoked_at__isnull=False).count()
+    @classmethod
+    def get_for_event_by_personnel_class(cls, event) -> dict[int, "BadgeCounts"]:
+        """
+        Returns badge counts of the event keyed by personnel class ID. Personnel classes without
+        badges are not included.
+        """
+        from .badge import Badge
+
+        return {
+            row.pop("personnel_class_id"): cls(**row)
+            for row in Badge.objects.filter(personnel_class__event=event)
+            .order_by()
+            .values("personnel_class_id")
+            .annotate(**cls.get_aggregates())
+        }
+
+    def __add__(self, other: "BadgeCounts") -> "BadgeCounts":
+        return BadgeCounts(
+            **{field.name: getattr(self, field.name) + getattr(other, field.name) for field in fields(self)}
+        )
 
     def get_progress(self):
         """
@@ -52,14 +83,14 @@ class CountBadgesMixin:
         """
         progress = []
 
-        pb_max = self.count_badges()
+        pb_max = self.total
         percentace_consumed_for_inflation = 0
 
         for pb_class, pb_text, pb_value in [
-            ("progress-bar-success", _("Printed"), self.count_printed_badges()),
-            ("progress-bar-danger", _("Revoked"), self.count_revoked_badges()),
-            ("progress-bar-info", _("Waiting in batch"), self.count_badges_waiting_in_batch()),
-            ("progress-bar-grey", _("Awaiting allocation into batch"), self.count_badges_awaiting_batch()),
+            ("progress-bar-success", _("Printed"), self.printed),
+            ("progress-bar-danger", _("Revoked"), self.revoked),
+            ("progress-bar-info", _("Waiting in batch"), self.waiting_in_batch),
+            ("progress-bar-grey", _("Awaiting allocation into batch"), self.awaiting_batch),
         ]:
             if pb_value > 0:
                 width = 100.0 * pb_value / max(pb_max, 1)
@@ -101,3 +132,32 @@ class CountBadgesMixin:
         # assert sum(p.width for p in progress) in [100, 0], "Missing percentage"
 
         return progress
+
+
+class CountBadgesMixin:
+    def count_printed_badges(self) -> int:
+        return (
+            self.badges.filter(
+                Q(batch__isnull=False, batch__printed_at__isnull=False) | Q(printed_separately_at__isnull=False)
+            )
+            .distinct()
+            .count()
+        )
+
+    def count_badges_waiting_in_batch(self) -> int:
+        return self.badges.filter(batch__isnull=False, batch__printed_at__isnull=True, revoked_at__isnull=True).count()
+
+    def count_badges_awaiting_batch(self) -> int:
+        return self.badges.filter(**BADGE_ELIGIBLE_FOR_BATCHING).count()
+
+    def count_badges(self) -> int:
+        return self.badges.count()
+
+    def count_revoked_badges(self) -> int:
+        return self.badges.filter(revoked_at__isnull=False).count()
+
+    def get_badge_counts(self) -> BadgeCounts:
+        return BadgeCounts.from_queryset(self.badges)
+
+    def get_progress(self):
+        return self.get_badge_counts().get_progress()
@@ -6,7 +6,7 @@ from core.models import Person
 from labour.models import JobCategory, LabourEventMeta, PersonnelClass, Signup
 from programme.models import Programme, ProgrammeEventMeta, ProgrammeRole, Role
 
-from .models import Badge, BadgesEventMeta, Batch
+from .models import Badge, BadgeCounts, BadgesEventMeta, Batch
 
 logger = logging.getLogger("kompassi")
 
@@ -283,3 +283,110 @@ class BadgesTestCase(TestCase):
         badge, created = Badge.ensure(person=self.person, event=self.event)
         assert not created
         assert badge.job_title == role2.title
+
+    def test_ensure_many(self):
+        """
+        Badge.ensure_many should do what Badge.ensure does for each person, only in bulk.
+        """
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        programme_role, unused = ProgrammeRole.get_or_create_dummy()
+        outsider = Person.objects.create(first_name="Outi", surname="Ulkopuolinen")
+
+        badge, created = Badge.ensure(person=self.person, event=self.event)
+        assert not created
+        assert badge.personnel_class == signup.personnel_classes.get()
+
+        result = Badge.ensure_many(event=self.event, persons=[self.person, outsider])
+        assert result == {self.person.id: (badge, False), outsider.id: (None, False)}
+
+        # Changed and not yet in a batch: removed and re-created
+        Person.objects.filter(id=self.person.id).update(first_name="Matilda")
+        self.person.refresh_from_db()
+
+        result = Badge.ensure_many(event=self.event, persons=[self.person, outsider])
+        new_badge, created = result[self.person.id]
+        assert created
+        assert new_badge.first_name == "Matilda"
+        assert not Badge.objects.filter(id=badge.id).exists()
+        assert Badge.objects.get(person=self.person, personnel_class__event=self.event) == new_badge
+
+        # Changed and already in a batch: revoked and re-created
+        batch = Batch.create(event=self.event)
+        assert batch.badges.get() == new_badge
+
+        Person.objects.filter(id=self.person.id).update(first_name="Markku")
+        self.person.refresh_from_db()
+
+        result = Badge.ensure_many(event=self.event, persons=[self.person, outsider])
+
+        newer_badge, created = result[self.person.id]
+        assert created
+        assert newer_badge.first_name == "Markku"
+
+        new_badge.refresh_from_db()
+        assert new_badge.is_revoked
+
+        badge, created = Badge.ensure(person=self.person, event=self.event)
+        assert not created
+        assert badge == newer_badge
+
+    def test_badge_counts(self):
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        personnel_class = signup.personnel_classes.get()
+
+        badge, created = Badge.ensure(person=self.person, event=self.event)
+        Batch.create(event=self.event)
+        badge.refresh_from_db()
+        badge.revoke()
+
+        Badge.ensure(person=self.person, event=self.event)
+
+        with self.assertNumQueries(1):
+            counts_by_personnel_class_id = BadgeCounts.get_for_event_by_personnel_class(self.event)
+
+        counts = counts_by_personnel_class_id[personnel_class.id]
+        assert counts == BadgeCounts(total=2, printed=0, revoked=1, waiting_in_batch=0, awaiting_batch=1)
+
+        with self.assertNumQueries(1):
+            assert self.meta.get_badge_counts() == counts
+
+        assert counts.total == self.meta.count_badges()
+        assert counts.printed == self.meta.count_printed_badges()
+        assert counts.revoked == self.meta.count_revoked_badges()
+        assert counts.waiting_in_batch == self.meta.count_badges_waiting_in_batch()
+        assert counts.awaiting_batch == self.meta.count_badges_awaiting_batch()
+
+    def test_batch_moon_rune_policy(self):
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        personnel_class = signup.personnel_classes.get()
+
+        latin_badge, created = Badge.ensure(person=self.person, event=self.event)
+        assert not latin_badge.has_moon_runes
+
+        moon_rune_badge = Badge.objects.create(personnel_class=personnel_class, first_name="太郎", surname="山田")
+        assert moon_rune_badge.has_moon_runes
+
+        batch = Batch.create(event=self.event, moon_rune_policy="onlyinclude")
+        assert list(batch.badges.all()) == [moon_rune_badge]
+
+        batch = Batch.create(event=self.event, moon_rune_policy="exclude")
+        assert list(batch.badges.all()) == [latin_badge]
+
+        batch.cancel()
+        Badge.objects.create(personnel_class=personnel_class, first_name="Outi", surname="Ulkopuolinen")
+
+        batch = Batch.create(event=self.event, max_items=1)
+        assert list(batch.badges.all()) == [latin_badge]
+
+    def test_moon_runes_after_personnel_class_rename(self):
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        personnel_class = signup.personnel_classes.get()
+
+        badge, created = Badge.ensure(person=self.person, event=self.event)
+        assert not badge.has_moon_runes
+
+        personnel_class.name = "ボランティア"
+        personnel_class.save()
+
+        badge.refresh_from_db()
+        assert badge.has_moon_runes
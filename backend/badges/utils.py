@@ -1,3 +1,6 @@
+from collections import defaultdict
+
+
 def get_priority(pair):
     personnel_class, job_title = pair
     return personnel_class.priority
@@ -11,53 +14,75 @@ def default_badge_factory(event, person):
 
     If the key `personnel_class` in that dictionary is None, that person should not have a badge.
     """
+    return default_badge_factory_many(event, [person])[person.id]
+
+
+def default_badge_factory_many(event, persons):
+    """
+    Like default_badge_factory, but for many persons of an event at once using a constant number of queries.
 
-    personnel_classes = []
+    Returns a dictionary of person ID to badge options.
+    """
+    persons = list(persons)
+    personnel_classes_by_person_id = defaultdict(list)
 
     if event.labour_event_meta is not None:
         from labour.models import Signup
 
-        try:
-            signup = Signup.objects.get(event=event, person=person, is_active=True)
-        except Signup.DoesNotExist:
-            pass
-        else:
+        signups = Signup.objects.filter(event=event, person__in=persons, is_active=True).prefetch_related(
+            "personnel_classes",
+            "job_categories_accepted",
+        )
+
+        for signup in signups:
             job_title = signup.some_job_title
-            personnel_classes.extend((pc, job_title) for pc in signup.personnel_classes.all())
+            personnel_classes_by_person_id[signup.person_id].extend(
+                (pc, job_title) for pc in signup.personnel_classes.all()
+            )
 
     if event.programme_event_meta is not None:
         from programme.models import ProgrammeRole
         from programme.models.programme import PROGRAMME_STATES_LIVE
 
         # Insertion order matters (most privileged first). list.sort is guaranteed to be stable.
-        personnel_classes.extend(
-            (programme_role.role.personnel_class, programme_role.role.public_title)
-            for programme_role in ProgrammeRole.objects.filter(
-                person=person,
+        programme_roles = (
+            ProgrammeRole.objects.filter(
+                person__in=persons,
                 programme__category__event=event,
                 programme__state__in=PROGRAMME_STATES_LIVE,
             )
-            .order_by("role__priority")
-            .select_related("role")
+            .order_by("person_id", "role__priority")
+            .select_related("role__personnel_class")
         )
 
-    if personnel_classes:
-        personnel_classes.sort(key=get_priority)
-        personnel_class, job_title = personnel_classes[0]
-    else:
-        personnel_class = None
-        job_title = "THIS BADGE SHOULD NOT PRINT"  # This should never get printed.
+        for programme_role in programme_roles:
+            personnel_classes_by_person_id[programme_role.person_id].append(
+                (programme_role.role.personnel_class, programme_role.role.public_title)
+            )
 
     meta = event.badges_event_meta
 
-    return dict(
-        first_name=person.first_name,
-        is_first_name_visible=meta.real_name_must_be_visible or "firstname" in person.badge_name_display_style,
-        surname=person.surname,
-        is_surname_visible=meta.real_name_must_be_visible or "surname" in person.badge_name_display_style,
-        nick=person.nick,
-        # NOTE: Explicit cast required, or the empty string '' in person.nick will cause this predicate to return ''
-        is_nick_visible=bool(person.nick) and "nick" in person.badge_name_display_style,
-        personnel_class=personnel_class,
-        job_title=job_title,
-    )
+    badge_opts_by_person_id = {}
+    for person in persons:
+        personnel_classes = personnel_classes_by_person_id[person.id]
+
+        if personnel_classes:
+            personnel_classes.sort(key=get_priority)
+            personnel_class, job_title = personnel_classes[0]
+        else:
+            personnel_class = None
+            job_title = "THIS BADGE SHOULD NOT PRINT"  # This should never get printed.
+
+        badge_opts_by_person_id[person.id] = dict(
+            first_name=person.first_name,
+            is_first_name_visible=meta.real_name_must_be_visible or "firstname" in person.badge_name_display_style,
+            surname=person.surname,
+            is_surname_visible=meta.real_name_must_be_visible or "surname" in person.badge_name_display_style,
+            nick=person.nick,
+            # NOTE: Explicit cast required, or the empty string '' in person.nick will cause this predicate to return ''
+            is_nick_visible=bool(person.nick) and "nick" in person.badge_name_display_style,
+            personnel_class=personnel_class,
+            job_title=job_title,
+        )
+
+    return badge_opts_by_person_id
@@ -3,22 +3,19 @@ from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_safe
 
 from core.batches_view import batches_view
+from core.event_box_registry import EventBoxContext
 from core.utils import url
 from labour.models import PersonnelClass
 
 from ..forms import CreateBatchForm
 from ..helpers import badges_admin_required
-from ..models import Batch, CountBadgesMixin
+from ..models import BadgeCounts, Batch
 
 
-# TODO use a generic proxy or have PersonnelClass inherit CountBadgesMixin directly
-class PersonnelClassProxy(CountBadgesMixin):
-    def __init__(self, target):
+class PersonnelClassProxy:
+    def __init__(self, target, counts: BadgeCounts):
         self.target = target
-
-    @property
-    def badges(self):
-        return self.target.badges
+        self.counts = counts
 
     @property
     def name(self):
@@ -32,17 +29,16 @@ class PersonnelClassProxy(CountBadgesMixin):
 @badges_admin_required
 @require_safe
 def badges_admin_dashboard_view(request, vars, event):
-    meta = event.badges_event_meta
+    counts_by_personnel_class_id = BadgeCounts.get_for_event_by_personnel_class(event)
+    counts = sum(counts_by_personnel_class_id.values(), BadgeCounts())
 
     vars.update(
         personnel_classes=[
-            PersonnelClassProxy(personnel_class) for personnel_class in PersonnelClass.objects.filter(event=event)
+            PersonnelClassProxy(personnel_class, counts_by_personnel_class_id.get(personnel_class.id, BadgeCounts()))
+            for personnel_class in PersonnelClass.objects.filter(event=event)
         ],
-        num_badges_total=meta.count_badges(),
-        num_badges_printed=meta.count_printed_badges(),
-        num_badges_waiting_in_batch=meta.count_badges_waiting_in_batch(),
-        num_badges_awaiting_batch=meta.count_badges_awaiting_batch(),
-        num_badges_revoked=meta.count_revoked_badges(),
+        badge_counts=counts,
+        badge_progress=counts.get_progress(),
     )
 
     return render(request, "badges_admin_dashboard_view.pug", vars)
@@ -88,11 +84,11 @@ def badges_admin_menu_items(request, event):
 
 
 def badges_event_box_context(request, event):
-    is_badges_admin = False
-
-    if request.user.is_authenticated:
-        is_badges_admin = event.badges_event_meta.is_user_admin(request.user)
+    meta = event.badges_event_meta
+    is_badges_admin = EventBoxContext.for_request(request, event).is_user_admin(meta)
+    badge_progress = meta.get_progress() if is_badges_admin else []
 
     return dict(
         is_badges_admin=is_badges_admin,
+        badge_progress=badge_progress,
     )
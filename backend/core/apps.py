@@ -7,4 +7,9 @@ class CoreAppConfig(AppConfig):
     verbose_name = _("core")
 
     def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
         from . import event_log_entry_types  # noqa: F401
+
+        # apps register their boxes on the event page in event_boxes.py (see core/event_box_registry.py)
+        autodiscover_modules("event_boxes")
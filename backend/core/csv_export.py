@@ -1,4 +1,7 @@
+import csv as stdlib_csv
 from collections import namedtuple
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
 
 import unicodecsv as csv
 from django.db import models
@@ -165,6 +168,25 @@ def export_csv(event, model, model_instances, output_file, m2m_mode="separate_co
         writer.close()
 
 
+class _Echo:
+    """
+    A pseudo-buffer for csv.writer that returns what is written instead of storing it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows: Iterable[Sequence[Any]], dialect="excel", encoding="UTF-8") -> Iterator[bytes]:
+    """
+    Yields rows encoded as CSV one at a time. Used with StreamingHttpResponse.
+    """
+    writer = stdlib_csv.writer(_Echo(), dialect=dialect)
+
+    for row in rows:
+        yield writer.writerow(row).encode(encoding)
+
+
 CONTENT_TYPES = dict(
     xlsx="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
 )
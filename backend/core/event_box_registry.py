@@ -0,0 +1,263 @@
+"""
+The event page (core_event_view) consists of boxes contributed by apps. Each app registers a provider
+for its box in its event_boxes.py, which is discovered on startup:
+
+    register(
+        "labour",
+        labour_event_box_context,
+        invalidated_by=[ModelInvalidation("labour.Signup", get_user_id=lambda signup: signup.person.user_id)],
+    )
+
+A provider is a function (request, event) -> dict that returns the template context of the box. Providers
+of the same request share common lookups (the current person, group memberships, admin checks) through
+EventBoxContext.
+
+The contexts returned by providers are cached per event and user for KOMPASSI_EVENT_BOX_CACHE_SECONDS.
+Saving or deleting instances of the models listed in invalidated_by through the ORM invalidates the
+cached contexts of the user or event they concern. Changes that bypass signals (eg. QuerySet.update)
+show up once the cache expires.
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+GLOBAL_VERSION_KEY = "core:event_box_version"
+EVENT_VERSION_KEY = "core:event_box_version:event:{event_id}"
+USER_VERSION_KEY = "core:event_box_version:user:{user_id}"
+CONTEXT_KEY = "core:event_box:{app_label}:{event_id}:{user_id}:{versions}"
+
+EventBoxContextFn = Callable[[Any, Any], dict[str, Any]]
+
+
+@dataclass
+class ModelInvalidation:
+    """
+    Saving or deleting an instance of the model invalidates the cached event boxes of the user returned by
+    get_user_id, or if it is not given, those of the event of the instance (instance.event_id).
+    """
+
+    model_label: str
+    get_user_id: Callable[[Any], int | None] | None = None
+
+    def invalidate(self, instance):
+        if self.get_user_id is not None:
+            if user_id := self.get_user_id(instance):
+                bump_version(USER_VERSION_KEY.format(user_id=user_id))
+        elif event_id := getattr(instance, "event_id", None):
+            bump_version(EVENT_VERSION_KEY.format(event_id=event_id))
+        else:
+            bump_version(GLOBAL_VERSION_KEY)
+
+    def handle_signal(self, sender, instance, **kwargs):
+        self.invalidate(instance)
+
+
+@dataclass
+class EventBoxProvider:
+    app_label: str
+    get_context: EventBoxContextFn
+    requires_event_meta: bool = True
+    invalidated_by: list[ModelInvalidation] = field(default_factory=list)
+    cache: bool = True
+
+    def is_enabled(self, event) -> bool:
+        return not self.requires_event_meta or event.get_app_event_meta(self.app_label) is not None
+
+
+providers: dict[str, EventBoxProvider] = {}
+
+
+def register(
+    app_label: str,
+    get_context: EventBoxContextFn,
+    *,
+    requires_event_meta: bool = True,
+    invalidated_by: list[ModelInvalidation] | None = None,
+    cache: bool = True,
+):
+    """
+    Registers the event box of an app. If requires_event_meta is set, the box is only shown for events
+    that use the app. If cache is not set, the context is computed on every request (eg. for contexts
+    that change without model signals firing).
+    """
+    provider = providers[app_label] = EventBoxProvider(
+        app_label=app_label,
+        get_context=get_context,
+        requires_event_meta=requires_event_meta,
+        invalidated_by=invalidated_by or [],
+        cache=cache,
+    )
+
+    for invalidation in provider.invalidated_by:
+        connect_invalidation(invalidation, f"event_box_registry:{app_label}:{invalidation.model_label}")
+
+    return provider
+
+
+def connect_invalidation(invalidation: ModelInvalidation, dispatch_uid: str):
+    model = apps.get_model(invalidation.model_label)
+    post_save.connect(invalidation.handle_signal, sender=model, dispatch_uid=f"{dispatch_uid}:save", weak=False)
+    post_delete.connect(invalidation.handle_signal, sender=model, dispatch_uid=f"{dispatch_uid}:delete", weak=False)
+
+
+def bump_version(key: str):
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # evicted in between
+        cache.set(key, 1, None)
+
+
+def bump_user_versions(user_ids: Iterable[int]):
+    """
+    Invalidates the cached event boxes of the users. Call this after changing group memberships in bulk
+    (eg. bulk_create or QuerySet.delete on User.groups.through), which sends no m2m_changed.
+    """
+    for user_id in set(user_ids):
+        bump_version(USER_VERSION_KEY.format(user_id=user_id))
+
+
+class EventBoxContext:
+    """
+    Lookups shared by the event box providers of one request.
+    """
+
+    def __init__(self, request, event):
+        self.request = request
+        self.event = event
+
+    @classmethod
+    def for_request(cls, request, event) -> "EventBoxContext":
+        contexts = getattr(request, "_event_box_contexts", None)
+        if contexts is None:
+            contexts = request._event_box_contexts = {}
+
+        if (context := contexts.get(event.id)) is None:
+            context = contexts[event.id] = cls(request, event)
+
+        return context
+
+    @property
+    def user(self):
+        return self.request.user
+
+    @cached_property
+    def person(self):
+        from .models import Person
+
+        if not self.user.is_authenticated:
+            return None
+
+        try:
+            return self.user.person
+        except Person.DoesNotExist:
+            return None
+
+    @cached_property
+    def group_ids(self) -> frozenset[int]:
+        if not self.user.is_authenticated:
+            return frozenset()
+
+        return frozenset(self.user.groups.values_list("id", flat=True))
+
+    def is_user_admin(self, meta) -> bool:
+        """
+        Like meta.is_user_admin(user), but legacy group based checks of all apps use the same group lookup.
+        CBAC checks are cached by CBACEntry already.
+        """
+        if meta.use_cbac:
+            return meta.is_user_admin(self.user)
+
+        return self.user.is_authenticated and (self.user.is_superuser or meta.admin_group_id in self.group_ids)
+
+
+def get_event_box_contexts(request, event) -> dict[str, Any]:
+    """
+    Returns the combined template context of the event boxes of the event for the current user.
+    """
+    enabled_providers = [provider for provider in providers.values() if provider.is_enabled(event)]
+    cache_seconds = settings.KOMPASSI_EVENT_BOX_CACHE_SECONDS
+    user_id = request.user.id if request.user.is_authenticated else 0
+
+    context_keys = {}
+    if cache_seconds:
+        version_keys = [
+            GLOBAL_VERSION_KEY,
+            EVENT_VERSION_KEY.format(event_id=event.id),
+            USER_VERSION_KEY.format(user_id=user_id),
+        ]
+        version_values = cache.get_many(version_keys)
+        versions = "-".join(str(version_values.get(key, 0)) for key in version_keys)
+
+        context_keys = {
+            provider.app_label: CONTEXT_KEY.format(
+                app_label=provider.app_label,
+                event_id=event.id,
+                user_id=user_id,
+                versions=versions,
+            )
+            for provider in enabled_providers
+            if provider.cache
+        }
+
+    cached_contexts = cache.get_many(context_keys.values()) if context_keys else {}
+    new_contexts = {}
+
+    vars = {}
+    for provider in enabled_providers:
+        context_key = context_keys.get(provider.app_label)
+
+        if context_key in cached_contexts:
+            context = cached_contexts[context_key]
+        else:
+            context = provider.get_context(request, event)
+            if context_key:
+                new_contexts[context_key] = context
+
+        vars.update(context)
+
+    if new_contexts:
+        cache.set_many(new_contexts, cache_seconds)
+
+    return vars
+
+
+def invalidate_user_group_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Admin and organizer checks depend on the groups of the user.
+    """
+    if not action.startswith("post_"):
+        return
+
+    if not reverse:
+        # user.groups.add(...)
+        bump_user_versions([instance.pk])
+    elif pk_set:
+        # group.user_set.add(...)
+        bump_user_versions(pk_set)
+    else:
+        # group.user_set.clear()
+        bump_version(GLOBAL_VERSION_KEY)
+
+
+m2m_changed.connect(
+    invalidate_user_group_membership,
+    sender=get_user_model().groups.through,
+    dispatch_uid="event_box_registry:user_groups",
+)
+
+if "access" in settings.INSTALLED_APPS:
+    # admin checks of apps that use CBAC depend on the CBAC entries of the user
+    connect_invalidation(
+        ModelInvalidation("access.CBACEntry", get_user_id=lambda cbac_entry: cbac_entry.user_id),
+        "event_box_registry:access.CBACEntry",
+    )
@@ -1,7 +1,11 @@
 import io
+import tempfile
+from collections.abc import Iterator
 
 import xlsxwriter
 
+CHUNK_SIZE = 64 * 1024
+
 
 class XlsxWriter:
     """
@@ -9,13 +13,21 @@ class XlsxWriter:
 
     Must .close() to get the data actually written. Use getattr(writer, 'must_close', False)
     to distinguish from an actual csv.writer.
+
+    In constant_memory mode, rows are flushed to temporary files as they are written
+    and the workbook is assembled on disk instead of in memory. Rows must then be written
+    in order (which writerow always does anyway).
     """
 
-    def __init__(self, output_stream):
+    def __init__(self, output_stream=None, constant_memory=False):
         self.row = 0
         self.output_stream = output_stream
-        self.buf = io.BytesIO()
-        self.workbook = xlsxwriter.Workbook(self.buf)
+        if constant_memory:
+            self.buf = tempfile.TemporaryFile()
+            self.workbook = xlsxwriter.Workbook(self.buf, {"constant_memory": True})
+        else:
+            self.buf = io.BytesIO()
+            self.workbook = xlsxwriter.Workbook(self.buf)
         self.worksheet = self.workbook.add_worksheet()
         self.must_close = True
 
@@ -33,7 +45,18 @@ class XlsxWriter:
         self.row += 1
 
     def close(self):
+        for chunk in self.iter_close():
+            self.output_stream.write(chunk)
+
+    def iter_close(self, chunk_size=CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Like close, but instead of writing the workbook into output_stream, yields it in chunks.
+        Used with StreamingHttpResponse.
+        """
         self.workbook.close()
         self.buf.seek(0)
-        self.output_stream.write(self.buf.read())
+
+        while chunk := self.buf.read(chunk_size):
+            yield chunk
+
         self.buf.close()
@@ -6,19 +6,83 @@ from django.db import models
 T = TypeVar("T", bound=models.Model)
 
 
+class DimensionFilterMode(graphene.Enum):
+    """
+    EXACT filters by the dimension values of the instance as they are right now.
+    CACHED filters by the denormalized `cached_dimensions` using its GIN index, which is faster
+    but may briefly lag behind changes to dimensions (see CachedDimensionsQuerySet.with_dimensions).
+    """
+
+    EXACT = "exact"
+    CACHED = "cached"
+
+
 class DimensionFilterInput(graphene.InputObjectType):
     dimension = graphene.String()
     values = graphene.List(graphene.String)
 
     @classmethod
-    def filter(cls, queryset: models.QuerySet[T], filters: list[Self] | None) -> models.QuerySet[T]:
-        if filters is None:
-            filters = []
+    def filter(
+        cls,
+        queryset: models.QuerySet[T],
+        filters: list[Self] | None,
+        mode: DimensionFilterMode = DimensionFilterMode.EXACT,
+    ) -> models.QuerySet[T]:
+        """
+        Filters a queryset of a model that has dimensions (forms.Response, program_v2.Program)
+        so that for each filter, the instance has at least one of the given values of that dimension.
+
+        The dimension and value slugs are resolved to value ids in a single query, and each filter
+        then becomes an EXISTS subquery against the `dimensions` through model. Unlike chaining
+        `filter(dimensions__…)` per filter, this does not join once per filter and does not
+        return duplicate rows when an instance has multiple matching values.
+
+        With mode=CACHED, filters by `cached_dimensions` instead (see DimensionFilterMode).
+        """
+        if not filters:
+            return queryset
 
+        if mode == DimensionFilterMode.CACHED:
+            # filters on the same dimension are ANDed, so they cannot be merged into a single dict
+            for filter in filters:
+                queryset = queryset.with_dimensions({filter.dimension: filter.values or []})  # type: ignore
+            return queryset
+
+        # eg. Response.dimensions -> ResponseDimensionValue (response, dimension, value)
+        dimensions_field = queryset.model._meta.get_field("dimensions")
+        through_model: type[models.Model] = dimensions_field.related_model  # type: ignore
+        instance_field_name = dimensions_field.field.name  # type: ignore
+        value_model: type[models.Model] = through_model._meta.get_field("value").related_model  # type: ignore
+
+        # Dimension and value slugs are only unique within a survey or event, so this may
+        # pick up value ids of other surveys or events. They will never match in the subquery.
+        value_ids_by_key: dict[tuple[str, str], list[int]] = {}
+        q = models.Q()
         for filter in filters:
+            q |= models.Q(dimension__slug=filter.dimension, slug__in=filter.values or [])
+        for value_id, dimension_slug, value_slug in value_model.objects.filter(q).values_list(
+            "id",
+            "dimension__slug",
+            "slug",
+        ):
+            value_ids_by_key.setdefault((dimension_slug, value_slug), []).append(value_id)
+
+        for filter in filters:
+            value_ids = [
+                value_id
+                for value_slug in filter.values or []
+                for value_id in value_ids_by_key.get((filter.dimension, value_slug), [])
+            ]
+            if not value_ids:
+                return queryset.none()
+
             queryset = queryset.filter(
-                dimensions__dimension__slug=filter.dimension,
-                dimensions__value__slug__in=filter.values,
+                models.Exists(
+                    through_model.objects.filter(
+                        **{instance_field_name: models.OuterRef("pk")},
+                        value_id__in=value_ids,
+                    )
+                )
             )
 
         return queryset
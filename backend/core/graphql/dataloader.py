@@ -0,0 +1,84 @@
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any, Generic, Self, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchLoadFn = Callable[[list[K]], Mapping[K, V]]
+
+
+class DataLoader(Generic[K, V]):
+    """
+    A synchronous, request-scoped DataLoader for Graphene resolvers.
+
+    Our GraphQL API is executed synchronously, so resolvers cannot defer loads to be
+    batched later like with async DataLoaders. Instead, the resolver of a list field
+    primes the loader with the keys its items are going to need (eg. form ids of responses),
+    and the first `load` of any key then loads all primed keys in a single batch.
+    Loaded values are cached for the rest of the request.
+
+        def resolve_responses(survey, info):
+            responses = list(survey.responses.all())
+            user_loader(info).prime(response.created_by_id for response in responses)
+            return responses
+
+        def resolve_created_by(response, info):
+            return user_loader(info).load(response.created_by_id)
+
+    The batch load function receives a list of keys and returns a mapping of key to value.
+    Keys missing from the mapping resolve to `default`.
+    """
+
+    def __init__(self, batch_load: BatchLoadFn[K, V], default: Any = None):
+        self.batch_load = batch_load
+        self.default = default
+        self.cache: dict[K, V] = {}
+        self.primed_keys: set[K] = set()
+
+    @classmethod
+    def for_request(cls, info, batch_load: BatchLoadFn[K, V], default: Any = None) -> Self:
+        """
+        Returns the loader for this batch load function that lives as long as the request does.
+        """
+        loaders: dict[BatchLoadFn, DataLoader] | None = getattr(info.context, "_dataloaders", None)
+        if loaders is None:
+            loaders = info.context._dataloaders = {}
+
+        if (loader := loaders.get(batch_load)) is None:
+            loader = loaders[batch_load] = cls(batch_load, default)
+
+        return loader  # type: ignore
+
+    def prime(self, keys: Iterable[K | None]) -> Self:
+        """
+        Schedules the keys to be loaded in the next batch. None keys (eg. nullable foreign keys) are ignored.
+        """
+        self.primed_keys.update(key for key in keys if key is not None and key not in self.cache)
+        return self
+
+    def prime_values(self, values: Mapping[K, V]) -> Self:
+        """
+        Seeds the cache with values that are already known.
+        """
+        self.cache.update(values)
+        self.primed_keys.difference_update(values)
+        return self
+
+    def load(self, key: K | None) -> V:
+        if key is None:
+            return self.default
+
+        if key not in self.cache:
+            keys = list(self.primed_keys | {key})
+            self.primed_keys.clear()
+
+            values = self.batch_load(keys)
+            for key_ in keys:
+                self.cache[key_] = values.get(key_, self.default)
+
+        return self.cache[key]
+
+    def load_many(self, keys: Iterable[K | None]) -> list[V]:
+        keys = list(keys)
+        self.prime(keys)
+        return [self.load(key) for key in keys]
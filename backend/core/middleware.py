@@ -1,5 +1,14 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
 from .models import Event, Organization
 from .page_wizard import page_wizard_clear
+from .utils.query_utils import profile_queries
+
+logger = logging.getLogger("kompassi")
 
 NEVER_BLOW_PAGE_WIZARD_PREFIXES = [
     # we have addresses like /desuprofile/confirm/475712413a0ddc3c7a57c6721652b75449bf3c89
@@ -66,3 +75,40 @@ class EventOrganizationMiddleware:
                     request.organization = event.organization
             elif organization_slug := resolver_match.kwargs.get("organization_slug"):
                 request.organization = Organization.objects.filter(slug=organization_slug).first()
+
+
+class QueryProfilingMiddleware:
+    """
+    Records the SQL queries made while handling each request and reports their number, duration and
+    duplicates (likely N+1) in X-Kompassi-Query-* response headers and as a JSON log line.
+
+    Only enabled if settings.KOMPASSI_QUERY_PROFILING is set.
+    """
+
+    def __init__(self, get_response):
+        if not settings.KOMPASSI_QUERY_PROFILING:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_queries() as profile:
+            response = self.get_response(request)
+
+        response["X-Kompassi-Query-Count"] = str(profile.num_queries)
+        response["X-Kompassi-Query-Duration-Ms"] = f"{profile.duration * 1000:.1f}"
+        response["X-Kompassi-Duplicate-Queries"] = str(profile.num_duplicates)
+
+        logger.info(
+            "query profile %s",
+            json.dumps(
+                dict(
+                    method=request.method,
+                    path=request.path,
+                    status=response.status_code,
+                    **profile.as_log_dict(),
+                )
+            ),
+        )
+
+        return response
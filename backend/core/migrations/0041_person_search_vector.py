@@ -0,0 +1,48 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def populate_search_vectors(apps, schema_editor):
+    from django.contrib.postgres.search import SearchVector
+    from django.db.models import OuterRef, Subquery
+
+    Person = apps.get_model("core", "Person")
+    User = apps.get_model("auth", "User")
+
+    username = Subquery(User.objects.filter(pk=OuterRef("user_id")).values("username")[:1])
+    Person.objects.update(
+        search_vector=SearchVector("first_name", "surname", "nick", "email", "phone", username, config="simple")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("core", "0040_rename_emailverificationtoken_person_state_core_emailv_person__722147_idx_and_more"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="person",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop, elidable=True),
+        migrations.AddIndex(
+            model_name="person",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="core_person_search_vector"),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["first_name", "surname", "nick"],
+                name="core_person_names_trgm",
+                opclasses=["gin_trgm_ops", "gin_trgm_ops", "gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -4,7 +4,6 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
@@ -194,17 +193,18 @@ class Event(models.Model):
     @property
     def people(self):
         """
-        Returns people associated with this event
+        Returns people associated with this event: signups or programmes (see directory.models.Involvement).
         """
-        from .person import Person
-
-        # have signups
-        q = Q(signups__event=self)
+        from directory.models import Involvement
 
-        # or programmes
-        q |= Q(programme_roles__programme__category__event=self)
+        from .person import Person
 
-        return Person.objects.filter(q).distinct()
+        return Person.objects.filter(
+            id__in=Involvement.objects.filter(
+                event=self,
+                kind__in=[Involvement.Kind.SIGNUP, Involvement.Kind.PROGRAMME_ROLE],
+            ).values("person_id")
+        )
 
     @property
     def either_logo_url(self):
@@ -221,18 +221,44 @@ class Event(models.Model):
     enrollment_event_meta = event_meta_property("enrollment")
     intra_event_meta = event_meta_property("intra")
 
-    @property
-    def program_v2_event_meta(self):
+    # app_label is program_v2 but the model is ProgramV2EventMeta
+    program_v2_event_meta = event_meta_property("program_v2", "programv2eventmeta")
+
+    @classmethod
+    def get_event_meta_relations(cls):
         """
-        for program_v2, app_label is program_v2 but prefix is programv2
-        so event_meta_property("programv2") did not
+        Returns the reverse one-to-one relations from Event to the event metas of installed apps.
         """
-        from program_v2.models import ProgramV2EventMeta
+        from .event_meta_base import EventMetaBase
+
+        return [
+            relation
+            for relation in cls._meta.related_objects
+            if relation.one_to_one and issubclass(relation.related_model, EventMetaBase)
+        ]
+
+    def load_event_metas(self):
+        """
+        Loads those event metas of this event that have not been loaded yet in one query.
+        Afterwards accessing event metas (eg. event.labour_event_meta) does not cause queries.
+        """
+        if self.pk is None:
+            return
+
+        relations = [relation for relation in self.get_event_meta_relations() if not relation.is_cached(self)]
+        if not relations:
+            return
+
+        loaded_event = Event.objects.select_related(*(relation.get_accessor_name() for relation in relations)).get(
+            pk=self.pk
+        )
+
+        for relation in relations:
+            meta = relation.get_cached_value(loaded_event, default=None)
+            relation.set_cached_value(self, meta)
 
-        try:
-            return ProgramV2EventMeta.objects.get(event=self)
-        except ProgramV2EventMeta.DoesNotExist:
-            return None
+            if meta is not None:
+                relation.field.set_cached_value(meta, self)
 
     def get_app_event_meta(self, app_label: str):
         return getattr(self, f"{app_label}_event_meta")
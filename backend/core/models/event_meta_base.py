@@ -12,19 +12,57 @@ class EventMetaBase(models.Model, GroupManagementMixin):
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # the names of the groups depend on the event slug
+        self._groups_by_suffix = None
+
+    def delete(self, *args, **kwargs):
+        event_field = self._meta.get_field("event")
+        event = self.event if event_field.is_cached(self) else None
+
+        result = super().delete(*args, **kwargs)
+
+        # an event that has loaded its metas should not keep on returning this one
+        if event is not None:
+            event_field.remote_field.set_cached_value(event, None)
+
+        return result
+
+    def get_groups_by_suffix(self):
+        """
+        Returns the groups of this event meta (see make_group_name) by their suffix.
+        Loaded in one query on first use and cached for the lifetime of this meta instance.
+        """
+        from django.contrib.auth.models import Group
+
+        if (groups_by_suffix := getattr(self, "_groups_by_suffix", None)) is None:
+            prefix = self.get_group_name_prefix(self.event)
+            groups_by_suffix = self._groups_by_suffix = {
+                group.name.removeprefix(prefix): group for group in Group.objects.filter(name__startswith=prefix)
+            }
+
+        return groups_by_suffix
+
     def get_group(self, suffix):
         from django.contrib.auth.models import Group
 
-        group_name = self.make_group_name(self.event, suffix)
+        groups_by_suffix = self.get_groups_by_suffix()
+
+        if (group := groups_by_suffix.get(suffix)) is None:
+            # may have been created after the groups were loaded
+            group = groups_by_suffix[suffix] = Group.objects.get(name=self.make_group_name(self.event, suffix))
 
-        return Group.objects.get(name=group_name)
+        return group
 
     def get_group_if_exists(self, suffix):
         from django.contrib.auth.models import Group
 
-        group_name = self.make_group_name(self.event, suffix)
-
-        return Group.objects.filter(name=group_name).first()
+        try:
+            return self.get_group(suffix)
+        except Group.DoesNotExist:
+            return None
 
     def is_user_admin(self, user):
         """
@@ -27,11 +27,15 @@ class GroupManagementMixin:
         if len(suffix) <= 1:
             raise ValueError(f"suffix {suffix!r} should be longer than a single character")
 
+        return f"{cls.get_group_name_prefix(host)}{suffix}"
+
+    @classmethod
+    def get_group_name_prefix(cls, host):
         from django.contrib.contenttypes.models import ContentType
 
         ctype = ContentType.objects.get_for_model(cls)
 
-        return f"{settings.KOMPASSI_INSTALLATION_SLUG}-{host.slug}-{ctype.app_label}-{suffix}"
+        return f"{settings.KOMPASSI_INSTALLATION_SLUG}-{host.slug}-{ctype.app_label}-"
 
     @classmethod
     def get_or_create_groups(cls, host, suffixes):
@@ -1,7 +1,6 @@
 import logging
 
 from django.db import models
-from django.db.models import Q
 
 from ..utils import SLUG_FIELD_PARAMS, pick_attrs, slugify
 
@@ -116,26 +115,14 @@ class Organization(models.Model):
     @property
     def people(self):
         """
-        Returns people with involvement in events of the current organization
+        Returns people with involvement in events of the current organization: signups, archived signups,
+        programmes, memberships or enrollments (see directory.models.Involvement).
         """
-        from .person import Person
-
-        # have signups
-        q = Q(signups__event__organization=self)
-
-        # have archived signups
-        q |= Q(archived_signups__event__organization=self)
+        from directory.models import Involvement
 
-        # or programmes
-        q |= Q(programme_roles__programme__category__event__organization=self)
-
-        # or are members
-        q |= Q(memberships__organization=self)
-
-        # or have enrolled
-        q |= Q(enrollment__event__organization=self)
+        from .person import Person
 
-        return Person.objects.filter(q).distinct()
+        return Person.objects.filter(id__in=Involvement.objects.filter(organization=self).values("person_id"))
 
     def as_dict(self):
         return pick_attrs(
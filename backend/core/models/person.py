@@ -7,9 +7,11 @@ import vobject
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Q
+from django.db.models import OuterRef, Q, Subquery
 from django.utils import timezone
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -29,6 +31,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("kompassi")
 
+# Fields of Person (and the username) that are searchable in the directory
+SEARCH_FIELDS = ("first_name", "surname", "nick", "email", "phone")
+# Names are not stemmed
+SEARCH_CONFIG = "simple"
+
 
 def birth_date_validator(value):
     exc = "Virheellinen syntymäaika."
@@ -130,12 +137,23 @@ class Person(models.Model):
 
     email_verified_at = models.DateTimeField(null=True, blank=True)
 
+    # maintained by save() and refresh_search_vectors, see search()
+    search_vector = SearchVectorField(null=True, editable=False)
+
     badges: models.QuerySet["Badge"]
 
     class Meta:
         ordering = ["surname"]
         verbose_name = "Henkilö"
         verbose_name_plural = "Henkilöt"
+        indexes = [
+            GinIndex(fields=["search_vector"], name="core_person_search_vector"),
+            GinIndex(
+                fields=["first_name", "surname", "nick"],
+                name="core_person_names_trgm",
+                opclasses=["gin_trgm_ops"] * 3,
+            ),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -277,8 +295,44 @@ class Person(models.Model):
 
             self.user.save()
 
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & {*SEARCH_FIELDS, "user"}:
+            self.refresh_search_vectors(Person.objects.filter(pk=self.pk))
+
         return ret_val
 
+    @classmethod
+    def refresh_search_vectors(cls, people: models.QuerySet["Person"]):
+        """
+        Updates search_vector of the people in the queryset in a single UPDATE.
+        """
+        User = get_user_model()
+        username = Subquery(User.objects.filter(pk=OuterRef("user_id")).values("username")[:1])
+        people.update(search_vector=SearchVector(*SEARCH_FIELDS, username, config=SEARCH_CONFIG))
+
+    @classmethod
+    def search(cls, people: models.QuerySet["Person"], query: str) -> models.QuerySet["Person"]:
+        """
+        Filters people by a free text query. Every word of the query must be a prefix of a word in the
+        name, nick, email, phone number or username of the person ("mat vir" finds "Matti Virtanen").
+        Misspelt single names are found by trigram similarity ("Virtasen" finds "Virtanen").
+        Both use the indexes in Meta.indexes.
+        """
+        # quoted so that tsquery operators in the query are taken literally
+        terms = [term.replace("\\", "").replace("'", "''") for term in query.split()]
+        terms = [term for term in terms if term]
+        if not terms:
+            return people
+
+        prefix_query = " & ".join(f"'{term}':*" for term in terms)
+
+        return people.filter(
+            Q(search_vector=SearchQuery(prefix_query, search_type="raw", config=SEARCH_CONFIG))
+            | Q(first_name__trigram_similar=query)
+            | Q(surname__trigram_similar=query)
+            | Q(nick__trigram_similar=query)
+        )
+
     @property
     def is_email_verified(self):
         return self.email_verified_at is not None
@@ -2,12 +2,19 @@ from datetime import date, datetime
 
 from babel import Locale
 from dateutil.tz import tzlocal
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
 from django.utils.timezone import get_current_timezone
 
+from access.models import CBACEntry
+from badges.models import Badge, BadgesEventMeta
 from core.utils.time_utils import format_date_range
+from labour.models import LabourEventMeta, Signup
+from programme.models import ProgrammeEventMeta
 
-from .utils import format_interval, full_hours_between, slugify
+from .event_box_registry import get_event_box_contexts
+from .models import Event, Person
+from .utils import assert_max_queries, format_interval, full_hours_between, profile_queries, slugify
 
 
 class PersonTestCase(TestCase):
@@ -122,3 +129,97 @@ class UtilsTestCase(TestCase):
         assert format_interval(d0, d1, locale=locale) == "ke 27.4. 21.00–23.00"
 
         assert format_interval(d0, d2, locale=locale) == "ke 27.4. 21.00 – to 28.4. 1.00"
+
+
+class EventMetaTestCase(TestCase):
+    def test_load_event_metas(self):
+        labour_event_meta, unused = LabourEventMeta.get_or_create_dummy()
+        event = Event.objects.get(pk=labour_event_meta.pk)
+
+        with self.assertNumQueries(1):
+            assert event.labour_event_meta == labour_event_meta
+            assert event.labour_event_meta.event is event
+            assert event.badges_event_meta is None
+            assert event.program_v2_event_meta is None
+
+    def test_get_group(self):
+        labour_event_meta, unused = LabourEventMeta.get_or_create_dummy()
+        admin_group, accepted_group = LabourEventMeta.get_or_create_groups(
+            labour_event_meta.event, ["admins", "accepted"]
+        )
+        meta = LabourEventMeta.objects.select_related("event").get(pk=labour_event_meta.pk)
+
+        # warm up the content type cache used by make_group_name
+        meta.get_group_name_prefix(meta.event)
+
+        with self.assertNumQueries(1):
+            assert meta.get_group("admins") == admin_group
+            assert meta.get_group("accepted") == accepted_group
+            assert meta.get_group("admins") == admin_group
+
+        # groups created later are found, too
+        (new_group,) = LabourEventMeta.get_or_create_groups(meta.event, ["new-group"])
+        assert meta.get_group("new-group") == new_group
+        assert meta.get_group_if_exists("no-such-group") is None
+
+
+class EventViewTestCase(TestCase):
+    def test_core_event_view_query_budget(self):
+        """
+        The event page should take a constant number of queries regardless of how many people are involved.
+        """
+        BadgesEventMeta.get_or_create_dummy()
+        ProgrammeEventMeta.get_or_create_dummy()
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        event = signup.event
+        job_category = signup.job_categories.get()
+        personnel_class = signup.personnel_classes.get()
+
+        for meta in [event.labour_event_meta, event.badges_event_meta, event.programme_event_meta]:
+            meta.admin_group.user_set.add(signup.person.user)
+        CBACEntry.ensure_admin_group_privileges_for_event(event)
+        self.client.force_login(signup.person.user)
+
+        def make_workers(num_workers):
+            persons = []
+            for _ in range(num_workers):
+                person = Person.objects.create(first_name="Testi", surname="Testinen")
+                worker_signup = Signup.objects.create(person=person, event=event)
+                worker_signup.job_categories.set([job_category])
+                worker_signup.personnel_classes.set([personnel_class])
+                persons.append(person)
+            Badge.ensure_many(event=event, persons=persons)
+
+        url = f"/events/{event.slug}"
+
+        # measure with the event boxes not cached
+        make_workers(1)
+        cache.clear()
+        with profile_queries() as profile:
+            response = self.client.get(url)
+        assert response.status_code == 200
+
+        make_workers(5)
+        cache.clear()
+        with assert_max_queries(profile.num_queries):
+            response = self.client.get(url)
+        assert response.status_code == 200
+
+    def test_event_box_cache(self):
+        signup, unused = Signup.get_or_create_dummy()
+        event = signup.event
+        user = signup.person.user
+
+        def get_contexts():
+            request = RequestFactory().get(f"/events/{event.slug}")
+            request.user = user
+            return get_event_box_contexts(request, event)
+
+        cache.clear()
+        assert get_contexts()["signup"] == signup
+
+        with self.assertNumQueries(0):
+            assert get_contexts()["signup"] == signup
+
+        signup.delete()
+        assert get_contexts()["signup"] is None
@@ -32,6 +32,7 @@ from .misc_utils import (
 from .model_utils import (
     NONUNIQUE_SLUG_FIELD_PARAMS,
     SLUG_FIELD_PARAMS,
+    CachedDimensionsQuerySet,
     format_phone_number,
     get_previous_and_next,
     phone_number_validator,
@@ -40,6 +41,7 @@ from .model_utils import (
 )
 from .password_utils import validate_password
 from .properties import alias_property, code_property, event_meta_property, time_bool_property
+from .query_utils import QueryProfile, assert_max_queries, profile_queries
 from .text_utils import normalize_whitespace
 from .time_utils import (
     ONE_HOUR,
@@ -52,4 +54,5 @@ from .time_utils import (
     get_objects_within_period,
     is_within_period,
 )
+from .transaction_utils import on_commit_once
 from .view_utils import get_next, login_redirect, url
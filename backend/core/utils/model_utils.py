@@ -1,8 +1,10 @@
 import re
+from collections.abc import Collection, Mapping
 
 import phonenumbers
 from django.conf import settings
 from django.core.validators import RegexValidator
+from django.db import models
 from django.forms import ValidationError
 from django.utils.translation import gettext_lazy as _
 
@@ -118,3 +120,35 @@ def format_phone_number(
     phone_number_format = getattr(phonenumbers.PhoneNumberFormat, format, format)
     phone_number = phonenumbers.parse(value, region)
     return phonenumbers.format_number(phone_number, phone_number_format)
+
+
+class CachedDimensionsQuerySet(models.QuerySet):
+    """
+    For models with a denormalized `cached_dimensions` JSON field (dimension slug -> list of value slugs)
+    that is covered by a GIN index using `jsonb_path_ops` (forms.Response, program_v2.Program).
+    """
+
+    def with_dimensions(self, dimensions: Mapping[str, Collection[str]]):
+        """
+        Filters to instances that have, for each dimension, at least one of the given values:
+
+            Response.objects.with_dimensions({"state": ["new", "accepted"]})
+
+        Each value becomes a containment query (`cached_dimensions @> '{"state": ["new"]}'`)
+        that can be answered from the GIN index; values of the same dimension are ORed and
+        dimensions are ANDed. A dimension with no values matches nothing.
+
+        NOTE: Only as fresh as cached_dimensions. When it must reflect the dimension values
+        as they are right now, use DimensionFilterInput.filter instead.
+        """
+        queryset = self
+        for dimension_slug, value_slugs in dimensions.items():
+            if not value_slugs:
+                return queryset.none()
+
+            q = models.Q()
+            for value_slug in value_slugs:
+                q |= models.Q(cached_dimensions__contains={dimension_slug: [value_slug]})
+            queryset = queryset.filter(q)
+
+        return queryset
@@ -5,13 +5,25 @@ from django.utils.timezone import now
 from .misc_utils import get_code
 
 
-def event_meta_property(app_label):
+def event_meta_property(app_label, related_name=None):
+    """
+    class Event(models.Model):
+        labour_event_meta = event_meta_property("labour")
+
+    Returns the event meta of the app for the event, or None if the event does not use the app.
+    The first access loads all event metas of the event in one query (see Event.load_event_metas).
+    """
     if app_label not in settings.INSTALLED_APPS:
         return property(lambda self: None)
 
+    if related_name is None:
+        related_name = f"{app_label}eventmeta"
+
     def _get(self):
+        self.load_event_metas()
+
         try:
-            return getattr(self, f"{app_label}eventmeta")
+            return getattr(self, related_name)
         except ObjectDoesNotExist:
             return None
 
@@ -0,0 +1,187 @@
+import re
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+
+from django.db import connections
+
+# Fingerprints collapse literal values so that "WHERE id = 1" and "WHERE id = 2" are the same query
+FINGERPRINT_REPLACEMENTS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+THIS_FILE = str(Path(__file__).resolve())
+BASE_DIR = str(Path(THIS_FILE).parents[2])
+
+
+def get_query_fingerprint(sql: str) -> str:
+    """
+    Normalizes an SQL query so that queries that only differ in their parameters compare equal.
+    Queries that occur many times with the same fingerprint are usually a sign of N+1.
+
+    >>> get_query_fingerprint('SELECT "a" FROM "b" WHERE "id" IN (%s, %s, %s)')
+    'SELECT "a" FROM "b" WHERE "id" IN (...)'
+    """
+    for pattern, replacement in FINGERPRINT_REPLACEMENTS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def get_call_site() -> str:
+    """
+    Returns "path/to/file.py:123 in function" of the innermost stack frame that is in our own code
+    (as opposed to Django or other libraries), or "<unknown>".
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(BASE_DIR) and filename != THIS_FILE and "site-packages" not in filename:
+            relative_filename = filename[len(BASE_DIR) :].lstrip("/")
+            return f"{relative_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+@dataclass
+class ProfiledQuery:
+    sql: str
+    fingerprint: str
+    duration: float
+    call_site: str
+
+
+@dataclass
+class DuplicateQuery:
+    fingerprint: str
+    count: int
+    call_sites: list[str]
+
+
+@dataclass
+class QueryProfile:
+    """
+    Database execute wrapper that records every query made, the time spent in it and the call site
+    that triggered it. Use profile_queries() to install it on all connections.
+    """
+
+    queries: list[ProfiledQuery] = field(default_factory=list)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                ProfiledQuery(
+                    sql=sql,
+                    fingerprint=get_query_fingerprint(sql),
+                    duration=perf_counter() - start,
+                    call_site=get_call_site(),
+                )
+            )
+
+    @property
+    def num_queries(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def get_duplicates(self) -> list[DuplicateQuery]:
+        """
+        Returns queries that were made more than once with the same fingerprint, most repeated first.
+        """
+        counts = Counter(query.fingerprint for query in self.queries)
+        call_sites = {}
+        for query in self.queries:
+            if counts[query.fingerprint] > 1:
+                call_sites.setdefault(query.fingerprint, Counter())[query.call_site] += 1
+
+        return [
+            DuplicateQuery(
+                fingerprint=fingerprint,
+                count=count,
+                call_sites=[call_site for call_site, _ in call_sites[fingerprint].most_common()],
+            )
+            for fingerprint, count in counts.most_common()
+            if count > 1
+        ]
+
+    @property
+    def num_duplicates(self) -> int:
+        """
+        Number of queries that could have been avoided had each fingerprint been queried only once.
+        """
+        return sum(duplicate.count - 1 for duplicate in self.get_duplicates())
+
+    def as_log_dict(self, max_duplicates: int = 5) -> dict:
+        return dict(
+            num_queries=self.num_queries,
+            duration_ms=round(self.duration * 1000, 1),
+            num_duplicates=self.num_duplicates,
+            duplicates=[
+                dict(fingerprint=duplicate.fingerprint, count=duplicate.count, call_sites=duplicate.call_sites)
+                for duplicate in self.get_duplicates()[:max_duplicates]
+            ],
+        )
+
+    def format_report(self) -> str:
+        lines = [f"{self.num_queries} queries in {self.duration * 1000:.1f} ms, {self.num_duplicates} duplicates"]
+
+        for duplicate in self.get_duplicates():
+            lines.append(f"  {duplicate.count}x {duplicate.fingerprint}")
+            lines.extend(f"      at {call_site}" for call_site in duplicate.call_sites)
+
+        lines.append("All queries:")
+        lines.extend(
+            f"  {index}. {query.sql}\n      at {query.call_site}" for index, query in enumerate(self.queries, 1)
+        )
+
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """
+    Records queries made on all database connections within the block.
+
+        with profile_queries() as profile:
+            ...
+        print(profile.format_report())
+    """
+    profile = QueryProfile()
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+
+        yield profile
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, max_duplicates: int | None = None) -> Iterator[QueryProfile]:
+    """
+    Like TestCase.assertNumQueries, but fails only if more than max_queries queries (or, if given, more than
+    max_duplicates duplicate queries) are made. The failure message tells which queries were duplicated
+    and where they were made. Usable in pytest style tests, too.
+    """
+    with profile_queries() as profile:
+        yield profile
+
+    problems = []
+    if profile.num_queries > max_queries:
+        problems.append(f"expected at most {max_queries} queries, got {profile.num_queries}")
+    if max_duplicates is not None and profile.num_duplicates > max_duplicates:
+        problems.append(f"expected at most {max_duplicates} duplicate queries, got {profile.num_duplicates}")
+
+    if problems:
+        raise AssertionError("; ".join(problems) + "\n" + profile.format_report())
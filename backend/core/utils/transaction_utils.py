@@ -0,0 +1,33 @@
+from collections.abc import Callable, Hashable
+from itertools import count
+from typing import Any
+
+from django.db import transaction
+
+_sequence_numbers = count()
+
+
+def on_commit_once(func: Callable[[], Any], key: Hashable, using: str | None = None):
+    """
+    Like transaction.on_commit, but callbacks registered with the same key during the same
+    transaction are coalesced into one that runs on commit. Used to debounce expensive
+    refreshes that are triggered by signals on many instances saved in one transaction
+    (eg. a dimension and all of its values).
+
+    Outside a transaction, runs func immediately like transaction.on_commit does.
+    """
+    connection = transaction.get_connection(using)
+    sequence_number = next(_sequence_numbers)
+
+    def callback():
+        # Callbacks that have not run yet are still in run_on_commit. Those of savepoints that were
+        # rolled back have been dropped, so only the last remaining callback with this key runs.
+        for _sids, other_callback, _robust in connection.run_on_commit:
+            other_key, other_sequence_number = getattr(other_callback, "on_commit_once", (None, -1))
+            if other_key == key and other_sequence_number > sequence_number:
+                return
+
+        func()
+
+    callback.on_commit_once = (key, sequence_number)  # type: ignore
+    transaction.on_commit(callback, using=using)
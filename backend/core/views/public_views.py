@@ -8,6 +8,7 @@ from django.utils.timezone import now
 
 from payments.models.checkout_payment import CHECKOUT_PAYMENT_WALL_ORIGIN
 
+from ..event_box_registry import get_event_box_contexts
 from ..helpers import public_organization_required
 from ..models import Event
 from ..utils import groups_of_n
@@ -49,38 +50,7 @@ def core_event_view(request, event_slug):
         settings=settings,
     )
 
-    if event.enrollment_event_meta:
-        from enrollment.views import enrollment_event_box_context
-
-        vars.update(enrollment_event_box_context(request, event))
-
-    if event.labour_event_meta:
-        from labour.views import labour_event_box_context
-
-        vars.update(labour_event_box_context(request, event))
-
-    if event.programme_event_meta:
-        from programme.views import programme_event_box_context
-
-        vars.update(programme_event_box_context(request, event))
-
-    if event.tickets_event_meta:
-        from tickets.views import tickets_event_box_context
-
-        vars.update(tickets_event_box_context(request, event))
-
-    from forms.views.forms_event_box_context import forms_event_box_context
-
-    vars.update(forms_event_box_context(request, event))
-
-    if event.badges_event_meta:
-        from badges.views import badges_event_box_context
-
-        vars.update(badges_event_box_context(request, event))
-
-    if event.intra_event_meta:
-        from intra.views import intra_event_box_context
-
-        vars.update(intra_event_box_context(request, event))
+    # the boxes of the apps the event uses (see core/event_box_registry.py)
+    vars.update(get_event_box_contexts(request, event))
 
     return render(request, "core_event_view.pug", vars)
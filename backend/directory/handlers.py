@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from enrollment.models import Enrollment
+from labour.models import ArchivedSignup, Signup
+from membership.models import Membership
+from programme.models import ProgrammeRole
+
+from .models import Involvement
+
+
+# Involvement only depends on the existence of the source rows, so eg. state changes of signups need no refresh
+@receiver(post_save, sender=ArchivedSignup)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=Membership)
+@receiver(post_save, sender=ProgrammeRole)
+@receiver(post_save, sender=Signup)
+def involvement_source_post_save(sender, instance, *, created: bool, **kwargs):
+    if created:
+        Involvement.refresh([instance.person_id])
+
+
+@receiver(post_delete, sender=ArchivedSignup)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=Membership)
+@receiver(post_delete, sender=ProgrammeRole)
+@receiver(post_delete, sender=Signup)
+def involvement_source_post_delete(sender, instance, **kwargs):
+    Involvement.refresh([instance.person_id])
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Refreshes the involvement index and the search vectors of people used by the directory"
+
+    def handle(*args, **opts):
+        from core.models import Person
+        from directory.models import Involvement
+
+        Involvement.refresh()
+        Person.refresh_search_vectors(Person.objects.all())
@@ -0,0 +1,93 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_INVOLVEMENT_SQL = """
+insert into directory_involvement (person_id, organization_id, event_id, kind)
+select distinct s.person_id, e.organization_id, s.event_id, 'signup'
+from labour_signup s join core_event e on e.id = s.event_id
+union
+select distinct s.person_id, e.organization_id, s.event_id, 'archived_signup'
+from labour_archivedsignup s join core_event e on e.id = s.event_id
+union
+select distinct r.person_id, e.organization_id, e.id, 'programme_role'
+from programme_programmerole r
+join programme_programme p on p.id = r.programme_id
+join programme_category c on c.id = p.category_id
+join core_event e on e.id = c.event_id
+union
+select distinct m.person_id, m.organization_id, null, 'membership'
+from membership_membership m
+union
+select distinct en.person_id, e.organization_id, en.event_id, 'enrollment'
+from enrollment_enrollment en join core_event e on e.id = en.event_id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0041_person_search_vector"),
+        ("directory", "0001_initial"),
+        ("enrollment", "0009_alter_enrollment_is_public_and_more"),
+        ("labour", "0038_jobrequirement_unique_job_start_time"),
+        ("membership", "0016_auto_20200723_1912"),
+        ("programme", "0125_remove_programme_ropecon2024_language_prog_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Involvement",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("signup", "Volunteer"),
+                            ("archived_signup", "Volunteer (archived)"),
+                            ("programme_role", "Programme host"),
+                            ("membership", "Member"),
+                            ("enrollment", "Enrollment"),
+                        ],
+                        max_length=15,
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="involvements",
+                        to="core.event",
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="involvements",
+                        to="core.organization",
+                    ),
+                ),
+                (
+                    "person",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="involvements",
+                        to="core.person",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "involvement",
+                "verbose_name_plural": "involvements",
+                "indexes": [
+                    models.Index(fields=["organization", "person"], name="directory_involvement_org"),
+                    models.Index(fields=["event", "kind", "person"], name="directory_involvement_event"),
+                ],
+            },
+        ),
+        migrations.RunSQL(POPULATE_INVOLVEMENT_SQL, migrations.RunSQL.noop, elidable=True),
+    ]
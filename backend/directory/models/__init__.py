@@ -1,3 +1,4 @@
 # flake8: noqa
 from .directory_access_group import DirectoryAccessGroup
 from .directory_organization_meta import DirectoryOrganizationMeta
+from .involvement import Involvement
@@ -0,0 +1,129 @@
+from collections.abc import Iterable
+
+from django.db import models, transaction
+from django.utils.translation import gettext_lazy as _
+
+
+class Involvement(models.Model):
+    """
+    Index of who has been involved in which organization and event, and how.
+
+    The directory lists people of an organization or event. Instead of joining through signups, archived
+    signups, programme roles, memberships and enrollments on every page load, it uses this table that is
+    kept up to date by the signal handlers in directory/handlers.py when source rows are created or deleted.
+    Changes that bypass those signals are only picked up by `python manage.py directory_refresh_involvement`:
+    QuerySet.update and bulk_create, moving a signup or role to another person or event, moving a programme
+    to another category or event, and moving an event to another organization.
+    """
+
+    class Kind(models.TextChoices):
+        SIGNUP = "signup", _("Volunteer")
+        ARCHIVED_SIGNUP = "archived_signup", _("Volunteer (archived)")
+        PROGRAMME_ROLE = "programme_role", _("Programme host")
+        MEMBERSHIP = "membership", _("Member")
+        ENROLLMENT = "enrollment", _("Enrollment")
+
+    person = models.ForeignKey("core.Person", on_delete=models.CASCADE, related_name="involvements")
+    organization = models.ForeignKey("core.Organization", on_delete=models.CASCADE, related_name="involvements")
+    # memberships are not related to any event
+    event = models.ForeignKey(
+        "core.Event",
+        on_delete=models.CASCADE,
+        related_name="involvements",
+        null=True,
+        blank=True,
+    )
+    kind = models.CharField(max_length=max(len(kind) for kind in Kind.values), choices=Kind.choices)
+
+    class Meta:
+        verbose_name = _("involvement")
+        verbose_name_plural = _("involvements")
+        indexes = [
+            models.Index(fields=["organization", "person"], name="directory_involvement_org"),
+            models.Index(fields=["event", "kind", "person"], name="directory_involvement_event"),
+        ]
+
+    def __str__(self):
+        return f"{self.person} ({self.organization}, {self.event}): {self.kind}"
+
+    @classmethod
+    def get_sources(cls):
+        """
+        Returns (kind, queryset) pairs. Each queryset yields (person_id, organization_id, event_id) tuples.
+        """
+        from enrollment.models import Enrollment
+        from labour.models import ArchivedSignup, Signup
+        from membership.models import Membership
+        from programme.models import ProgrammeRole
+
+        return [
+            (cls.Kind.SIGNUP, Signup.objects.values_list("person_id", "event__organization_id", "event_id")),
+            (
+                cls.Kind.ARCHIVED_SIGNUP,
+                ArchivedSignup.objects.values_list("person_id", "event__organization_id", "event_id"),
+            ),
+            (
+                cls.Kind.PROGRAMME_ROLE,
+                ProgrammeRole.objects.values_list(
+                    "person_id",
+                    "programme__category__event__organization_id",
+                    "programme__category__event_id",
+                ),
+            ),
+            (
+                cls.Kind.MEMBERSHIP,
+                Membership.objects.annotate(
+                    no_event=models.Value(None, output_field=models.IntegerField()),
+                ).values_list("person_id", "organization_id", "no_event"),
+            ),
+            (cls.Kind.ENROLLMENT, Enrollment.objects.values_list("person_id", "event__organization_id", "event_id")),
+        ]
+
+    @classmethod
+    def refresh(cls, person_ids: Iterable[int] | None = None):
+        """
+        Brings the involvements of the given people (or everyone) up to date with the source tables.
+        Only rows that changed are deleted or inserted.
+        """
+        if person_ids is not None:
+            person_ids = list(person_ids)
+            if not person_ids:
+                return
+
+        expected = set()
+        for kind, source_qs in cls.get_sources():
+            if person_ids is not None:
+                source_qs = source_qs.filter(person_id__in=person_ids)
+
+            expected.update((*row, kind) for row in source_qs.distinct())
+
+        with transaction.atomic():
+            existing_qs = cls.objects.all()
+            if person_ids is not None:
+                existing_qs = existing_qs.filter(person_id__in=person_ids)
+
+            ids_to_delete = []
+            existing = set()
+            for id, *key in existing_qs.select_for_update().values_list(
+                "id",
+                "person_id",
+                "organization_id",
+                "event_id",
+                "kind",
+            ):
+                key = tuple(key)
+                if key in expected and key not in existing:
+                    existing.add(key)
+                else:
+                    # stale or duplicate
+                    ids_to_delete.append(id)
+
+            if ids_to_delete:
+                cls.objects.filter(id__in=ids_to_delete).delete()
+
+            cls.objects.bulk_create(
+                [
+                    cls(person_id=person_id, organization_id=organization_id, event_id=event_id, kind=kind)
+                    for (person_id, organization_id, event_id, kind) in expected - existing
+                ]
+            )
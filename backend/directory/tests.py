@@ -0,0 +1,70 @@
+from unittest import mock
+
+import pytest
+
+from core.models import Person
+from labour.models import Signup
+
+from .models import Involvement
+
+
+@pytest.mark.django_db
+def test_involvement_follows_signups():
+    signup, unused = Signup.get_or_create_dummy()
+    person = signup.person
+    event = signup.event
+    organization = event.organization
+
+    assert list(organization.people) == [person]
+    assert list(event.people) == [person]
+    assert Involvement.objects.filter(person=person, event=event, kind=Involvement.Kind.SIGNUP).exists()
+
+    # saving an existing signup does not change involvement
+    with mock.patch.object(Involvement, "refresh") as refresh:
+        signup.save()
+    refresh.assert_not_called()
+
+    signup.delete()
+    assert not organization.people.exists()
+    assert not event.people.exists()
+
+
+@pytest.mark.django_db
+def test_involvement_refresh():
+    signup, unused = Signup.get_or_create_dummy()
+    person = signup.person
+    organization = signup.event.organization
+
+    # bypasses signals
+    Involvement.objects.all().delete()
+    assert not organization.people.exists()
+
+    Involvement.refresh()
+    assert list(organization.people) == [person]
+
+    # idempotent
+    Involvement.refresh()
+    assert Involvement.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_person_search():
+    person, unused = Person.get_or_create_dummy()
+    people = Person.objects.all()
+
+    # prefixes of name, nick, email and username
+    assert list(Person.search(people, "mark mahti")) == [person]
+    assert list(Person.search(people, "mahti@example")) == [person]
+    assert list(Person.search(people, "Mah")) == [person]
+
+    # misspelt surname
+    assert list(Person.search(people, "Mahtinenn")) == [person]
+
+    assert not Person.search(people, "Virtanen").exists()
+
+    # tsquery syntax in the query is taken literally instead of causing a syntax error
+    assert list(Person.search(people, "mahti | ! ' :*")) == [person]
+
+    person.surname = "Virtanen"
+    person.save()
+    assert list(Person.search(people, "virt")) == [person]
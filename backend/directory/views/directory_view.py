@@ -1,9 +1,9 @@
 from django.contrib import messages
-from django.contrib.postgres.search import SearchVector
 from django.shortcuts import get_object_or_404, render
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods
 
+from core.models import Person
 from core.sort_and_filter import Filter
 from event_log.utils import emit
 
@@ -32,9 +32,7 @@ def directory_view(request, vars, organization):
     if search_form.is_valid():
         query = search_form.cleaned_data["query"]
         if query:
-            people = people.annotate(
-                search=SearchVector("first_name", "surname", "nick", "email", "phone", "user__username"),
-            ).filter(search=query)
+            people = Person.search(people, query)
 
     hide_warning = None
     if request.method == "POST":
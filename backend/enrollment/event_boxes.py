@@ -0,0 +1,12 @@
+from core.event_box_registry import ModelInvalidation, register
+
+from .views import enrollment_event_box_context
+
+register(
+    "enrollment",
+    enrollment_event_box_context,
+    invalidated_by=[
+        ModelInvalidation("enrollment.EnrollmentEventMeta"),
+        ModelInvalidation("enrollment.Enrollment", get_user_id=lambda enrollment: enrollment.person.user_id),
+    ],
+)
@@ -1,27 +1,22 @@
-from core.models import Person
+from core.event_box_registry import EventBoxContext
 
 from ..models import Enrollment
 
 
 def enrollment_event_box_context(request, event):
+    box = EventBoxContext.for_request(request, event)
+    is_enrollment_admin = box.is_user_admin(event.enrollment_event_meta)
     enrollment = None
-    is_enrollment_admin = False
 
-    if request.user.is_authenticated:
-        is_enrollment_admin = event.enrollment_event_meta.is_user_admin(request.user)
-
-        try:
-            person = request.user.person
-            enrollment = Enrollment.objects.get(
-                event=event,
-                person=person,
-                state__in=[
-                    "NEW",
-                    "ACCEPTED",
-                ],
-            )
-        except (Person.DoesNotExist, Enrollment.DoesNotExist):
-            pass
+    if box.person:
+        enrollment = Enrollment.objects.filter(
+            event=event,
+            person=box.person,
+            state__in=[
+                "NEW",
+                "ACCEPTED",
+            ],
+        ).first()
 
     return dict(
         enrollment=enrollment,
@@ -4,6 +4,7 @@ from .models.dimension import Dimension, DimensionValue, ResponseDimensionValue
 from .models.form import Form
 from .models.response import Response
 from .models.survey import Survey
+from .models.survey_summary import SurveySummary
 
 
 @admin.register(Form)
@@ -13,6 +14,14 @@ class FormAdmin(admin.ModelAdmin):
     list_filter = ("event",)
     search_fields = ("slug", "title")
 
+    def delete_model(self, request, obj):
+        SurveySummary.invalidate_forms([obj.id])
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        SurveySummary.invalidate_forms(queryset.values("id"))
+        super().delete_queryset(request, queryset)
+
 
 class ResponseDimensionValueInline(admin.TabularInline):
     model = ResponseDimensionValue
@@ -42,6 +51,14 @@ class ResponseAdmin(admin.ModelAdmin):
     def has_change_permission(self, *args, **kwargs):
         return False
 
+    def delete_model(self, request, obj):
+        SurveySummary.invalidate_forms([obj.form_id])
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        SurveySummary.invalidate_forms(queryset.values("form_id"))
+        super().delete_queryset(request, queryset)
+
 
 class SurveyFormInline(admin.TabularInline):
     model = Survey.languages.through
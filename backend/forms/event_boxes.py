@@ -0,0 +1,6 @@
+from core.event_box_registry import register
+
+from .views.forms_event_box_context import forms_event_box_context
+
+# forms has no event meta model, the box is shown to survey admins of any event
+register("forms", forms_event_box_context, requires_event_meta=False)
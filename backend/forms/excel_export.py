@@ -1,4 +1,4 @@
-from collections.abc import Collection, Sequence
+from collections.abc import Collection, Iterator, Sequence
 from typing import Any, BinaryIO
 
 from django.db import models
@@ -8,6 +8,22 @@ from django.utils.timezone import localtime
 from .models.dimension import Dimension
 from .models.field import Field, FieldType
 from .models.response import Response
+from .utils.process_form_data import FormDataProcessor
+
+CHUNK_SIZE = 2000
+
+# extension -> csv dialect (or "xlsx")
+EXPORT_FORMATS = dict(
+    xlsx="xlsx",
+    csv="excel",
+    tsv="excel-tab",
+)
+
+CONTENT_TYPES = dict(
+    xlsx="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    csv="text/csv; charset=utf-8",
+    tsv="text/tab-separated-values; charset=utf-8",
+)
 
 
 def get_header_cells(field: Field) -> list[str]:
@@ -52,26 +68,38 @@ def get_response_cells(field: Field, values: dict[str, Any]) -> list[Any]:
     return cells
 
 
-def write_responses_as_excel(
+def get_response_rows(
     dimensions: Collection[Dimension],
     fields: Sequence[Field],
     responses: models.QuerySet[Response],
-    output_stream: BinaryIO | HttpResponse,
-):
-    from core.excel_export import XlsxWriter
-
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[list[Any]]:
+    """
+    Yields the header row followed by one row per response.
+
+    Responses are iterated in chunks using a server-side cursor with the form preloaded,
+    so memory use does not depend on the number of responses.
+    """
     # No meaningful way to include FileUpload fields for now.
     fields = [field for field in fields if field.type != FieldType.FILE_UPLOAD]
-
-    output = XlsxWriter(output_stream)
+    dimensions = list(dimensions)
 
     header_row = ["created_at", "language"]
     header_row.extend(f"dimensions.{dimension.slug}" for dimension in dimensions)
     header_row.extend(cell for field in fields for cell in get_header_cells(field))
-    output.writerow(header_row)
+    yield header_row
+
+    responses = responses.select_related("form").only(
+        "form_data",
+        "created_at",
+        "cached_dimensions",
+        "form__language",
+    )
 
-    for response in responses:
-        values, _warnings = response.get_processed_form_data(fields)
+    processor = FormDataProcessor(fields)
+
+    for response in responses.iterator(chunk_size=chunk_size):
+        values, _warnings = processor.process(response.form_data)
 
         response_row = [
             localtime(response.created_at).replace(tzinfo=None),
@@ -79,6 +107,49 @@ def write_responses_as_excel(
         ]
         response_row.extend(", ".join(response.cached_dimensions.get(dimension.slug, [])) for dimension in dimensions)
         response_row.extend(cell for field in fields for cell in get_response_cells(field, values))
-        output.writerow(response_row)
+        yield response_row
+
+
+def write_responses_as_excel(
+    dimensions: Collection[Dimension],
+    fields: Sequence[Field],
+    responses: models.QuerySet[Response],
+    output_stream: BinaryIO | HttpResponse,
+):
+    from core.excel_export import XlsxWriter
+
+    output = XlsxWriter(output_stream, constant_memory=True)
+
+    for row in get_response_rows(dimensions, fields, responses):
+        output.writerow(row)
 
     output.close()
+
+
+def stream_responses(
+    dimensions: Collection[Dimension],
+    fields: Sequence[Field],
+    responses: models.QuerySet[Response],
+    format: str,
+) -> Iterator[bytes]:
+    """
+    Yields the responses in the given format (see EXPORT_FORMATS) for use with StreamingHttpResponse.
+
+    CSV and TSV rows are sent as they are produced. XLSX is built on disk in constant memory mode
+    and sent once complete, as a ZIP file cannot be streamed before it is finished.
+    """
+    from core.csv_export import iter_csv
+    from core.excel_export import XlsxWriter
+
+    rows = get_response_rows(dimensions, fields, responses)
+
+    match format:
+        case "xlsx":
+            output = XlsxWriter(constant_memory=True)
+            for row in rows:
+                output.writerow(row)
+            yield from output.iter_close()
+        case "csv" | "tsv":
+            yield from iter_csv(rows, dialect=EXPORT_FORMATS[format])
+        case _:
+            raise NotImplementedError(format)
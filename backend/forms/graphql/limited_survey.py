@@ -3,6 +3,7 @@ from django.conf import settings
 from graphene_django import DjangoObjectType
 
 from ..models.survey import Survey
+from .loaders import forms_by_survey_id_loader
 
 DEFAULT_LANGUAGE: str = settings.LANGUAGE_CODE
 
@@ -12,7 +13,8 @@ class LimitedSurveyType(DjangoObjectType):
 
     @staticmethod
     def resolve_title(parent: Survey, info, lang: str = DEFAULT_LANGUAGE) -> str | None:
-        return form.title if (form := parent.get_form(lang)) else None
+        forms = forms_by_survey_id_loader(info).load(parent.id)
+        return form.title if (form := Survey.pick_form(forms, lang)) else None
 
     is_active = graphene.Field(graphene.NonNull(graphene.Boolean))
 
@@ -0,0 +1,110 @@
+"""
+Request-scoped DataLoaders for survey responses (see core/graphql/dataloader.py).
+"""
+
+from collections.abc import Mapping
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AbstractUser
+from django.db.models import Count
+
+from core.graphql.dataloader import DataLoader
+
+from ..models.dimension import Dimension
+from ..models.form import Form
+from ..models.survey import Survey
+
+
+def batch_load_forms(form_ids: list[int]) -> Mapping[int, Form]:
+    return Form.objects.in_bulk(form_ids)
+
+
+def batch_load_surveys_by_form_id(form_ids: list[int]) -> Mapping[int, Survey]:
+    return {
+        survey_language.form_id: survey_language.survey
+        for survey_language in Survey.languages.through.objects.filter(form_id__in=form_ids).select_related("survey")
+    }
+
+
+def batch_load_forms_by_survey_id(survey_ids: list[int]) -> Mapping[int, list[Form]]:
+    forms_by_survey_id: dict[int, list[Form]] = {survey_id: [] for survey_id in survey_ids}
+
+    for survey_language in (
+        Survey.languages.through.objects.filter(survey_id__in=survey_ids)
+        .select_related("form")
+        .order_by("form__language")
+    ):
+        forms_by_survey_id[survey_language.survey_id].append(survey_language.form)
+
+    return forms_by_survey_id
+
+
+def batch_load_response_counts(survey_ids: list[int]) -> Mapping[int, int]:
+    counts_by_survey_id: dict[int, int] = {survey_id: 0 for survey_id in survey_ids}
+
+    for survey_id, count in (
+        Survey.languages.through.objects.filter(survey_id__in=survey_ids)
+        .values_list("survey_id")
+        .annotate(count=Count("form__responses"))
+    ):
+        counts_by_survey_id[survey_id] += count
+
+    return counts_by_survey_id
+
+
+def batch_load_users(user_ids: list[int]) -> Mapping[int, AbstractUser]:
+    return get_user_model().objects.in_bulk(user_ids)
+
+
+def batch_load_key_dimension_slugs(survey_ids: list[int]) -> Mapping[int, frozenset[str]]:
+    slugs_by_survey_id: dict[int, set[str]] = {survey_id: set() for survey_id in survey_ids}
+
+    for survey_id, slug in Dimension.objects.filter(survey_id__in=survey_ids, is_key_dimension=True).values_list(
+        "survey_id",
+        "slug",
+    ):
+        slugs_by_survey_id[survey_id].add(slug)
+
+    return {survey_id: frozenset(slugs) for survey_id, slugs in slugs_by_survey_id.items()}
+
+
+def form_loader(info) -> DataLoader[int, Form]:
+    return DataLoader.for_request(info, batch_load_forms)
+
+
+def survey_by_form_id_loader(info) -> DataLoader[int, Survey | None]:
+    return DataLoader.for_request(info, batch_load_surveys_by_form_id)
+
+
+def forms_by_survey_id_loader(info) -> DataLoader[int, list[Form]]:
+    return DataLoader.for_request(info, batch_load_forms_by_survey_id, default=[])
+
+
+def response_count_loader(info) -> DataLoader[int, int]:
+    return DataLoader.for_request(info, batch_load_response_counts, default=0)
+
+
+def prime_survey_list_loaders(info, surveys: list[Survey]):
+    """
+    Lists of surveys show the language versions and the number of responses of each survey.
+    """
+    survey_ids = [survey.id for survey in surveys]
+    forms_by_survey_id_loader(info).prime(survey_ids)
+    response_count_loader(info).prime(survey_ids)
+
+
+def user_loader(info) -> DataLoader[int, AbstractUser | None]:
+    return DataLoader.for_request(info, batch_load_users)
+
+
+def key_dimension_slugs_loader(info) -> DataLoader[int, frozenset[str]]:
+    return DataLoader.for_request(info, batch_load_key_dimension_slugs, default=frozenset())
+
+
+def prime_survey_loaders(info, survey: Survey):
+    """
+    Forms and surveys of responses to a survey are known beforehand.
+    """
+    forms = {form.id: form for form in survey.languages.all()}
+    form_loader(info).prime_values(forms)
+    survey_by_form_id_loader(info).prime_values({form_id: survey for form_id in forms})
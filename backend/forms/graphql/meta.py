@@ -8,6 +8,7 @@ from core.utils import get_objects_within_period, normalize_whitespace
 from ..models.meta import FormsEventMeta, FormsProfileMeta
 from ..models.response import Response
 from ..models.survey import Survey
+from .loaders import prime_survey_list_loaders
 from .response import ProfileResponseType
 from .survey import SurveyType
 
@@ -25,7 +26,10 @@ class FormsEventMetaType(graphene.ObjectType):
         else:
             qs = get_objects_within_period(Survey, event=meta.event)
 
-        return qs
+        surveys = list(qs.select_related("event__organization"))
+        prime_survey_list_loaders(info, surveys)
+
+        return surveys
 
     survey = graphene.Field(SurveyType, slug=graphene.String(required=True))
 
@@ -6,6 +6,7 @@ from core.utils import get_ip
 
 from ...models.response import Response
 from ...models.survey import Survey
+from ...models.survey_summary import SurveySummary
 from ..response import ProfileResponseType
 
 
@@ -65,5 +66,6 @@ class CreateSurveyResponse(graphene.Mutation):
             )
 
             response.lift_dimension_values()
+            SurveySummary.add_response(survey, response)
 
         return CreateSurveyResponse(response=response)  # type: ignore
@@ -3,6 +3,7 @@ import graphene
 from access.cbac import graphql_check_instance
 
 from ...models.survey import Survey
+from ...models.survey_summary import SurveySummary
 
 
 class DeleteSurveyLanguageInput(graphene.InputObjectType):
@@ -32,6 +33,7 @@ class DeleteSurveyLanguage(graphene.Mutation):
         if not form.can_remove:
             raise Exception("Cannot delete survey language")
 
+        SurveySummary.invalidate_forms([form.id])
         form.delete()
 
         return DeleteSurveyLanguage(language=input.language)  # type: ignore
@@ -7,8 +7,10 @@ from core.graphql.user import LimitedUserType
 from core.utils.text_utils import normalize_whitespace
 
 from ..models.response import Response
+from ..utils.process_form_data import FormDataProcessor
 from .dimension import ResponseDimensionValueType
 from .form import FormType
+from .loaders import form_loader, key_dimension_slugs_loader, survey_by_form_id_loader, user_loader
 
 
 class LimitedResponseType(DjangoObjectType):
@@ -18,15 +20,16 @@ class LimitedResponseType(DjangoObjectType):
         info,
         key_fields_only: bool = False,
     ):
-        fields = response.form.validated_fields
+        slugs = None
 
         if key_fields_only:
-            survey = response.form.survey
-            key_fields = survey.key_fields if survey else []
-            fields = [field for field in fields if field.slug in key_fields]
+            survey = survey_by_form_id_loader(info).load(response.form_id)
+            slugs = survey.key_fields if survey else []
+
+        form = form_loader(info).load(response.form_id)
 
         # TODO discards warnings :(
-        return response.get_processed_form_data(fields)[0]
+        return FormDataProcessor.for_form(form, slugs).process(response.form_data)[0]
 
     values = graphene.Field(
         GenericScalar,
@@ -41,7 +44,7 @@ class LimitedResponseType(DjangoObjectType):
 
     @staticmethod
     def resolve_language(response: Response, info):
-        return response.form.language
+        return form_loader(info).load(response.form_id).language
 
     language = graphene.Field(
         graphene.NonNull(graphene.String),
@@ -54,10 +57,10 @@ class LimitedResponseType(DjangoObjectType):
         Returns the user who submitted the response. If response is to an anonymous survey,
         this information will not be available.
         """
-        if (survey := response.form.survey) and survey.anonymity in ("hard", "soft"):
+        if (survey := survey_by_form_id_loader(info).load(response.form_id)) and survey.anonymity in ("hard", "soft"):
             return None
 
-        return response.created_by
+        return user_loader(info).load(response.created_by_id)
 
     created_by = graphene.Field(
         LimitedUserType,
@@ -78,10 +81,11 @@ class LimitedResponseType(DjangoObjectType):
         cached_dimensions = response.cached_dimensions
 
         if key_dimensions_only:
-            key_dimension_slugs = response.dimensions.filter(
-                dimension__slug__in=cached_dimensions.keys(),
-                dimension__is_key_dimension=True,
-            ).values_list("dimension__slug", flat=True)
+            survey = survey_by_form_id_loader(info).load(response.form_id)
+            if survey is None:
+                return {}
+
+            key_dimension_slugs = key_dimension_slugs_loader(info).load(survey.id)
 
             return {k: v for k, v in cached_dimensions.items() if k in key_dimension_slugs}
 
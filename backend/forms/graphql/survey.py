@@ -3,15 +3,22 @@ from django.conf import settings
 from graphene.types.generic import GenericScalar
 
 from access.cbac import graphql_query_cbac_required
-from core.graphql.common import DimensionFilterInput
+from core.graphql.common import DimensionFilterInput, DimensionFilterMode
 from core.utils import normalize_whitespace
 
 from ..models.form import Form
 from ..models.survey import Survey
-from ..utils.summarize_responses import summarize_responses
+from ..models.survey_summary import SurveySummary
 from .dimension import SurveyDimensionType
 from .form import FormType
 from .limited_survey import LimitedSurveyType
+from .loaders import (
+    forms_by_survey_id_loader,
+    key_dimension_slugs_loader,
+    prime_survey_loaders,
+    response_count_loader,
+    user_loader,
+)
 from .response import FullResponseType, LimitedResponseType
 
 DEFAULT_LANGUAGE: str = settings.LANGUAGE_CODE
@@ -75,16 +82,24 @@ class SurveyType(LimitedSurveyType):
         survey: Survey,
         info,
         filters: list[DimensionFilterInput] | None = None,
+        filter_mode: DimensionFilterMode = DimensionFilterMode.EXACT,
     ):
         """
         Returns the responses to this survey regardless of language version used.
         Authorization required.
         """
-        return DimensionFilterInput.filter(survey.responses.all(), filters)
+        responses = list(DimensionFilterInput.filter(survey.responses.all(), filters, filter_mode))
+
+        prime_survey_loaders(info, survey)
+        user_loader(info).prime(response.created_by_id for response in responses)
+        key_dimension_slugs_loader(info).prime([survey.id])
+
+        return responses
 
     responses = graphene.List(
         graphene.NonNull(LimitedResponseType),
         filters=graphene.List(DimensionFilterInput),
+        filter_mode=DimensionFilterMode(),
         description=normalize_whitespace(resolve_responses.__doc__ or ""),
     )
 
@@ -123,16 +138,21 @@ class SurveyType(LimitedSurveyType):
         survey: Survey,
         info,
         filters: list[DimensionFilterInput] | None = None,
+        filter_mode: DimensionFilterMode = DimensionFilterMode.EXACT,
     ):
         """
         Returns the number of responses to this survey regardless of language version used.
         Authorization required.
         """
-        return DimensionFilterInput.filter(survey.responses.all(), filters).count()
+        if not filters:
+            return response_count_loader(info).load(survey.id)
+
+        return DimensionFilterInput.filter(survey.responses.all(), filters, filter_mode).count()
 
     count_responses = graphene.Field(
         graphene.NonNull(graphene.Int),
         filters=graphene.List(DimensionFilterInput),
+        filter_mode=DimensionFilterMode(),
         description=normalize_whitespace(resolve_count_responses.__doc__ or ""),
     )
 
@@ -149,10 +169,7 @@ class SurveyType(LimitedSurveyType):
         that language is used as the base for the combined fields. Order of fields
         not present in the base language is not guaranteed. Authorization required.
         """
-        responses = DimensionFilterInput.filter(survey.responses.all(), filters)
-        fields = survey.get_combined_fields(lang)
-        valuesies = [response.get_processed_form_data(fields)[0] for response in responses.only("form_data")]
-        summary = summarize_responses(fields, valuesies)
+        summary = SurveySummary.get_or_build(survey, lang, filters).get_full_summary()
 
         return {slug: summary.model_dump(by_alias=True) for slug, summary in summary.items()}
 
@@ -180,7 +197,7 @@ class SurveyType(LimitedSurveyType):
     @staticmethod
     def resolve_languages(parent: Survey, info):
         # TODO supported_languages order instead of alphabetical?
-        return parent.languages.order_by("language")
+        return forms_by_survey_id_loader(info).load(parent.id)
 
     @staticmethod
     def resolve_can_remove(survey: Survey, info):
@@ -0,0 +1,33 @@
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from ..models.form import Form
+from ..models.survey import Survey
+from ..models.survey_summary import SurveySummary
+
+# NOTE: There are deliberately no receivers for Response and ResponseDimensionValue here. They would cost queries
+# for every row deleted in bulk or by cascade. Code that deletes responses or changes their dimension values
+# invalidates summaries explicitly (see Response.set_dimension_values, SurveySummary.invalidate_forms).
+# Changes to dimensions and their values are handled by Survey.refresh_dimensions (see ./dimension.py).
+
+
+@receiver(post_save, sender=Form)
+def survey_summary_form_post_save(sender, instance: Form, *, created: bool, **kwargs):
+    if created:
+        # not yet associated with a survey
+        return
+
+    for survey in Survey.objects.filter(languages=instance):
+        SurveySummary.invalidate(survey)
+
+
+@receiver(m2m_changed, sender=Survey.languages.through)
+def survey_summary_survey_languages_changed(sender, instance: Survey | Form, action: str, reverse: bool, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        for survey in Survey.objects.filter(languages=instance):
+            SurveySummary.invalidate(survey)
+    elif isinstance(instance, Survey):
+        SurveySummary.invalidate(instance)
@@ -0,0 +1,91 @@
+import random
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ...models.field import Field, FieldType
+from ...utils.process_form_data import FormDataProcessor, process_form_data
+from .benchmark_summarize_responses import CHECKED_PROBABILITY, MISSING_PROBABILITY, make_fields
+
+
+def make_form_data(rng: random.Random, fields: list[Field]) -> dict[str, Any]:
+    """
+    Generates raw form data (as in `Object.fromEntries(formData.entries())`) for one synthetic response.
+    """
+    form_data: dict[str, Any] = {}
+
+    for field in fields:
+        if rng.random() < MISSING_PROBABILITY:
+            continue
+
+        choice_slugs = [choice.slug for choice in field.choices or []] + ["removedChoice"]
+
+        match field.type:
+            case FieldType.SINGLE_LINE_TEXT if field.html_type == "number":
+                form_data[field.slug] = str(rng.randint(1, 10))
+            case FieldType.SINGLE_LINE_TEXT | FieldType.MULTI_LINE_TEXT:
+                form_data[field.slug] = rng.choice(["", "Hello world", "Lorem ipsum dolor sit amet"])
+            case FieldType.SINGLE_CHECKBOX:
+                form_data[field.slug] = "on" if rng.random() < CHECKED_PROBABILITY else "off"
+            case FieldType.SINGLE_SELECT:
+                form_data[field.slug] = rng.choice(choice_slugs)
+            case FieldType.MULTI_SELECT:
+                for choice_slug in rng.sample(choice_slugs, rng.randint(0, len(choice_slugs))):
+                    form_data[f"{field.slug}.{choice_slug}"] = "on"
+            case FieldType.RADIO_MATRIX:
+                for question in field.questions or []:
+                    if rng.random() >= MISSING_PROBABILITY:
+                        form_data[f"{field.slug}.{question.slug}"] = rng.choice(choice_slugs)
+            case FieldType.FILE_UPLOAD:
+                # invalid S3 URLs so that the benchmark does not depend on S3 settings
+                form_data[field.slug] = "not a list"
+
+    return form_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares processing form data by validating the fields for every response (the old behaviour) "
+        "against reusing a cached FormDataProcessor using a synthetic form"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--responses", type=int, default=10_000)
+        parser.add_argument("--choices", type=int, default=5)
+        parser.add_argument("--questions", type=int, default=10)
+        parser.add_argument("--rounds", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        fields = make_fields(options["choices"], options["questions"])
+        enriched_fields = [field.model_dump(mode="json", by_alias=True, exclude_none=True) for field in fields]
+        form_datas = [make_form_data(rng, fields) for _ in range(options["responses"])]
+
+        def uncached():
+            return [
+                process_form_data([Field.model_validate(field_dict) for field_dict in enriched_fields], form_data)
+                for form_data in form_datas
+            ]
+
+        def cached():
+            processor = FormDataProcessor([Field.model_validate(field_dict) for field_dict in enriched_fields])
+            return [processor.process(form_data) for form_data in form_datas]
+
+        results = {}
+        for implementation in (uncached, cached):
+            timings = []
+            for _ in range(options["rounds"]):
+                t0 = time.perf_counter()
+                results[implementation.__name__] = implementation()
+                timings.append(time.perf_counter() - t0)
+
+            best = min(timings)
+            self.stdout.write(
+                f"{implementation.__name__}: best of {options['rounds']}: {best:.3f} s "
+                f"for {len(form_datas)} responses ({best / len(form_datas) * 1_000_000:.1f} µs per response)"
+            )
+
+        if results["uncached"] != results["cached"]:
+            raise AssertionError("cached FormDataProcessor produced different results")
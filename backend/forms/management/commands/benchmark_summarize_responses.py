@@ -0,0 +1,96 @@
+import random
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ...models.field import Choice, Field, FieldType
+from ...utils.summarize_responses import summarize_responses, summarize_responses_columnar
+
+MISSING_PROBABILITY = 0.1
+CHECKED_PROBABILITY = 0.5
+
+
+def make_fields(num_choices: int, num_questions: int) -> list[Field]:
+    choices = [Choice(slug=f"choice{i}", title=f"Choice {i}") for i in range(num_choices)]
+    questions = [Choice(slug=f"question{i}", title=f"Question {i}") for i in range(num_questions)]
+
+    return [
+        Field(type=FieldType.SINGLE_LINE_TEXT, slug="singleLineText"),
+        Field(type=FieldType.SINGLE_LINE_TEXT, slug="numberField", htmlType="number"),
+        Field(type=FieldType.MULTI_LINE_TEXT, slug="multiLineText"),
+        Field(type=FieldType.DIVIDER, slug="divider"),
+        Field(type=FieldType.SINGLE_CHECKBOX, slug="singleCheckbox"),
+        Field(type=FieldType.SINGLE_SELECT, slug="singleSelect", choices=choices),
+        Field(type=FieldType.MULTI_SELECT, slug="multiSelect", choices=choices),
+        Field(type=FieldType.RADIO_MATRIX, slug="radioMatrix", choices=choices, questions=questions),
+        Field(type=FieldType.FILE_UPLOAD, slug="fileUpload"),
+    ]
+
+
+def make_values(rng: random.Random, fields: list[Field]) -> dict[str, Any]:
+    """
+    Generates processed form data (as returned by process_form_data) for one synthetic response.
+    Some values are left missing and some refer to choices that have since been removed.
+    """
+    values: dict[str, Any] = {}
+
+    for field in fields:
+        if rng.random() < MISSING_PROBABILITY:
+            continue
+
+        choice_slugs = [choice.slug for choice in field.choices or []] + ["removedChoice"]
+
+        match field.type:
+            case FieldType.SINGLE_LINE_TEXT if field.html_type == "number":
+                values[field.slug] = rng.randint(1, 10)
+            case FieldType.SINGLE_LINE_TEXT | FieldType.MULTI_LINE_TEXT:
+                values[field.slug] = rng.choice(["", "Hello world", "Lorem ipsum dolor sit amet"])
+            case FieldType.SINGLE_CHECKBOX:
+                values[field.slug] = rng.random() < CHECKED_PROBABILITY
+            case FieldType.SINGLE_SELECT:
+                values[field.slug] = rng.choice(choice_slugs)
+            case FieldType.MULTI_SELECT:
+                values[field.slug] = rng.sample(choice_slugs, rng.randint(0, len(choice_slugs)))
+            case FieldType.RADIO_MATRIX:
+                values[field.slug] = {
+                    question.slug: rng.choice(choice_slugs)
+                    for question in field.questions or []
+                    if rng.random() >= MISSING_PROBABILITY
+                }
+            case FieldType.FILE_UPLOAD:
+                values[field.slug] = [f"https://example.com/upload{i}.png" for i in range(rng.randint(0, 2))]
+
+    return values
+
+
+class Command(BaseCommand):
+    help = "Compares summarize_responses against summarize_responses_columnar using a synthetic survey"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--responses", type=int, default=100_000)
+        parser.add_argument("--choices", type=int, default=5)
+        parser.add_argument("--questions", type=int, default=10)
+        parser.add_argument("--rounds", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        fields = make_fields(options["choices"], options["questions"])
+        valuesies = [make_values(rng, fields) for _ in range(options["responses"])]
+
+        results = {}
+        for implementation in (summarize_responses, summarize_responses_columnar):
+            timings = []
+            for _ in range(options["rounds"]):
+                t0 = time.perf_counter()
+                results[implementation.__name__] = implementation(fields, valuesies)
+                timings.append(time.perf_counter() - t0)
+
+            self.stdout.write(
+                f"{implementation.__name__}: best of {options['rounds']}: {min(timings):.3f} s "
+                f"for {len(valuesies)} responses"
+            )
+
+        if results["summarize_responses"] != results["summarize_responses_columnar"]:
+            raise AssertionError("summarize_responses_columnar produced a different summary")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from ...models.survey_summary import SurveySummary
+
+
+class Command(BaseCommand):
+    help = "Rebuilds persisted survey summaries from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "event_slugs",
+            nargs="*",
+            metavar="EVENT_SLUG",
+            help="Only rebuild summaries of surveys of these events (default: all)",
+        )
+        parser.add_argument(
+            "--backend",
+            choices=["python", "sql"],
+            default=None,
+            help="Summary backend to use (default: KOMPASSI_SURVEY_SUMMARY_BACKEND)",
+        )
+
+    def handle(self, *args, **options):
+        survey_summaries = SurveySummary.objects.all()
+
+        if event_slugs := options["event_slugs"]:
+            survey_summaries = survey_summaries.filter(survey__event__slug__in=event_slugs)
+
+        SurveySummary.rebuild_qs(survey_summaries, options["backend"])
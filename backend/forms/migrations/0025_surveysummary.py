@@ -0,0 +1,45 @@
+# Generated by Django 5.0.3 on 2024-03-10 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("forms", "0024_alter_form_title"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SurveySummary",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "language",
+                    models.CharField(choices=[("fi", "Finnish"), ("en", "English")], default="fi", max_length=2),
+                ),
+                (
+                    "filters_key",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Canonical JSON representation of dimension filters. Empty = not filtered.",
+                    ),
+                ),
+                ("filters", models.JSONField(default=list, help_text="[[dimension slug, [value slug, ...]], ...]")),
+                ("summary", models.JSONField(default=dict)),
+                ("count_responses", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "survey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="summaries", to="forms.survey"
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("survey", "language", "filters_key")},
+            },
+        ),
+    ]
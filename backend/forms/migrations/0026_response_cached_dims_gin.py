@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2024-03-12 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("forms", "0025_surveysummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="response",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["cached_dimensions"],
+                name="forms_response_cached_dims",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
@@ -4,7 +4,7 @@ import logging
 from typing import Self
 
 import pydantic
-from django.db import models
+from django.db import models, transaction
 
 from core.models import Event
 from core.utils.locale_utils import get_message_in_language
@@ -166,6 +166,7 @@ class DimensionDTO(pydantic.BaseModel):
     is_multi_value: bool = pydantic.Field(default=False, alias="isMultiValue")
     is_shown_to_respondent: bool = pydantic.Field(default=False, alias="isShownToRespondent")
 
+    @transaction.atomic
     def save(self, survey: Survey, order: int = 0):
         dimension, _created = Dimension.objects.update_or_create(
             survey=survey,
@@ -194,8 +195,9 @@ class DimensionDTO(pydantic.BaseModel):
         return dimension
 
     @classmethod
+    @transaction.atomic
     def save_many(cls, survey: Survey, dimensions: list[Self]):
-        # TODO(perf) bulk save & refresh once
+        # NOTE: cached dimensions and enriched fields are refreshed once on commit (see Survey.refresh_dimensions)
         order = 0
         for dimension in dimensions:
             order += 10
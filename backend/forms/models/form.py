@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Any, Self
 
 from django.conf import settings
 from django.db import models, transaction
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
 from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS
@@ -89,8 +90,10 @@ class Form(models.Model):
         forms_to_update = []
         for form in qs.select_for_update(of=("self",)):
             form.cached_enriched_fields = form._build_enriched_fields()
+            # bulk_update does not touch auto_now fields; FormDataProcessor.for_form relies on updated_at
+            form.updated_at = now()
             forms_to_update.append(form)
-        cls.objects.bulk_update(forms_to_update, ["cached_enriched_fields"])
+        cls.objects.bulk_update(forms_to_update, ["cached_enriched_fields", "updated_at"])
 
     def refresh_enriched_fields(self):
         """
@@ -98,7 +101,7 @@ class Form(models.Model):
         NOTE: Use refresh_enriched_fields_qs for bulk updates.
         """
         self.cached_enriched_fields = self._build_enriched_fields()
-        self.save(update_fields=["cached_enriched_fields"])
+        self.save(update_fields=["cached_enriched_fields", "updated_at"])
 
     def _build_enriched_fields(self) -> list[dict[str, Any]]:
         return [self._enrich_field(field) for field in self.fields]
@@ -0,0 +1,23 @@
+-- Rebuilds cached_dimensions (dimension slug -> list of value slugs) for the given responses.
+-- Only dimensions that have values are included (see Response._build_cached_dimensions).
+update forms_response as response
+set cached_dimensions = coalesce(
+    (
+        select jsonb_object_agg(dimension_slug, value_slugs)
+        from (
+            select
+                dimension.slug as dimension_slug,
+                jsonb_agg(value.slug order by rdv.id) as value_slugs
+            from
+                forms_responsedimensionvalue rdv
+                join forms_dimension dimension on (rdv.dimension_id = dimension.id)
+                join forms_dimensionvalue value on (rdv.value_id = value.id)
+            where
+                rdv.response_id = response.id
+            group by dimension.slug
+        ) as dimensions
+    ),
+    jsonb_build_object()
+)
+where
+    response.id in ({response_ids})
@@ -6,9 +6,13 @@ from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
-from django.db import models, transaction
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connection, models, transaction
 from django.db.models import JSONField
 from django.utils.translation import gettext_lazy as _
+from pkg_resources import resource_string
+
+from core.utils import CachedDimensionsQuerySet
 
 from .form import Form
 
@@ -20,6 +24,7 @@ if TYPE_CHECKING:
 
 
 logger = logging.getLogger("kompassi")
+REFRESH_CACHED_DIMENSIONS_QUERY = resource_string(__name__, "queries/refresh_response_cached_dimensions.sql").decode()
 
 
 class Response(models.Model):
@@ -52,6 +57,17 @@ class Response(models.Model):
     # related fields
     dimensions: models.QuerySet[ResponseDimensionValue]
 
+    objects = CachedDimensionsQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["cached_dimensions"],
+                opclasses=["jsonb_path_ops"],
+                name="forms_response_cached_dims",
+            ),
+        ]
+
     @property
     def survey(self) -> Survey | None:
         return self.form.survey
@@ -67,24 +83,15 @@ class Response(models.Model):
         return new_cached_dimensions
 
     @classmethod
-    @transaction.atomic
     def refresh_cached_dimensions_qs(cls, responses: models.QuerySet[Response]):
-        bulk_update = []
-        for response in (
-            responses.select_for_update(of=("self",))
-            .prefetch_related(
-                "dimensions__dimension",
-                "dimensions__value",
-            )
-            .only(
-                "id",
-                "dimensions__dimension__slug",
-                "dimensions__value__slug",
-            )
-        ):
-            response.cached_dimensions = response._build_cached_dimensions()
-            bulk_update.append(response)
-        cls.objects.bulk_update(bulk_update, ["cached_dimensions"])
+        """
+        Rebuilds cached_dimensions of the given responses in a single UPDATE statement
+        (see queries/refresh_response_cached_dimensions.sql).
+        """
+        response_ids_sql, response_ids_params = responses.order_by().values("id").query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(REFRESH_CACHED_DIMENSIONS_QUERY.format(response_ids=response_ids_sql), response_ids_params)
 
     def refresh_cached_dimensions(self):
         self.cached_dimensions = self._build_cached_dimensions()
@@ -198,6 +205,7 @@ class Response(models.Model):
         Changes only those dimension values that are present in dimension_values.
         """
         from .dimension import ResponseDimensionValue
+        from .survey_summary import SurveySummary
 
         survey = self.survey
         if survey is None:
@@ -233,6 +241,9 @@ class Response(models.Model):
         self.cached_dimensions = dict(self.cached_dimensions, **values_to_set)
         self.save(update_fields=["cached_dimensions"])
 
+        # this response may have moved in or out of summaries filtered by these dimensions
+        SurveySummary.invalidate(survey, values_to_set.keys())
+
     def get_processed_form_data(
         self,
         fields: Sequence[Field] | None = None,
@@ -240,10 +251,12 @@ class Response(models.Model):
         """
         If you only need a subset of fields, pass them in as fields.
         Returns a tuple of (values, warnings).
+
+        When processing many responses, prefer using a FormDataProcessor directly.
         """
-        from ..utils.process_form_data import process_form_data
+        from ..utils.process_form_data import FormDataProcessor, process_form_data
 
         if fields is None:
-            fields = self.form.validated_fields
+            return FormDataProcessor.for_form(self.form).process(self.form_data)
 
         return process_form_data(fields, self.form_data)
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Collection, Mapping
+from collections.abc import Collection, Iterable, Mapping
 from typing import TYPE_CHECKING
 
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from core.models import Event
-from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS, is_within_period
+from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS, is_within_period, on_commit_once
 
 from ..utils.merge_form_fields import merge_fields
 from .form import Form
@@ -132,20 +132,22 @@ class Survey(models.Model):
         return merge_fields(languages)
 
     def get_form(self, requested_language: str) -> Form | None:
-        try:
-            return self.languages.get(language=requested_language)
-        except Form.DoesNotExist:
-            pass
+        return self.pick_form(self.languages.all(), requested_language)
 
-        for language, _name in settings.LANGUAGES:
-            if language == requested_language:
-                # already tried above, skip one extra query
-                continue
+    @staticmethod
+    def pick_form(forms: Iterable[Form], requested_language: str) -> Form | None:
+        """
+        Picks the form in the requested language out of the language versions of a survey,
+        falling back to the other languages in the order of settings.LANGUAGES.
+        """
+        forms_by_language = {form.language: form for form in forms}
 
-            try:
-                return self.languages.get(language=language)
-            except Form.DoesNotExist:
-                pass
+        if form := forms_by_language.get(requested_language):
+            return form
+
+        for language, _name in settings.LANGUAGES:
+            if form := forms_by_language.get(language):
+                return form
 
         return None
 
@@ -176,6 +178,34 @@ class Survey(models.Model):
 
         return dimensions_by_slug, values_by_dimension_by_slug
 
+    def refresh_dimensions(self):
+        """
+        Called when dimensions or their values of this survey have changed. Refreshes cached dimensions
+        of responses and enriched fields of forms once the current transaction commits. Changes to the
+        dimensions of the same survey within one transaction (eg. DimensionDTO.save_many) cause only one refresh.
+        """
+        on_commit_once(self._schedule_refresh_dimensions, key=("forms.Survey.refresh_dimensions", self.id))
+
+    def _schedule_refresh_dimensions(self):
+        if "background_tasks" in settings.INSTALLED_APPS:
+            from ..tasks import survey_refresh_dimensions
+
+            survey_refresh_dimensions.delay(self.id)
+        else:
+            self._refresh_dimensions()
+
+    def _refresh_dimensions(self):
+        from .response import Response
+        from .survey_summary import SurveySummary
+
+        # runs after the commit of the change (or in a task), so needs its own transaction for select_for_update
+        with transaction.atomic():
+            Response.refresh_cached_dimensions_qs(self.responses)
+            Form.refresh_enriched_fields_qs(self.languages.all())
+
+            # bulk updates send no signals, and summaries built since the change may have used stale values
+            SurveySummary.invalidate(self)
+
     class Meta:
         unique_together = [("event", "slug")]
 
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Collection, Iterable
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models.fields.json import KeyTransform
+from django.utils.timezone import now
+
+from ..utils.process_form_data import FormDataProcessor
+from ..utils.s3_presign import presign_get
+from ..utils.summarize_responses import (
+    FileUploadSummary,
+    Summary,
+    SummaryAdapter,
+    merge_summaries,
+    summarize_responses,
+    summarize_responses_columnar,
+)
+from ..utils.summarize_responses_sql import summarize_responses_sql
+from .field import Field, FieldType
+from .survey import Survey
+
+if TYPE_CHECKING:
+    from .response import Response
+
+DEFAULT_LANGUAGE: str = settings.LANGUAGE_CODE
+
+# canonical form of a list of DimensionFilterInput: [(dimension_slug, [value_slug, ...]), ...]
+# NOTE: Not a dict because multiple filters on the same dimension are ANDed, not ORed.
+DimensionFilters = list[tuple[str, list[str]]]
+
+# Text-like fields are summarized as a list of every answer (see TextFieldSummary). They are kept out of
+# persisted summaries so that add_response does not rewrite an ever-growing document, and are read live instead.
+TEXT_FIELD_TYPES = (
+    FieldType.SINGLE_LINE_TEXT,
+    FieldType.MULTI_LINE_TEXT,
+    FieldType.DATE_FIELD,
+    FieldType.TIME_FIELD,
+    FieldType.DATE_TIME_FIELD,
+)
+
+# Every persisted summary of a survey that a new response matches is updated when it comes in.
+# Filtered summaries beyond this many are built on each access instead of being persisted.
+MAX_FILTERED_SUMMARIES_PER_SURVEY = 20
+
+# first key of the two-key PostgreSQL advisory locks taken by SurveySummary.lock_survey (the second is the survey id)
+ADVISORY_LOCK_CLASS = 0x5355
+
+
+class SurveySummary(models.Model):
+    """
+    Persisted summary of responses to a survey, optionally filtered by dimensions.
+
+    Building a summary from scratch requires processing every response to the survey.
+    Instead, SurveySummary is built once on first access and then kept up to date
+    incrementally as new responses come in (see `add_response`). Changes that would
+    require reprocessing old responses (editing the form, changing dimensions etc.)
+    simply delete the affected summaries, and they get rebuilt on next access.
+    See ../handlers/survey_summary.py for invalidation.
+
+    File upload summaries are stored as raw S3 URLs and presigned when read
+    because presigned URLs expire. Answers to text fields are not stored at all
+    but read from the responses when the summary is served (see `get_full_summary`).
+
+    Building a summary is serialized with adding responses and invalidation using
+    an advisory lock per survey (see `lock_survey`) so that no response is lost
+    or counted twice, and no summary is built from stale dimensions.
+    """
+
+    survey = models.ForeignKey(Survey, on_delete=models.CASCADE, related_name="summaries")
+    language = models.CharField(max_length=2, default=DEFAULT_LANGUAGE, choices=settings.LANGUAGES)
+    filters_key = models.TextField(
+        blank=True,
+        default="",
+        help_text="Canonical JSON representation of dimension filters. Empty = not filtered.",
+    )
+    filters = models.JSONField(
+        default=list,
+        help_text="[[dimension slug, [value slug, ...]], ...]",
+    )
+
+    summary = models.JSONField(default=dict)
+    count_responses = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("survey", "language", "filters_key")]
+
+    def __str__(self):
+        return f"{self.survey} ({self.language}) {self.filters_key}"
+
+    @staticmethod
+    def normalize_filters(filters: Iterable[Any] | None) -> DimensionFilters:
+        """
+        Accepts a list of DimensionFilterInput (or anything with .dimension and .values)
+        and returns them in a canonical order so that equivalent filters share a summary.
+        """
+        if not filters:
+            return []
+
+        return sorted((filter.dimension, sorted(set(filter.values or []))) for filter in filters)
+
+    @staticmethod
+    def normalize_language(language: str | None) -> str:
+        """
+        Summaries are persisted per language, so only languages in settings.LANGUAGES are accepted
+        (eg. "fi-FI" becomes "fi"). Anything else falls back to the default language.
+        """
+        language = (language or "").split("-")[0].lower()
+
+        if language in dict(settings.LANGUAGES):
+            return language
+
+        return DEFAULT_LANGUAGE
+
+    @staticmethod
+    def get_filters_key(filters: DimensionFilters) -> str:
+        if not filters:
+            return ""
+
+        return json.dumps(filters, separators=(",", ":"))
+
+    def matches(self, cached_dimensions: dict[str, list[str]]) -> bool:
+        """
+        Python equivalent of DimensionFilterInput.filter for a single response.
+        """
+        return all(
+            set(cached_dimensions.get(dimension_slug, [])).intersection(value_slugs)
+            for dimension_slug, value_slugs in self.filters
+        )
+
+    @property
+    def uses_dimensions(self) -> set[str]:
+        return {dimension_slug for dimension_slug, _value_slugs in self.filters}
+
+    def get_summary(self) -> Summary:
+        return SummaryAdapter.validate_python(self.summary)
+
+    def set_summary(self, summary: Summary):
+        self.summary = {slug: field_summary.model_dump(mode="json") for slug, field_summary in summary.items()}
+
+    @staticmethod
+    def is_text_field(field: Field) -> bool:
+        # SingleLineText with htmlType="number" is summarized like a select (see summarize_responses)
+        return field.type in TEXT_FIELD_TYPES and not (
+            field.type == FieldType.SINGLE_LINE_TEXT and field.html_type == "number"
+        )
+
+    @classmethod
+    def get_persisted_fields(cls, survey: Survey, language: str) -> list[Field]:
+        return [field for field in survey.get_combined_fields(language) if not cls.is_text_field(field)]
+
+    def get_responses(self) -> models.QuerySet[Response]:
+        from core.graphql.common import DimensionFilterInput
+
+        filters = [DimensionFilterInput(dimension=dimension, values=values) for dimension, values in self.filters]
+        return DimensionFilterInput.filter(self.survey.responses.all(), filters)
+
+    def get_presigned_summary(self) -> Summary:
+        summary = self.get_summary()
+
+        for field_summary in summary.values():
+            if isinstance(field_summary, FileUploadSummary):
+                field_summary.summary = [presign_get(url) for url in field_summary.summary]
+
+        return summary
+
+    def summarize_text_fields(self, text_fields: list[Field]) -> Summary:
+        """
+        Summarizes text fields from the current responses. Only the form data of those fields is loaded.
+        """
+        processor = FormDataProcessor(text_fields)
+        keys = {f"text_field_{index}": KeyTransform(field.slug, "form_data") for index, field in enumerate(text_fields)}
+
+        valuesies = [
+            processor.process(
+                {field.slug: value for field, value in zip(text_fields, row, strict=True) if value is not None}
+            )[0]
+            for row in self.get_responses().annotate(**keys).values_list(*keys).iterator(chunk_size=1000)
+        ]
+
+        return summarize_responses_columnar(text_fields, valuesies)
+
+    def get_full_summary(self) -> Summary:
+        """
+        Returns the persisted summary with the answers to text fields and presigned file upload URLs.
+        """
+        fields = self.survey.get_combined_fields(self.language)
+        summary = self.get_presigned_summary()
+
+        if text_fields := [field for field in fields if self.is_text_field(field)]:
+            summary.update(self.summarize_text_fields(text_fields))
+
+        # retain field order
+        return {field.slug: summary[field.slug] for field in fields if field.slug in summary}
+
+    @staticmethod
+    def lock_survey(survey: Survey, *, shared: bool):
+        """
+        Takes an advisory lock on the summaries of the survey until the end of the current transaction.
+
+        Building a summary takes it exclusively, and adding a response or invalidating summaries
+        takes it shared. A response or dimension change that commits while a summary is being built
+        either is seen by the build or waits for the built summary to be saved and then updates or
+        deletes it. Adding responses concurrently only contends for the summary rows themselves.
+        """
+        function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {function}(%s, %s)", [ADVISORY_LOCK_CLASS, survey.id])
+
+    @staticmethod
+    def get_summary_values(processor: FormDataProcessor, form_data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Like processor.process(form_data)[0] but leaves file upload URLs unsigned
+        for persistence. Only valid URLs make it this far (see FileUploadFieldProcessor).
+        """
+        values, _warnings = processor.process(form_data)
+
+        for field in processor.fields:
+            if field.type == FieldType.FILE_UPLOAD and field.slug in values:
+                values[field.slug] = form_data[field.slug]
+
+        return values
+
+    def build(self, backend: str | None = None):
+        """
+        Rebuilds the summary from scratch. Does not save.
+
+        backend is either "python" (process all responses in Python) or "sql" (count select-like fields
+        in the database, see ../utils/summarize_responses_sql.py). Defaults to KOMPASSI_SURVEY_SUMMARY_BACKEND.
+        """
+        responses = self.get_responses()
+        fields = self.get_persisted_fields(self.survey, self.language)
+
+        match backend or settings.KOMPASSI_SURVEY_SUMMARY_BACKEND:
+            case "python":
+                processor = FormDataProcessor(fields)
+                valuesies = [
+                    self.get_summary_values(processor, response.form_data)
+                    for response in responses.only("form_data").iterator(chunk_size=1000)
+                ]
+                self.set_summary(summarize_responses_columnar(fields, valuesies))
+                self.count_responses = len(valuesies)
+            case "sql":
+                self.count_responses = responses.count()
+                self.set_summary(
+                    summarize_responses_sql(
+                        fields,
+                        responses,
+                        get_values=self.get_summary_values,
+                        total_responses=self.count_responses,
+                    )
+                )
+            case _:
+                raise ValueError(f"Unknown survey summary backend: {backend}")
+
+    @classmethod
+    def get_or_build(
+        cls,
+        survey: Survey,
+        language: str = DEFAULT_LANGUAGE,
+        filters: Iterable[Any] | None = None,
+        backend: str | None = None,
+    ) -> SurveySummary:
+        language = cls.normalize_language(language)
+        normalized_filters = cls.normalize_filters(filters)
+        filters_key = cls.get_filters_key(normalized_filters)
+
+        try:
+            return cls.objects.get(survey=survey, language=language, filters_key=filters_key)
+        except cls.DoesNotExist:
+            pass
+
+        if (
+            filters_key
+            and cls.objects.filter(survey=survey).exclude(filters_key="").count() >= MAX_FILTERED_SUMMARIES_PER_SURVEY
+        ):
+            # not persisted, so there is nothing to keep up to date
+            survey_summary = cls(survey=survey, language=language, filters_key=filters_key, filters=normalized_filters)
+            survey_summary.build(backend)
+            return survey_summary
+
+        with transaction.atomic():
+            cls.lock_survey(survey, shared=False)
+
+            # another request may have built the same summary while we were waiting for the lock
+            try:
+                return cls.objects.get(survey=survey, language=language, filters_key=filters_key)
+            except cls.DoesNotExist:
+                pass
+
+            survey_summary = cls(
+                survey=survey,
+                language=language,
+                filters_key=filters_key,
+                filters=normalized_filters,
+            )
+            survey_summary.build(backend)
+            survey_summary.save()
+
+        return survey_summary
+
+    @classmethod
+    @transaction.atomic
+    def add_response(cls, survey: Survey, response: Response):
+        """
+        Incrementally adds a newly created response to the existing summaries of the survey.
+        Must be called after the response has its dimensions set (see Response.lift_dimension_values).
+        """
+        cls.lock_survey(survey, shared=True)
+
+        contributions_by_language: dict[str, Summary] = {}
+        bulk_update: list[SurveySummary] = []
+
+        for survey_summary in cls.objects.filter(survey=survey).select_for_update(of=("self",)):
+            if not survey_summary.matches(response.cached_dimensions):
+                continue
+
+            language = survey_summary.language
+            if language not in contributions_by_language:
+                fields = cls.get_persisted_fields(survey, language)
+                values = cls.get_summary_values(FormDataProcessor(fields), response.form_data)
+                contributions_by_language[language] = summarize_responses(fields, [values])
+
+            survey_summary.set_summary(
+                merge_summaries(
+                    survey_summary.get_summary(),
+                    contributions_by_language[language],
+                )
+            )
+            survey_summary.count_responses += 1
+            survey_summary.updated_at = now()
+            bulk_update.append(survey_summary)
+
+        cls.objects.bulk_update(bulk_update, ["summary", "count_responses", "updated_at"])
+
+    @classmethod
+    @transaction.atomic
+    def invalidate(cls, survey: Survey, dimension_slugs: Collection[str] | None = None):
+        """
+        Deletes summaries that can no longer be kept up to date incrementally.
+        If dimension_slugs is given, only those summaries that filter by any of those dimensions are deleted.
+        Otherwise all summaries of the survey are deleted.
+        """
+        cls.lock_survey(survey, shared=True)
+
+        survey_summaries = cls.objects.filter(survey=survey)
+
+        if dimension_slugs is not None:
+            survey_summaries = survey_summaries.filter(
+                id__in=[
+                    survey_summary.id
+                    for survey_summary in survey_summaries.only("id", "filters")
+                    if survey_summary.uses_dimensions.intersection(dimension_slugs)
+                ]
+            )
+
+        survey_summaries.delete()
+
+    @classmethod
+    def invalidate_forms(cls, form_ids: Iterable[int] | models.QuerySet):
+        """
+        Deletes all summaries of the surveys that have any of the forms as a language. Call this before
+        deleting forms or responses. There are deliberately no Response receivers to do it (see
+        ../handlers/survey_summary.py), and removing a form from a survey by cascade sends no m2m_changed.
+        """
+        for survey in Survey.objects.filter(languages__id__in=form_ids).distinct():
+            cls.invalidate(survey)
+
+    @classmethod
+    def rebuild_qs(cls, survey_summaries: models.QuerySet[SurveySummary], backend: str | None = None):
+        """
+        Rebuilds summaries from scratch. Used by the refresh_survey_summaries management command.
+        """
+        for survey_summary in survey_summaries.select_related("survey"):
+            with transaction.atomic():
+                cls.lock_survey(survey_summary.survey, shared=False)
+
+                if not cls.objects.filter(id=survey_summary.id).exists():
+                    # invalidated in the meantime, will be rebuilt on next access
+                    continue
+
+                survey_summary.build(backend)
+                survey_summary.save(update_fields=["summary", "count_responses", "updated_at"])
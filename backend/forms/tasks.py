@@ -0,0 +1,9 @@
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def survey_refresh_dimensions(survey_id):
+    from .models.survey import Survey
+
+    survey = Survey.objects.get(id=survey_id)
+    survey._refresh_dimensions()
@@ -3,21 +3,37 @@ from unittest import mock
 
 import pytest
 import yaml
+from django.contrib.admin import AdminSite
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from core.models import Event
+from core.utils import assert_max_queries, profile_queries
 from graphql_api.schema import schema
 
-from .excel_export import get_header_cells, get_response_cells
+from .admin import ResponseAdmin
+from .excel_export import get_header_cells, get_response_cells, stream_responses
 from .graphql.mutations.put_survey_dimension import PutSurveyDimension
 from .graphql.mutations.update_response_dimensions import UpdateResponseDimensions
 from .models.dimension import Dimension, DimensionValue
 from .models.field import Choice, Field, FieldType
+from .models.form import Form
 from .models.response import Response
 from .models.survey import Survey
+from .models.survey_summary import SurveySummary
 from .utils.merge_form_fields import _merge_choices, _merge_fields
-from .utils.process_form_data import FieldWarning, process_form_data
+from .utils.process_form_data import FieldWarning, FormDataProcessor, process_form_data
 from .utils.s3_presign import BUCKET_NAME, S3_ENDPOINT_URL
-from .utils.summarize_responses import MatrixFieldSummary, SelectFieldSummary, TextFieldSummary, summarize_responses
+from .utils.summarize_responses import (
+    MatrixFieldSummary,
+    SelectFieldSummary,
+    TextFieldSummary,
+    merge_summaries,
+    summarize_responses,
+    summarize_responses_columnar,
+)
+from .utils.summarize_responses_sql import summarize_responses_sql
 
 # pass this as the info param to mutations to appease the graphql_check_access decorator
 # (remember to also mock.patch graphql_check_access)
@@ -590,6 +606,14 @@ def test_summarize_responses():
     }
 
     assert summarize_responses(fields, responses) == expected_summary
+    assert summarize_responses_columnar(fields, responses) == expected_summary
+
+    # summaries of disjoint sets of responses can be merged into a summary of their union
+    merged_summary = summarize_responses(fields, [])
+    for response in responses:
+        merged_summary = merge_summaries(merged_summary, summarize_responses(fields, [response]))
+
+    assert merged_summary == expected_summary
 
 
 @pytest.mark.django_db
@@ -763,3 +787,515 @@ def test_survey_without_forms(_patched_graphql_check_instance):
     )
 
     assert not result.errors
+
+
+@pytest.mark.django_db
+def test_survey_summary_incremental():
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-survey",
+    )
+
+    dimension = Dimension.objects.create(
+        survey=survey,
+        slug="test-dimension",
+        title="Test dimension",
+    )
+
+    DimensionValue.objects.bulk_create(
+        [
+            DimensionValue(
+                dimension=dimension,
+                slug="test-dimension-value-1",
+                title=dict(en="Test dimension value 1"),
+            ),
+            DimensionValue(
+                dimension=dimension,
+                slug="test-dimension-value-2",
+                title=dict(en="Test dimension value 2"),
+            ),
+        ]
+    )
+
+    form = survey.languages.create(
+        event=event,
+        slug="test-survey-en",
+        language="en",
+        fields=[
+            dict(
+                slug="test-dimension",
+                type="SingleSelect",
+                choicesFrom=dict(dimension="test-dimension"),
+            ),
+            dict(
+                slug="singleLineText",
+                type="SingleLineText",
+            ),
+        ],
+    )
+
+    def create_response(form_data):
+        response = Response.objects.create(form=form, form_data=form_data)
+        response.lift_dimension_values()
+        SurveySummary.add_response(survey, response)
+        return response
+
+    create_response({"test-dimension": "test-dimension-value-1", "singleLineText": "Hello"})
+
+    filters = [SimpleNamespace(dimension="test-dimension", values=["test-dimension-value-1"])]
+    unfiltered = SurveySummary.get_or_build(survey, "en")
+    filtered = SurveySummary.get_or_build(survey, "en", filters)
+    assert unfiltered.count_responses == filtered.count_responses == 1
+
+    # unknown languages share the summary of the default language instead of persisting a new one
+    assert SurveySummary.get_or_build(survey, "xx-YY").id == unfiltered.id
+
+    # new responses are added incrementally to those summaries they match
+    create_response({"test-dimension": "test-dimension-value-2", "singleLineText": "World"})
+    unfiltered.refresh_from_db()
+    filtered.refresh_from_db()
+    assert unfiltered.count_responses == 2
+    assert filtered.count_responses == 1
+
+    # answers to text fields are not persisted but read when the summary is served
+    assert "singleLineText" not in unfiltered.get_summary()
+    assert unfiltered.get_full_summary()["singleLineText"] == TextFieldSummary(
+        countResponses=2,
+        countMissingResponses=0,
+        summary=["Hello", "World"],
+    )
+    assert filtered.get_full_summary()["singleLineText"].summary == ["Hello"]
+    assert list(unfiltered.get_full_summary()) == ["test-dimension", "singleLineText"]
+
+    # the incrementally updated summary is the same as one built from scratch
+    rebuilt = SurveySummary(survey=survey, language="en")
+    rebuilt.build()
+    assert rebuilt.summary == unfiltered.summary
+
+    # filtered summaries beyond the limit are built on each access instead of being persisted
+    other_filters = [SimpleNamespace(dimension="test-dimension", values=["test-dimension-value-2"])]
+    with mock.patch("forms.models.survey_summary.MAX_FILTERED_SUMMARIES_PER_SURVEY", 1):
+        unpersisted = SurveySummary.get_or_build(survey, "en", other_filters)
+    assert unpersisted.pk is None
+    assert unpersisted.count_responses == 1
+    assert unpersisted.get_full_summary()["singleLineText"].summary == ["World"]
+
+    # changing dimensions of a response invalidates summaries filtered by that dimension
+    response = create_response({"test-dimension": "test-dimension-value-2"})
+    response.set_dimension_values({"test-dimension": ["test-dimension-value-1"]})
+    assert not SurveySummary.objects.filter(id=filtered.id).exists()
+    assert SurveySummary.objects.filter(id=unfiltered.id).exists()
+    assert SurveySummary.get_or_build(survey, "en", filters).count_responses == 2
+
+    # deleting responses in bulk sends no signals, so the delete paths invalidate explicitly
+    ResponseAdmin(Response, AdminSite()).delete_queryset(None, Response.objects.filter(id=response.id))
+    assert not SurveySummary.objects.filter(survey=survey).exists()
+    assert SurveySummary.get_or_build(survey, "en").count_responses == 2
+
+
+@pytest.mark.django_db
+def test_summarize_responses_sql():
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-survey",
+    )
+
+    form = survey.languages.create(
+        event=event,
+        slug="test-survey-en",
+        language="en",
+        fields=yaml.safe_load(
+            """
+            - type: SingleLineText
+              slug: singleLineText
+            - type: SingleCheckbox
+              slug: singleCheckbox
+            - type: SingleSelect
+              slug: singleSelect
+              choices: &choices
+                - slug: choice1
+                  title: Choice 1
+                - slug: choice2
+                  title: Choice 2
+            - type: MultiSelect
+              slug: multiSelect
+              choices: *choices
+            - type: RadioMatrix
+              slug: radioMatrix
+              questions:
+                - slug: foo
+                  title: Foo
+                - slug: bar
+                  title: Bar
+              choices: *choices
+            """
+        ),
+    )
+
+    for form_data in [
+        {
+            "singleLineText": "Hello world",
+            "singleCheckbox": "on",
+            "singleSelect": "choice1",
+            "multiSelect.choice1": "on",
+            "multiSelect.choice2": "on",
+            "radioMatrix.foo": "choice1",
+            "radioMatrix.bar": "choice2",
+        },
+        {
+            "singleCheckbox": "off",
+            "singleSelect": "choice666",
+            "multiSelect.choice666": "on",
+            "radioMatrix.foo": "choice666",
+        },
+        {},
+    ]:
+        Response.objects.create(form=form, form_data=form_data)
+
+    fields = survey.get_combined_fields("en")
+    responses = survey.responses.all()
+    valuesies = [response.get_processed_form_data(fields)[0] for response in responses]
+
+    assert summarize_responses_sql(fields, responses) == summarize_responses(fields, valuesies)
+
+    # a filter that matches no value makes the queryset empty
+    no_responses = responses.with_dimensions({"test-dimension": []})
+    assert summarize_responses_sql(fields, no_responses) == summarize_responses(fields, [])
+
+
+@pytest.mark.django_db
+def test_stream_responses_csv():
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-survey",
+    )
+
+    form = survey.languages.create(
+        event=event,
+        slug="test-survey-en",
+        language="en",
+        fields=[
+            dict(
+                slug="singleLineText",
+                type="SingleLineText",
+            ),
+        ],
+    )
+
+    for text in ["Hello", "World"]:
+        Response.objects.create(form=form, form_data={"singleLineText": text})
+
+    output = b"".join(stream_responses([], survey.combined_fields, survey.responses.all(), "csv"))
+    rows = [row.split(",") for row in output.decode("UTF-8").splitlines()]
+
+    assert rows[0] == ["created_at", "language", "singleLineText"]
+    assert [row[1:] for row in rows[1:]] == [["en", "Hello"], ["en", "World"]]
+
+
+@pytest.mark.django_db
+def test_form_data_processor_for_form():
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-survey",
+    )
+
+    form = survey.languages.create(
+        event=event,
+        slug="test-survey-en",
+        language="en",
+        fields=[
+            dict(
+                slug="singleSelect",
+                type="SingleSelect",
+                choices=[dict(slug="choice1", title="Choice 1")],
+            ),
+        ],
+    )
+
+    processor = FormDataProcessor.for_form(form)
+    assert FormDataProcessor.for_form(Form.objects.get(id=form.id)) is processor
+    assert processor.process({"singleSelect": "choice1"}) == ({"singleSelect": "choice1"}, {})
+
+    # editing the form bumps updated_at and thus gets a new plan
+    form.fields[0]["choices"].append(dict(slug="choice2", title="Choice 2"))
+    form.save()
+
+    new_processor = FormDataProcessor.for_form(Form.objects.get(id=form.id))
+    assert new_processor is not processor
+    assert new_processor.process({"singleSelect": "choice2"}) == ({"singleSelect": "choice2"}, {})
+
+
+@pytest.mark.django_db
+def test_refresh_dimensions_on_commit(django_capture_on_commit_callbacks):
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-survey",
+    )
+
+    dimension = Dimension.objects.create(
+        survey=survey,
+        slug="test-dimension",
+        title="Test dimension",
+    )
+
+    value1, value2 = DimensionValue.objects.bulk_create(
+        [
+            DimensionValue(
+                dimension=dimension,
+                slug="test-dimension-value-1",
+                title=dict(en="Test dimension value 1"),
+            ),
+            DimensionValue(
+                dimension=dimension,
+                slug="test-dimension-value-2",
+                title=dict(en="Test dimension value 2"),
+            ),
+        ]
+    )
+
+    form = survey.languages.create(
+        event=event,
+        slug="test-survey-en",
+        language="en",
+        fields=[
+            dict(
+                slug="test-dimension",
+                type="SingleSelect",
+                choicesFrom=dict(dimension="test-dimension"),
+            )
+        ],
+    )
+
+    responses = [
+        Response.objects.create(form=form, form_data={"test-dimension": value.slug}) for value in [value1, value2]
+    ]
+    for response in responses:
+        response.lift_dimension_values()
+
+    with (
+        mock.patch.object(
+            Response, "refresh_cached_dimensions_qs", wraps=Response.refresh_cached_dimensions_qs
+        ) as refresh,
+        django_capture_on_commit_callbacks(execute=True) as callbacks,
+    ):
+        # renaming values changes cached_dimensions of existing responses
+        for value in [value1, value2]:
+            value.slug = value.slug.replace("test-dimension-value", "renamed-value")
+            value.save()
+
+        dimension.is_key_dimension = True
+        dimension.save()
+
+        # not refreshed before commit
+        refresh.assert_not_called()
+
+    assert len(callbacks) == 3
+    refresh.assert_called_once()
+
+    assert [Response.objects.get(id=response.id).cached_dimensions for response in responses] == [
+        {"test-dimension": ["renamed-value-1"]},
+        {"test-dimension": ["renamed-value-2"]},
+    ]
+    assert {choice["slug"] for choice in Form.objects.get(id=form.id).enriched_fields[0]["choices"]} == {
+        "renamed-value-1",
+        "renamed-value-2",
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_refresh_dimensions_after_commit():
+    """
+    Outside a test transaction, on_commit hooks run in autocommit mode like they do in production.
+    """
+    event, _created = Event.get_or_create_dummy()
+    survey = Survey.objects.create(event=event, slug="test-survey")
+    dimension = Dimension.objects.create(survey=survey, slug="test-dimension", title="Test dimension")
+    value = DimensionValue.objects.create(dimension=dimension, slug="test-value", title=dict(en="Test value"))
+
+    form = survey.languages.create(
+        event=event,
+        slug="test-survey-en",
+        language="en",
+        fields=[
+            dict(
+                slug="test-dimension",
+                type="SingleSelect",
+                choicesFrom=dict(dimension="test-dimension"),
+            )
+        ],
+    )
+    response = Response.objects.create(form=form, form_data={"test-dimension": "test-value"})
+    response.lift_dimension_values()
+
+    summary = SurveySummary.get_or_build(survey, "en")
+
+    value.slug = "renamed-value"
+    value.save()
+
+    assert Response.objects.get(id=response.id).cached_dimensions == {"test-dimension": ["renamed-value"]}
+    assert [choice["slug"] for choice in Form.objects.get(id=form.id).enriched_fields[0]["choices"]] == [
+        "renamed-value"
+    ]
+    assert not SurveySummary.objects.filter(id=summary.id).exists()
+
+
+@pytest.mark.django_db
+@mock.patch("access.cbac.graphql_check_instance", autospec=True)
+@mock.patch("forms.graphql.meta.graphql_check_instance", autospec=True)
+def test_survey_responses_query_count(_patched_meta_check_instance, _patched_cbac_check_instance):
+    """
+    Listing responses should take a constant number of queries regardless of the number of responses.
+    """
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-survey",
+        anonymity="name_and_email",
+        key_fields=["singleLineText"],
+    )
+
+    Dimension.objects.create(
+        survey=survey,
+        slug="test-dimension",
+        title="Test dimension",
+        is_key_dimension=True,
+    )
+
+    form = survey.languages.create(
+        event=event,
+        slug="test-survey-en",
+        language="en",
+        fields=[
+            dict(
+                slug="singleLineText",
+                type="SingleLineText",
+            ),
+        ],
+    )
+    form.refresh_enriched_fields()
+
+    query = """
+        query SurveyResponses {
+            event(slug: "dummy-event") {
+                forms {
+                    survey(slug: "test-survey") {
+                        responses {
+                            id
+                            language
+                            values(keyFieldsOnly: true)
+                            cachedDimensions(keyDimensionsOnly: true)
+                            createdBy {
+                                displayName
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    def create_responses(num_responses: int):
+        for i in range(num_responses):
+            user = User.objects.create(username=f"test-user-{Response.objects.count()}")
+            Response.objects.create(
+                form=form,
+                form_data={"singleLineText": f"Hello {i}"},
+                created_by=user,
+                cached_dimensions={"test-dimension": ["test-value"]},
+            )
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as captured:
+            result = schema.execute(query, None, SimpleNamespace(user=None))
+
+        assert not result.errors
+        return len(captured.captured_queries), result.data["event"]["forms"]["survey"]["responses"]  # type: ignore
+
+    create_responses(2)
+    num_queries, responses = count_queries()
+    assert len(responses) == 2
+    assert responses[0]["cachedDimensions"] == {"test-dimension": ["test-value"]}
+    assert responses[0]["createdBy"] is not None
+
+    create_responses(8)
+    assert count_queries()[0] == num_queries
+
+
+@pytest.mark.django_db
+@mock.patch("access.cbac.graphql_check_instance", autospec=True)
+@mock.patch("forms.graphql.meta.graphql_check_model", autospec=True)
+def test_surveys_query_budget(_patched_meta_check_model, _patched_cbac_check_instance):
+    """
+    Listing surveys as the survey list page of the admin UI does should take a constant number of queries
+    regardless of the number of surveys, their language versions and responses.
+    """
+    event, _created = Event.get_or_create_dummy()
+
+    query = """
+        query Surveys {
+            event(slug: "dummy-event") {
+                forms {
+                    surveys(includeInactive: true) {
+                        slug
+                        title(lang: "fi")
+                        isActive
+                        countResponses
+                        languages {
+                            language
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    def create_surveys(num_surveys: int):
+        for _ in range(num_surveys):
+            survey = Survey.objects.create(event=event, slug=f"test-survey-{Survey.objects.count()}")
+
+            for language in ["en", "fi"]:
+                form = survey.languages.create(
+                    event=event,
+                    slug=f"{survey.slug}-{language}",
+                    language=language,
+                    title=f"{survey.slug} ({language})",
+                    fields=[],
+                )
+                Response.objects.create(form=form, form_data={})
+
+    def execute():
+        result = schema.execute(query, None, SimpleNamespace(user=None))
+        assert not result.errors
+        return result.data["event"]["forms"]["surveys"]  # type: ignore
+
+    create_surveys(1)
+    with profile_queries() as profile:
+        surveys = execute()
+
+    assert surveys == [
+        dict(
+            slug="test-survey-0",
+            title="test-survey-0 (fi)",
+            isActive=False,
+            countResponses=2,
+            languages=[dict(language="en"), dict(language="fi")],
+        )
+    ]
+
+    create_surveys(4)
+    with assert_max_queries(profile.num_queries):
+        surveys = execute()
+
+    assert len(surveys) == 5
+    assert all(survey["countResponses"] == 2 for survey in surveys)
@@ -6,22 +6,22 @@ from .views.forms_survey_excel_export_view import forms_survey_excel_export_view
 app_name = "forms"
 urlpatterns = [
     path(
-        "forms/<slug:form_slug>/responses.xlsx",
+        "forms/<slug:form_slug>/responses.<slug:format>",
         forms_excel_export_view,
         name="forms_global_form_excel_export_view",
     ),
     path(
-        "events/<slug:event_slug>/forms/<slug:form_slug>/responses.xlsx",
+        "events/<slug:event_slug>/forms/<slug:form_slug>/responses.<slug:format>",
         forms_excel_export_view,
         name="forms_event_form_excel_export_view",
     ),
     path(
-        "surveys/<slug:survey_slug>/responses.xlsx",
+        "surveys/<slug:survey_slug>/responses.<slug:format>",
         forms_survey_excel_export_view,
         name="forms_global_survey_excel_export_view",
     ),
     path(
-        "events/<slug:event_slug>/surveys/<slug:survey_slug>/responses.xlsx",
+        "events/<slug:event_slug>/surveys/<slug:survey_slug>/responses.<slug:format>",
         forms_survey_excel_export_view,
         name="forms_survey_excel_export_view",
     ),
@@ -8,13 +8,16 @@ NOTE: The exact semantics of `process_form_data` are defined by and documented i
 `forms/tests.py:test_process_form_data`.
 """
 import decimal
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from ..models.field import Field, FieldType
 from .s3_presign import is_valid_s3_url, presign_get
 
+if TYPE_CHECKING:
+    from ..models.form import Form
+
 
 class FieldWarning(Enum):
     INVALID_CHOICE = "InvalidChoice"
@@ -31,47 +34,60 @@ INVALID_VALUE = object()
 
 
 class FieldProcessor:
-    def extract_value(self, field: Field, form_data: dict[str, Any]) -> Any:
-        return form_data.get(field.slug, "")
+    """
+    A field processor is bound to a single field. Anything that can be derived from the field
+    alone (valid choices etc.) is computed once in __init__ so that processing the form data
+    of many responses with the same fields is cheap (see FormDataProcessor).
+    """
+
+    def __init__(self, field: Field):
+        self.field = field
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def extract_value(self, form_data: dict[str, Any]) -> Any:
+        return form_data.get(self.field.slug, "")
+
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         warnings = []
 
         if not isinstance(value, str):
             warnings.append(FieldWarning.INVALID_VALUE)
 
-        if field.required and not value:
+        if self.field.required and not value:
             warnings.append(FieldWarning.REQUIRED_MISSING)
 
         return warnings
 
 
 class NullFieldProcessor(FieldProcessor):
-    def extract_value(self, field: Field, form_data: dict[str, Any]) -> Any:
+    def extract_value(self, form_data: dict[str, Any]) -> Any:
         return VALUE_MISSING
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         return []
 
 
 class NumberFieldProcessor(FieldProcessor):
-    def extract_value(self, field: Field, form_data: dict[str, Any]) -> Any:
-        value = form_data.get(field.slug, "")
+    def __init__(self, field: Field):
+        super().__init__(field)
+        self.is_float = field.decimal_places is not None and field.decimal_places > 0
+
+    def extract_value(self, form_data: dict[str, Any]) -> Any:
+        value = form_data.get(self.field.slug, "")
 
         if not value:
             return VALUE_MISSING
 
         try:
-            if field.decimal_places is not None and field.decimal_places > 0:
+            if self.is_float:
                 return float(value)
             return int(value)
         except ValueError:
             return INVALID_VALUE
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         warnings = []
 
-        if field.required and value is VALUE_MISSING:
+        if self.field.required and value is VALUE_MISSING:
             warnings.append(FieldWarning.REQUIRED_MISSING)
 
         if value is INVALID_VALUE:
@@ -81,8 +97,16 @@ class NumberFieldProcessor(FieldProcessor):
 
 
 class DecimalFieldProcessor(FieldProcessor):
-    def extract_value(self, field: Field, form_data: dict[str, Any]) -> Any:
-        value = form_data.get(field.slug, "")
+    def __init__(self, field: Field):
+        super().__init__(field)
+        self.exponent = (
+            decimal.Decimal(f"0.{'0' * field.decimal_places}")
+            if field.decimal_places is not None and field.decimal_places > 0
+            else None
+        )
+
+    def extract_value(self, form_data: dict[str, Any]) -> Any:
+        value = form_data.get(self.field.slug, "")
 
         if not value:
             return VALUE_MISSING
@@ -90,16 +114,16 @@ class DecimalFieldProcessor(FieldProcessor):
         try:
             # It would be nice to keep this as decimal until it is serialized as JSON
             dec = decimal.Decimal(value)
-            if field.decimal_places is not None and field.decimal_places > 0:
-                dec = dec.quantize(decimal.Decimal(f"0.{'0' * field.decimal_places}"))
+            if self.exponent is not None:
+                dec = dec.quantize(self.exponent)
             return str(dec)
         except decimal.InvalidOperation:
             return INVALID_VALUE
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         warnings = []
 
-        if field.required and value is VALUE_MISSING:
+        if self.field.required and value is VALUE_MISSING:
             warnings.append(FieldWarning.REQUIRED_MISSING)
         elif value is INVALID_VALUE:
             warnings.append(FieldWarning.INVALID_VALUE)
@@ -113,73 +137,84 @@ class DecimalFieldProcessor(FieldProcessor):
 
 
 class SingleCheckboxFieldProcessor(FieldProcessor):
-    def extract_value(self, field: Field, form_data: dict[str, Any]):
-        value: str = form_data.get(field.slug, "")
+    def extract_value(self, form_data: dict[str, Any]):
+        value: str = form_data.get(self.field.slug, "")
         return bool(value and value.strip().lower() not in FALSY_VALUES)
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         warnings = []
 
-        if field.required and not value:
+        if self.field.required and not value:
             warnings.append(FieldWarning.REQUIRED_MISSING)
 
         return warnings
 
 
 class SingleSelectFieldProcessor(FieldProcessor):
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
-        warnings = super().validate_value(field, value)
+    def __init__(self, field: Field):
+        super().__init__(field)
+        self.valid_choices = frozenset(choice.slug for choice in field.choices or [])
+
+    def validate_value(self, value: Any) -> list[FieldWarning]:
+        warnings = super().validate_value(value)
 
-        if value and value not in [choice.slug for choice in field.choices or []]:
+        # NOTE: non-string values cannot be valid choices (and may not be hashable)
+        if value and not (isinstance(value, str) and value in self.valid_choices):
             warnings.append(FieldWarning.INVALID_CHOICE)
 
         return warnings
 
 
 class MultiSelectFieldProcessor(FieldProcessor):
-    def extract_value(self, field: Field, form_data: dict[str, Any]):
+    def __init__(self, field: Field):
+        super().__init__(field)
+        self.prefix = f"{field.slug}."
+        self.valid_choices = frozenset(choice.slug for choice in field.choices or [])
+
+    def extract_value(self, form_data: dict[str, Any]):
         return [
             key.split(".", 1)[1]
             for key, value in form_data.items()
-            if key.startswith(f"{field.slug}.") and value and value.strip().lower() not in FALSY_VALUES
+            if key.startswith(self.prefix) and value and value.strip().lower() not in FALSY_VALUES
         ]
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         values: list[str] = value
         warnings = []
 
-        valid_choices = [choice.slug for choice in field.choices or []]
-
-        if field.required and not values:
+        if self.field.required and not values:
             warnings.append(FieldWarning.REQUIRED_MISSING)
 
         if not all(isinstance(value, str) for value in values):
             warnings.append(FieldWarning.INVALID_VALUE)
 
-        if not all(value in valid_choices for value in values):
+        if not all(value in self.valid_choices for value in values):
             warnings.append(FieldWarning.INVALID_CHOICE)
 
         return warnings
 
 
 class RadioMatrixFieldProcessor(FieldProcessor):
-    def extract_value(self, field: Field, form_data: dict[str, Any]):
-        return {key.split(".", 1)[1]: value for key, value in form_data.items() if key.startswith(f"{field.slug}.")}
+    def __init__(self, field: Field):
+        super().__init__(field)
+        self.prefix = f"{field.slug}."
+        self.questions = frozenset(question.slug for question in field.questions or [])
+        self.valid_choices = frozenset(choice.slug for choice in field.choices or [])
+
+    def extract_value(self, form_data: dict[str, Any]):
+        return {key.split(".", 1)[1]: value for key, value in form_data.items() if key.startswith(self.prefix)}
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         values: dict[str, str] = value
         warnings: list[FieldWarning] = []
 
-        questions = [question.slug for question in field.questions or []]
-        valid_choices = [choice.slug for choice in field.choices or []]
-
-        if field.required and not all(question in values for question in questions):
+        if self.field.required and not self.questions.issubset(values):
             warnings.append(FieldWarning.REQUIRED_MISSING)
 
-        if not all(value in valid_choices for value in values.values()):
+        if not all(isinstance(value, str) and value in self.valid_choices for value in values.values()):
             warnings.append(FieldWarning.INVALID_CHOICE)
 
-        if not all(key in questions for key in values):
+        if not self.questions.issuperset(values):
             warnings.append(FieldWarning.INVALID_CHOICE)
 
         return warnings
@@ -188,8 +223,8 @@ class RadioMatrixFieldProcessor(FieldProcessor):
 class FileUploadFieldProcessor(FieldProcessor):
     # TODO rethink. here extract_value de facto both extracts and validates
     # should "extract" always be values.get, then validate and then possibly process?
-    def extract_value(self, field: Field, form_data: dict[str, Any]):
-        s3_urls = form_data.get(field.slug, VALUE_MISSING)
+    def extract_value(self, form_data: dict[str, Any]):
+        s3_urls = form_data.get(self.field.slug, VALUE_MISSING)
         if s3_urls is VALUE_MISSING:
             return VALUE_MISSING
 
@@ -203,75 +238,128 @@ class FileUploadFieldProcessor(FieldProcessor):
 
         return [presign_get(url) for url in s3_urls]
 
-    def validate_value(self, field: Field, value: Any) -> list[FieldWarning]:
+    def validate_value(self, value: Any) -> list[FieldWarning]:
         warnings = []
 
         # TODO should not have to both return INVALID_VALUE and make it an explicit warning
         if value is INVALID_VALUE:
             warnings.append(FieldWarning.INVALID_VALUE)
 
-        if field.required and (value is VALUE_MISSING or not value):
+        if self.field.required and (value is VALUE_MISSING or not value):
             warnings.append(FieldWarning.REQUIRED_MISSING)
 
         return warnings
 
 
-FIELD_PROCESSORS: dict[FieldType, FieldProcessor] = {
-    FieldType.SINGLE_LINE_TEXT: FieldProcessor(),
-    FieldType.MULTI_LINE_TEXT: FieldProcessor(),
-    FieldType.SINGLE_CHECKBOX: SingleCheckboxFieldProcessor(),
-    FieldType.STATIC_TEXT: NullFieldProcessor(),
-    FieldType.DIVIDER: NullFieldProcessor(),
-    FieldType.SPACER: NullFieldProcessor(),
-    FieldType.SINGLE_SELECT: SingleSelectFieldProcessor(),
-    FieldType.MULTI_SELECT: MultiSelectFieldProcessor(),
-    FieldType.RADIO_MATRIX: RadioMatrixFieldProcessor(),
-    FieldType.FILE_UPLOAD: FileUploadFieldProcessor(),
-    FieldType.NUMBER_FIELD: NumberFieldProcessor(),
-    FieldType.DECIMAL_FIELD: DecimalFieldProcessor(),
+FIELD_PROCESSORS: dict[FieldType, type[FieldProcessor]] = {
+    FieldType.SINGLE_LINE_TEXT: FieldProcessor,
+    FieldType.MULTI_LINE_TEXT: FieldProcessor,
+    FieldType.SINGLE_CHECKBOX: SingleCheckboxFieldProcessor,
+    FieldType.STATIC_TEXT: NullFieldProcessor,
+    FieldType.DIVIDER: NullFieldProcessor,
+    FieldType.SPACER: NullFieldProcessor,
+    FieldType.SINGLE_SELECT: SingleSelectFieldProcessor,
+    FieldType.MULTI_SELECT: MultiSelectFieldProcessor,
+    FieldType.RADIO_MATRIX: RadioMatrixFieldProcessor,
+    FieldType.FILE_UPLOAD: FileUploadFieldProcessor,
+    FieldType.NUMBER_FIELD: NumberFieldProcessor,
+    FieldType.DECIMAL_FIELD: DecimalFieldProcessor,
     # TODO(#436) Time zone handling
-    FieldType.DATE_FIELD: FieldProcessor(),
-    FieldType.TIME_FIELD: FieldProcessor(),
-    FieldType.DATE_TIME_FIELD: FieldProcessor(),
+    FieldType.DATE_FIELD: FieldProcessor,
+    FieldType.TIME_FIELD: FieldProcessor,
+    FieldType.DATE_TIME_FIELD: FieldProcessor,
 }
 
 # This is deprecated in favour of NumberField but kept for backwards compatibility
 # What about htmlType="email", "password" etc?
-SINGLE_LINE_TEXT_PROCESSORS: dict[str, FieldProcessor] = {
-    "number": NumberFieldProcessor(),
+SINGLE_LINE_TEXT_PROCESSORS: dict[str, type[FieldProcessor]] = {
+    "number": NumberFieldProcessor,
 }
 
 
-def process_form_data(fields: Sequence[Field], form_data: dict[str, Any]):
-    values: dict[str, Any] = {}
-    warnings: dict[str, list[FieldWarning]] = {}
+def get_field_processor(field: Field) -> FieldProcessor | None:
+    if field.type == FieldType.SINGLE_LINE_TEXT:
+        processor_class = SINGLE_LINE_TEXT_PROCESSORS.get(field.html_type or "", FieldProcessor)
+    else:
+        processor_class = FIELD_PROCESSORS.get(field.type)
+
+    return processor_class(field) if processor_class is not None else None
 
-    for field in fields:
-        if field.type == FieldType.SINGLE_LINE_TEXT:
-            processor = SINGLE_LINE_TEXT_PROCESSORS.get(field.html_type or "", FieldProcessor())
-        else:
-            processor = FIELD_PROCESSORS.get(field.type)
 
-        if processor is None:
-            warnings[field.slug] = [FieldWarning.UNKNOWN_FIELD_TYPE]
-            continue
+class FormDataProcessor:
+    """
+    A compiled plan for processing form data with a given set of fields: field type dispatch,
+    valid choices, radio matrix questions etc. are resolved once when the plan is created.
+    When processing many responses with the same fields, create one FormDataProcessor
+    and call `process` for each response, or use `FormDataProcessor.for_form`.
+    """
 
-        value = processor.extract_value(field, form_data)
-        value_warnings = processor.validate_value(field, value)
+    # (form id, form updated_at, slugs or None) -> FormDataProcessor
+    _cache: ClassVar[dict[tuple[Any, ...], "FormDataProcessor"]] = {}
+    MAX_CACHED_FORMS: ClassVar[int] = 256
 
-        if value_warnings:
-            warnings[field.slug] = value_warnings
+    def __init__(self, fields: Sequence[Field]):
+        self.fields = list(fields)
+        self.processors = [(field.slug, get_field_processor(field)) for field in self.fields]
 
-        if value is VALUE_MISSING or value is INVALID_VALUE:
-            continue
+    @classmethod
+    def for_form(cls, form: "Form", slugs: Collection[str] | None = None) -> "FormDataProcessor":
+        """
+        Returns a cached plan for the validated fields of the form (optionally only those whose slugs are given).
+        The cache is keyed by form id and updated_at, so changes to the form or its enriched fields
+        (see Form.refresh_enriched_fields) get a new plan.
+        """
+        only_slugs = frozenset(slugs) if slugs is not None else None
 
-        if FieldWarning.INVALID_VALUE in value_warnings:
-            continue
+        if processor := cls._cache.get((form.id, form.updated_at, only_slugs)):
+            return processor
 
-        # NOTE: Invalid choices are let through because the editor might remove a choice
-        # after a user has already submitted a form with that choice selected.
-        # It's better to let the editor see the invalid choice than silently ignore it.
+        # NOTE: validated_fields may refresh the enriched fields and thus bump updated_at
+        fields = form.validated_fields
+        if only_slugs is not None:
+            fields = [field for field in fields if field.slug in only_slugs]
 
-        values[field.slug] = value
+        processor = cls(fields)
 
-    return values, warnings
+        if len(cls._cache) >= cls.MAX_CACHED_FORMS:
+            cls._cache.clear()
+        cls._cache[(form.id, form.updated_at, only_slugs)] = processor
+
+        return processor
+
+    def process(self, form_data: dict[str, Any]) -> tuple[dict[str, Any], dict[str, list[FieldWarning]]]:
+        values: dict[str, Any] = {}
+        warnings: dict[str, list[FieldWarning]] = {}
+
+        for slug, processor in self.processors:
+            if processor is None:
+                warnings[slug] = [FieldWarning.UNKNOWN_FIELD_TYPE]
+                continue
+
+            value = processor.extract_value(form_data)
+            value_warnings = processor.validate_value(value)
+
+            if value_warnings:
+                warnings[slug] = value_warnings
+
+            if value is VALUE_MISSING or value is INVALID_VALUE:
+                continue
+
+            if FieldWarning.INVALID_VALUE in value_warnings:
+                continue
+
+            # NOTE: Invalid choices are let through because the editor might remove a choice
+            # after a user has already submitted a form with that choice selected.
+            # It's better to let the editor see the invalid choice than silently ignore it.
+
+            values[slug] = value
+
+        return values, warnings
+
+
+def process_form_data(fields: Sequence[Field], form_data: dict[str, Any]):
+    """
+    Processes the form data of a single response. When processing many responses
+    with the same fields, prefer reusing a FormDataProcessor.
+    """
+    return FormDataProcessor(fields).process(form_data)
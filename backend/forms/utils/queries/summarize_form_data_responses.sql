@@ -0,0 +1,19 @@
+-- For fields that are spread over multiple keys in the raw form data (MultiSelect, RadioMatrix),
+-- counts the responses that have at least one non-empty value for the field.
+-- If check_falsy is set, values such as "off" and "false" do not count (see process_form_data.FALSY_VALUES).
+select
+    f.slug,
+    count(distinct r.id) as count_responses
+from
+    forms_response r
+    cross join lateral jsonb_each(r.form_data) as kv(key, value)
+    join unnest(%s::text[], %s::text[], %s::boolean[]) as f(slug, pattern, check_falsy) on (kv.key like f.pattern)
+where
+    r.id in ({response_ids})
+    and jsonb_typeof(kv.value) = 'string'
+    and (kv.value #>> array[]::text[]) <> ''
+    and (
+        not f.check_falsy
+        or lower(regexp_replace(kv.value #>> array[]::text[], '^\s+|\s+$', '', 'g')) <> all(%s)
+    )
+group by f.slug
@@ -0,0 +1,17 @@
+-- Counts occurrences of (key, value) pairs in the raw form data of the given responses.
+-- Only keys equal to one of the given field slugs or matching one of the given LIKE patterns are included.
+-- first_seen_at is used to order choices not present on the form the same way summarize_responses does.
+select
+    kv.key,
+    jsonb_typeof(kv.value) as value_type,
+    kv.value #>> array[]::text[] as value_text,
+    count(*) as count_values,
+    min(r.created_at) as first_seen_at
+from
+    forms_response r
+    cross join lateral jsonb_each(r.form_data) as kv(key, value)
+where
+    r.id in ({response_ids})
+    and (kv.key = any(%s) or kv.key like any(%s))
+group by kv.key, value_type, value_text
+order by first_seen_at, kv.key
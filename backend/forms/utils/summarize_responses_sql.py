@@ -0,0 +1,207 @@
+"""
+Computes the same summary as `summarize_responses` but counts select-like fields
+(SingleSelect, MultiSelect, SingleCheckbox, RadioMatrix) in PostgreSQL using
+`jsonb_each` over the raw form data instead of transferring every response to Python.
+Other fields (text, numbers, file uploads etc.) fall back to the Python implementation,
+and their form data is only loaded if there are such fields.
+
+NOTE: The raw form data is in the `Object.fromEntries(formData.entries())` format, so the
+queries need to mirror what `process_form_data` does for these field types.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from django.db import connection, models
+from pkg_resources import resource_string
+
+from ..models.field import Field, FieldType
+from .process_form_data import FALSY_VALUES, FormDataProcessor
+from .summarize_responses import (
+    MatrixFieldSummary,
+    SelectFieldSummary,
+    SingleCheckboxSummary,
+    Summary,
+    count_choices,
+    summarize_responses_columnar,
+)
+
+if TYPE_CHECKING:
+    from ..models.response import Response
+
+VALUES_QUERY = resource_string(__name__, "queries/summarize_form_data_values.sql").decode()
+RESPONSES_QUERY = resource_string(__name__, "queries/summarize_form_data_responses.sql").decode()
+
+# fields that are stored under their own slug in form data
+SINGLE_KEY_FIELD_TYPES = (FieldType.SINGLE_SELECT, FieldType.SINGLE_CHECKBOX)
+
+# fields that are spread over multiple keys of the form `{field.slug}.{choice or question slug}` in form data
+MULTI_KEY_FIELD_TYPES = (FieldType.MULTI_SELECT, FieldType.RADIO_MATRIX)
+
+NULL_FIELD_TYPES = (FieldType.STATIC_TEXT, FieldType.SPACER, FieldType.DIVIDER)
+
+
+def _get_like_pattern(field: Field) -> str:
+    escaped_slug = field.slug.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped_slug}.%"
+
+
+def _is_truthy(value_text: str) -> bool:
+    return bool(value_text and value_text.strip().lower() not in FALSY_VALUES)
+
+
+def summarize_responses_sql(
+    fields: list[Field],
+    responses: models.QuerySet[Response],
+    get_values: Callable[[FormDataProcessor, dict[str, Any]], dict[str, Any]] | None = None,
+    total_responses: int | None = None,
+) -> Summary:
+    """
+    `responses` is a queryset (possibly filtered by dimensions) that is used as a subquery.
+    `get_values` is used to process form data for fields that are summarized in Python
+    (default: `FormDataProcessor.process`). Pass `total_responses` if you already know it.
+    """
+    db_fields: list[Field] = []
+    python_fields: list[Field] = []
+    for field in fields:
+        if field.type in SINGLE_KEY_FIELD_TYPES + MULTI_KEY_FIELD_TYPES:
+            db_fields.append(field)
+        elif field.type not in NULL_FIELD_TYPES:
+            python_fields.append(field)
+
+    if responses.query.is_empty():
+        # eg. a dimension filter with no values (QuerySet.none() cannot be compiled into a subquery)
+        return summarize_responses_columnar(fields, [])
+
+    response_ids_sql, response_ids_params = responses.order_by().values("id").query.sql_with_params()
+    if total_responses is None:
+        total_responses = responses.count()
+
+    single_key_fields = [field for field in db_fields if field.type in SINGLE_KEY_FIELD_TYPES]
+    multi_key_fields = [field for field in db_fields if field.type in MULTI_KEY_FIELD_TYPES]
+    patterns = [_get_like_pattern(field) for field in multi_key_fields]
+
+    # key -> list of (value type, value text, count) in order of first appearance
+    values_by_key: dict[str, list[tuple[str, str, int]]] = {}
+    count_responses_by_slug: dict[str, int] = {}
+
+    if db_fields:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                VALUES_QUERY.format(response_ids=response_ids_sql),
+                [*response_ids_params, [field.slug for field in single_key_fields], patterns],
+            )
+            for key, value_type, value_text, count_values, _first_seen_at in cursor.fetchall():
+                values_by_key.setdefault(key, []).append((value_type, value_text, count_values))
+
+    if multi_key_fields:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RESPONSES_QUERY.format(response_ids=response_ids_sql),
+                [
+                    [field.slug for field in multi_key_fields],
+                    patterns,
+                    [field.type == FieldType.MULTI_SELECT for field in multi_key_fields],
+                    *response_ids_params,
+                    list(FALSY_VALUES),
+                ],
+            )
+            count_responses_by_slug = dict(cursor.fetchall())
+
+    db_summary: Summary = {}
+
+    for field in db_fields:
+        match field.type:
+            case FieldType.SINGLE_SELECT:
+                counts = Counter()
+                for value_type, value_text, count_values in values_by_key.get(field.slug, []):
+                    # non-string values are rejected by process_form_data as invalid
+                    if value_type == "string" and value_text:
+                        counts[value_text] += count_values
+
+                field_summary = count_choices(field.choices, counts)
+                count_responses = sum(field_summary.values())
+
+                db_summary[field.slug] = SelectFieldSummary(
+                    summary=field_summary,
+                    countResponses=count_responses,
+                    countMissingResponses=total_responses - count_responses,
+                )
+
+            case FieldType.SINGLE_CHECKBOX:
+                count_responses = sum(
+                    count_values
+                    for value_type, value_text, count_values in values_by_key.get(field.slug, [])
+                    if value_type == "string" and _is_truthy(value_text)
+                )
+
+                db_summary[field.slug] = SingleCheckboxSummary(
+                    countResponses=count_responses,
+                    countMissingResponses=total_responses - count_responses,
+                )
+
+            case FieldType.MULTI_SELECT:
+                counts = Counter()
+                prefix = f"{field.slug}."
+                for key, key_values in values_by_key.items():
+                    if not key.startswith(prefix):
+                        continue
+
+                    for value_type, value_text, count_values in key_values:
+                        if value_type == "string" and _is_truthy(value_text):
+                            counts[key.removeprefix(prefix)] += count_values
+
+                count_responses = count_responses_by_slug.get(field.slug, 0)
+
+                db_summary[field.slug] = SelectFieldSummary(
+                    countResponses=count_responses,
+                    countMissingResponses=total_responses - count_responses,
+                    summary=count_choices(field.choices, counts),
+                )
+
+            case FieldType.RADIO_MATRIX:
+                counts_by_question: dict[str, Counter[str]] = {}
+                prefix = f"{field.slug}."
+                for key, key_values in values_by_key.items():
+                    if not key.startswith(prefix):
+                        continue
+
+                    question_counts = counts_by_question.setdefault(key.removeprefix(prefix), Counter())
+                    for value_type, value_text, count_values in key_values:
+                        if value_type != "null":
+                            question_counts[value_text] += count_values
+
+                # note: removed questions will not be included in the summary
+                field_summary = {
+                    question.slug: count_choices(field.choices, counts_by_question.get(question.slug, Counter()))
+                    for question in field.questions or []
+                }
+                count_responses = count_responses_by_slug.get(field.slug, 0)
+
+                db_summary[field.slug] = MatrixFieldSummary(
+                    countResponses=count_responses,
+                    countMissingResponses=total_responses - count_responses,
+                    summary=field_summary,
+                )
+
+    python_summary: Summary = {}
+    if python_fields:
+        if get_values is None:
+            get_values = lambda processor, form_data: processor.process(form_data)[0]
+
+        processor = FormDataProcessor(python_fields)
+        valuesies = [
+            get_values(processor, response.form_data)
+            for response in responses.only("form_data").iterator(chunk_size=1000)
+        ]
+        python_summary = summarize_responses_columnar(python_fields, valuesies)
+
+    # retain field order
+    return {
+        field.slug: field_summary
+        for field in fields
+        if (field_summary := db_summary.get(field.slug) or python_summary.get(field.slug)) is not None
+    }
@@ -8,6 +8,7 @@ def forms_event_box_context(request, event):
         app="forms",
     )
 
+    # CBACEntry.is_allowed is cached per user
     return dict(
         is_forms_admin=CBACEntry.is_allowed(request.user, claims),
     )
@@ -1,11 +1,11 @@
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
 
 from access.cbac import default_cbac_required
 from core.models import Event
 
-from ..excel_export import write_responses_as_excel
+from ..excel_export import CONTENT_TYPES, EXPORT_FORMATS, stream_responses
 from ..models.dimension import Dimension
 from ..models.form import Form
 
@@ -15,25 +15,30 @@ def forms_excel_export_view(
     request: HttpRequest,
     event_slug: str | None,
     form_slug: str,
+    format: str = "xlsx",
 ):
+    if format not in EXPORT_FORMATS:
+        raise Http404(f"Unsupported format: {format}")
+
     timestamp = now().strftime("%Y%m%d%H%M%S")
 
     if event_slug:
         event = get_object_or_404(Event, slug=event_slug)
         form = get_object_or_404(Form, event=event, slug=form_slug)
-        filename = f"{event.slug}_{form.slug}_responses_{timestamp}.xlsx"
+        filename = f"{event.slug}_{form.slug}_responses_{timestamp}.{format}"
     else:
         form = get_object_or_404(Form, event__isnull=True, slug=form_slug)
-        filename = f"{form.slug}_responses_{timestamp}.xlsx"
-
-    response = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-    write_responses_as_excel(
-        Dimension.objects.none(),
-        form.validated_fields,
-        form.responses.all().only("form_data"),
-        response,
+        filename = f"{form.slug}_responses_{timestamp}.{format}"
+
+    response = StreamingHttpResponse(
+        stream_responses(
+            Dimension.objects.none(),
+            form.validated_fields,
+            form.responses.order_by("created_at"),
+            format,
+        ),
+        content_type=CONTENT_TYPES[format],
     )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
     return response
@@ -1,9 +1,9 @@
 from csp.decorators import csp_exempt
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
-from graphene_django.views import GraphQLView
 
 from .schema import schema
+from .views import GraphQLView
 
 urlpatterns = [
     # TODO csp_exempt, csrf_exempt
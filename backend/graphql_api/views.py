@@ -0,0 +1,8 @@
+from graphene_django.views import GraphQLView as BaseGraphQLView
+
+
+class GraphQLView(BaseGraphQLView):
+    def execute_graphql_request(self, request, data, query, variables, operation_name, *args, **kwargs):
+        # for metrics (see metrics/middleware.py)
+        request.graphql_operation_name = operation_name
+        return super().execute_graphql_request(request, data, query, variables, operation_name, *args, **kwargs)
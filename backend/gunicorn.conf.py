@@ -0,0 +1,11 @@
+# Loaded automatically by gunicorn from the working directory.
+
+import os
+
+
+def child_exit(server, worker):
+    # https://prometheus.github.io/client_python/multiprocess/
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
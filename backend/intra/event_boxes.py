@@ -0,0 +1,9 @@
+from core.event_box_registry import ModelInvalidation, register
+
+from .views import intra_event_box_context
+
+register(
+    "intra",
+    intra_event_box_context,
+    invalidated_by=[ModelInvalidation("intra.IntraEventMeta")],
+)
@@ -1,7 +1,11 @@
+from core.event_box_registry import EventBoxContext
+
+
 def intra_event_box_context(request, event):
+    box = EventBoxContext.for_request(request, event)
     meta = event.intra_event_meta
 
     return dict(
-        is_intra_organizer=meta.is_user_organizer(request.user),
-        is_intra_admin=meta.is_user_admin(request.user),
+        is_intra_organizer=meta.organizer_group_id in box.group_ids,
+        is_intra_admin=box.is_user_admin(meta),
     )
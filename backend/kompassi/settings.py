@@ -95,6 +95,8 @@ DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
 SECRET_KEY = env.str("SECRET_KEY", default=("" if not DEBUG else "xxx"))
 
 MIDDLEWARE = (
+    "metrics.middleware.MetricsMiddleware",
+    "core.middleware.QueryProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "csp.middleware.CSPMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -330,6 +332,39 @@ AWS_S3_ENDPOINT_URL = env("MINIO_ENDPOINT_URL", default="http://localhost:9000")
 
 KOMPASSI_V2_BASE_URL = env("KOMPASSI_V2_BASE_URL", default="http://localhost:3000")
 
+# How survey summaries are built from scratch (see forms/models/survey_summary.py):
+# "python" processes all responses in Python, "sql" counts select-like fields in PostgreSQL
+KOMPASSI_SURVEY_SUMMARY_BACKEND = env("KOMPASSI_SURVEY_SUMMARY_BACKEND", default="python")
+
+# If set, the CBAC entries of a user are cached in the Django cache for this many seconds
+# in addition to being loaded only once per request (see access/models/cbac_entry.py).
+# NOTE: With the default locmem cache, changes in one process are seen by others only after expiry.
+KOMPASSI_CBAC_CACHE_TTL_SECONDS = env.int("KOMPASSI_CBAC_CACHE_TTL_SECONDS", default=0)
+
+# Public schedules and programme JSON feeds are cached until something in the schedule changes,
+# but rebuilt at least this often (see programme/schedule_cache.py).
+# NOTE: With the default locmem cache, changes in one process are seen by others only after this.
+KOMPASSI_PROGRAMME_SCHEDULE_CACHE_MAX_AGE_SECONDS = env.int(
+    "KOMPASSI_PROGRAMME_SCHEDULE_CACHE_MAX_AGE_SECONDS",
+    default=5 * 60,
+)
+
+# Business metrics (orders, badges etc.) exposed to Prometheus are recomputed at most this often.
+KOMPASSI_METRICS_BUSINESS_CACHE_SECONDS = env.int("KOMPASSI_METRICS_BUSINESS_CACHE_SECONDS", default=60)
+
+# If set, /metrics requires "Authorization: Bearer <token>" and includes business metrics (see metrics/views.py).
+KOMPASSI_METRICS_TOKEN = env("KOMPASSI_METRICS_TOKEN", default="")
+
+# If set, Celery workers expose their Prometheus metrics on this port (see metrics/handlers.py).
+KOMPASSI_METRICS_CELERY_PORT = env.int("KOMPASSI_METRICS_CELERY_PORT", default=0)
+
+# The per-user contexts of the event boxes on the event page are cached this long (see core/event_box_registry.py).
+KOMPASSI_EVENT_BOX_CACHE_SECONDS = env.int("KOMPASSI_EVENT_BOX_CACHE_SECONDS", default=60)
+
+# If set, every request records its SQL queries and reports their number, duration and duplicates
+# in response headers and in the log (see core.middleware.QueryProfilingMiddleware). Adds overhead.
+KOMPASSI_QUERY_PROFILING = env.bool("KOMPASSI_QUERY_PROFILING", default=False)
+
 # TODO script-src unsafe-inline needed at least by feedback.js. unsafe-eval needed by Knockout (roster.js).
 # XXX style-src unsafe-inline is just basic plebbery and should be eradicated.
 CSP_DEFAULT_SRC = "'none'"
@@ -385,6 +420,11 @@ else:
 
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="spam@example.com")
 
+# Mass messages (mailings.Message) are sent in batches of this many emails, one SMTP connection per batch.
+# The rate limit is per Celery worker in Celery format (eg. "10/m" = at most 10 batches per minute).
+KOMPASSI_MAILINGS_BATCH_SIZE = env.int("KOMPASSI_MAILINGS_BATCH_SIZE", default=100)
+KOMPASSI_MAILINGS_BATCH_RATE_LIMIT = env("KOMPASSI_MAILINGS_BATCH_RATE_LIMIT", default="10/m")
+
 
 if "lippukala" in INSTALLED_APPS:
     import tickets.lippukala_integration
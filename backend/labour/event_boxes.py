@@ -0,0 +1,12 @@
+from core.event_box_registry import ModelInvalidation, register
+
+from .views import labour_event_box_context
+
+register(
+    "labour",
+    labour_event_box_context,
+    invalidated_by=[
+        ModelInvalidation("labour.LabourEventMeta"),
+        ModelInvalidation("labour.Signup", get_user_id=lambda signup: signup.person.user_id),
+    ],
+)
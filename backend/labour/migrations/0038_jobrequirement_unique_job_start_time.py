@@ -0,0 +1,35 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def remove_duplicate_requirements(apps, schema_editor):
+    """
+    Keeps the latest of JobRequirements having the same job and start_time.
+    """
+    JobRequirement = apps.get_model("labour", "JobRequirement")
+
+    for row in (
+        JobRequirement.objects.order_by()
+        .values("job_id", "start_time")
+        .annotate(num_requirements=Count("id"), latest_id=Max("id"))
+        .filter(num_requirements__gt=1)
+    ):
+        JobRequirement.objects.filter(job_id=row["job_id"], start_time=row["start_time"]).exclude(
+            id=row["latest_id"]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("labour", "0037_rename_personnelclass_event_app_label_labour_pers_event_i_49de47_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_requirements, migrations.RunPython.noop, elidable=True),
+        migrations.AlterUniqueTogether(
+            name="jobrequirement",
+            unique_together={("job", "start_time")},
+        ),
+    ]
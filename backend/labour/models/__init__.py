@@ -10,6 +10,8 @@ from .roster import (
     EditShiftRequest,
     Job,
     JobRequirement,
+    RosterMatrix,
+    SetJobCategoryRequirementsRequest,
     SetJobRequirementsRequest,
     Shift,
     WorkPeriod,
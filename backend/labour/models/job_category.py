@@ -1,4 +1,5 @@
 from django.db import models, transaction
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 
 from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS, omit_keys, pick_attrs, slugify
@@ -145,22 +146,6 @@ class JobCategory(models.Model):
 
         return [jc1, jc2]
 
-    def _make_requirements(self):
-        """
-        Returns an array of integers representing the sum of JobRequirements for this JobCategory
-        where indexes correspond to those of work_hours for this event.
-        """
-        from .roster import JobRequirement
-
-        requirements = JobRequirement.objects.filter(job__job_category=self)
-        return JobRequirement.requirements_as_integer_array(self.event, requirements)
-
-    def _make_allocated(self):
-        from .roster import JobRequirement, Shift
-
-        shifts = Shift.objects.filter(job__job_category=self)
-        return JobRequirement.allocated_as_integer_array(self.event, shifts)
-
     def _make_people(self):
         """
         Returns an array of accepted workers. Used by the Roster API.
@@ -180,7 +165,20 @@ class JobCategory(models.Model):
 
         return super().save(*args, **kwargs)
 
-    def as_dict(self, include_jobs=False, include_requirements=False, include_people=False, include_shifts=False):
+    def as_dict(
+        self,
+        include_jobs=False,
+        include_requirements=False,
+        include_people=False,
+        include_shifts=False,
+        matrix=None,
+    ):
+        """
+        If a RosterMatrix containing this job category is given, requirements are taken from it.
+        Use this when serializing many job categories of an event.
+        """
+        from .roster import RosterMatrix, Shift
+
         if include_shifts and not include_jobs:
             raise AssertionError("If include_shifts is specified, must specify also include_jobs")
 
@@ -190,12 +188,19 @@ class JobCategory(models.Model):
             "slug",
         )
 
+        if matrix is None and (include_jobs or include_requirements):
+            matrix = RosterMatrix.for_job_categories(self.event, [self])
+
         if include_jobs:
-            doc["jobs"] = [job.as_dict(include_shifts=include_shifts) for job in self.job_set.all()]
+            jobs = self.job_set.all()
+            if include_shifts:
+                jobs = jobs.prefetch_related(Prefetch("shifts", queryset=Shift.objects.select_related("signup")))
+
+            doc["jobs"] = [job.as_dict(include_shifts=include_shifts, matrix=matrix) for job in jobs]
 
         if include_requirements:
-            doc["requirements"] = self._make_requirements()
-            doc["allocated"] = self._make_allocated()
+            doc["requirements"] = matrix.get_job_category_requirements(self.id)
+            doc["allocated"] = matrix.get_job_category_allocated(self.id)
 
         if include_people:
             doc["people"] = self._make_people()
@@ -204,3 +209,33 @@ class JobCategory(models.Model):
 
     def as_roster_api_dict(self):
         return self.as_dict(include_jobs=True, include_people=True, include_shifts=True)
+
+    def as_roster_api_patch(self, job_ids, signup_ids, shift=None, deleted_shift_id=None):
+        """
+        Returns only the parts of as_roster_api_dict affected by editing a single shift: the requirements
+        of the job category, the requirements of the given jobs and the given people, plus the shift itself.
+        """
+        from .roster import RosterMatrix
+        from .signup import Signup
+
+        matrix = RosterMatrix.for_job_categories(self.event, [self])
+
+        doc = pick_attrs(
+            self,
+            "title",
+            "slug",
+        )
+
+        doc["requirements"] = matrix.get_job_category_requirements(self.id)
+        doc["allocated"] = matrix.get_job_category_allocated(self.id)
+        doc["jobs"] = [job.as_dict(matrix=matrix) for job in self.job_set.filter(id__in=job_ids)]
+        doc["people"] = [
+            signup.as_dict()
+            for signup in Signup.objects.filter(id__in=signup_ids)
+            .order_by("person__surname", "person__first_name")
+            .select_related("person")
+        ]
+        doc["shift"] = shift.as_dict() if shift is not None else None
+        doc["deletedShiftId"] = deleted_shift_id
+
+        return doc
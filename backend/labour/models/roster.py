@@ -1,15 +1,27 @@
 from collections import defaultdict, namedtuple
-from datetime import timedelta
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
 
 from dateutil.parser import parse as parse_date
 from dateutil.tz import tzlocal
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import Count, Sum
+from django.http import Http404
 from django.utils.translation import gettext_lazy as _
 
 from api.utils import JSONSchemaObject
 from core.csv_export import CsvExportMixin
-from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS, ONE_HOUR, format_interval, pick_attrs, slugify
+from core.utils import (
+    NONUNIQUE_SLUG_FIELD_PARAMS,
+    ONE_HOUR,
+    format_interval,
+    full_hours_between,
+    pick_attrs,
+    slugify,
+)
 
 
 class WorkPeriod(models.Model):
@@ -74,7 +86,11 @@ class Job(models.Model):
     def _make_shifts(self):
         return [shift.as_dict() for shift in self.shifts.all()]
 
-    def as_dict(self, include_requirements=True, include_shifts=False):
+    def as_dict(self, include_requirements=True, include_shifts=False, matrix: "RosterMatrix | None" = None):
+        """
+        If a RosterMatrix containing this job is given, requirements are taken from it instead of
+        querying them separately for this job.
+        """
         doc = pick_attrs(
             self,
             "slug",
@@ -82,8 +98,12 @@ class Job(models.Model):
         )
 
         if include_requirements:
-            doc["requirements"] = self._make_requirements()
-            doc["allocated"] = self._make_allocated()
+            if matrix is not None:
+                doc["requirements"] = matrix.get_job_requirements(self.id)
+                doc["allocated"] = matrix.get_job_allocated(self.id)
+            else:
+                doc["requirements"] = self._make_requirements()
+                doc["allocated"] = self._make_allocated()
 
         if include_shifts:
             doc["shifts"] = self._make_shifts()
@@ -120,6 +140,32 @@ class JobRequirement(models.Model):
 
         return [allocated_by_start_time[t] for t in work_hours]
 
+    @classmethod
+    def set_requirements(cls, event, job_requests: "Iterable[tuple[Job, SetJobRequirementsRequest]]"):
+        """
+        Sets the required number of workers for each hour in the given ranges using a single
+        INSERT ... ON CONFLICT (job_id, start_time) DO UPDATE statement. If ranges of the same job
+        overlap, the one given last wins.
+        """
+        requirements_by_job_and_hour = {}
+
+        for job, request in job_requests:
+            for hour in request.get_work_hours(event):
+                requirements_by_job_and_hour[job.id, hour] = cls(
+                    job=job,
+                    start_time=hour,
+                    end_time=hour + ONE_HOUR,
+                    count=request.required,
+                )
+
+        # NOTE: ON CONFLICT DO UPDATE may not affect the same row twice, hence the dict above
+        cls.objects.bulk_create(
+            requirements_by_job_and_hour.values(),
+            update_conflicts=True,
+            unique_fields=["job", "start_time"],
+            update_fields=["count"],
+        )
+
     def save(self, *args, **kwargs):
         if self.start_time and not self.end_time:
             self.end_time = self.start_time + ONE_HOUR
@@ -129,6 +175,7 @@ class JobRequirement(models.Model):
     class Meta:
         verbose_name = _("job requirement")
         verbose_name_plural = _("job requirements")
+        unique_together = [("job", "start_time")]
 
 
 class Shift(models.Model, CsvExportMixin):
@@ -143,10 +190,10 @@ class Shift(models.Model, CsvExportMixin):
 
         return dict(
             id=self.id,
-            job=self.job.id,
+            job=self.job_id,
             startTime=self.start_time.astimezone(tz).isoformat() if self.start_time else None,
             hours=self.hours,
-            person=self.signup.person.id if self.signup and self.signup.person else None,
+            person=self.signup.person_id if self.signup else None,
             notes=self.notes,
             state="planned",  # TODO
         )
@@ -242,6 +289,107 @@ class Shift(models.Model, CsvExportMixin):
         ordering = ("job", "start_time")
 
 
+@dataclass
+class RosterMatrix:
+    """
+    Requirement and allocation counts of jobs × work hours of an event. Each row is a list of integers
+    where indexes correspond to those of work_hours for the event.
+
+    Built for whole job categories (or an event) with two GROUP BY queries instead of querying the
+    requirements and shifts of each job separately.
+    """
+
+    work_hours: list[datetime]
+    requirements_by_job_id: dict[int, list[int]]
+    allocated_by_job_id: dict[int, list[int]]
+    requirements_by_job_category_id: dict[int, list[int]]
+    allocated_by_job_category_id: dict[int, list[int]]
+
+    @classmethod
+    def for_job_categories(cls, event, job_categories) -> "RosterMatrix":
+        work_hours = event.labour_event_meta.work_hours
+        num_hours = len(work_hours)
+        hour_indexes = {t: i for (i, t) in enumerate(work_hours)}
+        empty_row = lambda: [0] * num_hours
+
+        requirements_by_job_id = defaultdict(empty_row)
+        requirements_by_job_category_id = defaultdict(empty_row)
+
+        for job_id, job_category_id, start_time, count in (
+            JobRequirement.objects.filter(job__job_category__in=job_categories)
+            .order_by()
+            .values_list("job_id", "job__job_category_id", "start_time")
+            .annotate(count=Sum("count"))
+        ):
+            # requirements not on a work hour are not shown
+            if (i := hour_indexes.get(start_time)) is not None:
+                requirements_by_job_id[job_id][i] += count
+                requirements_by_job_category_id[job_category_id][i] += count
+
+        # Shifts span multiple hours, so record +count where they start and -count where they end
+        # and take the cumulative sum over each row afterwards.
+        allocated_diff_by_job_id = defaultdict(lambda: [0] * (num_hours + 1))
+        allocated_diff_by_job_category_id = defaultdict(lambda: [0] * (num_hours + 1))
+
+        if work_hours:
+            work_begins = work_hours[0]
+
+            for job_id, job_category_id, start_time, hours, count in (
+                Shift.objects.filter(job__job_category__in=job_categories)
+                .order_by()
+                .values_list("job_id", "job__job_category_id", "start_time", "hours")
+                .annotate(count=Count("id"))
+            ):
+                offset, remainder = divmod(start_time - work_begins, ONE_HOUR)
+                if remainder:
+                    # not aligned to work hours, so none of its hours are shown
+                    continue
+
+                first = max(offset, 0)
+                last = min(offset + hours, num_hours)
+                if first >= last:
+                    continue
+
+                for diff in (allocated_diff_by_job_id[job_id], allocated_diff_by_job_category_id[job_category_id]):
+                    diff[first] += count
+                    diff[last] -= count
+
+        return cls(
+            work_hours=work_hours,
+            requirements_by_job_id=dict(requirements_by_job_id),
+            allocated_by_job_id={
+                job_id: list(accumulate(diff[:-1])) for (job_id, diff) in allocated_diff_by_job_id.items()
+            },
+            requirements_by_job_category_id=dict(requirements_by_job_category_id),
+            allocated_by_job_category_id={
+                job_category_id: list(accumulate(diff[:-1]))
+                for (job_category_id, diff) in allocated_diff_by_job_category_id.items()
+            },
+        )
+
+    @classmethod
+    def for_event(cls, event) -> "RosterMatrix":
+        from .job_category import JobCategory
+
+        return cls.for_job_categories(event, JobCategory.objects.filter(event=event))
+
+    def _get_row(self, rows: dict[int, list[int]], key: int) -> list[int]:
+        row = rows.get(key)
+        return list(row) if row is not None else [0] * len(self.work_hours)
+
+    def get_job_requirements(self, job_id: int) -> list[int]:
+        return self._get_row(self.requirements_by_job_id, job_id)
+
+    def get_job_allocated(self, job_id: int) -> list[int]:
+        return self._get_row(self.allocated_by_job_id, job_id)
+
+    def get_job_category_requirements(self, job_category_id: int) -> list[int]:
+        return self._get_row(self.requirements_by_job_category_id, job_category_id)
+
+    def get_job_category_allocated(self, job_category_id: int) -> list[int]:
+        return self._get_row(self.allocated_by_job_category_id, job_category_id)
+
+
 SetJobRequirementsRequestBase = namedtuple("SetJobRequirementsRequest", "startTime hours required")
 
 
@@ -256,6 +404,55 @@ class SetJobRequirementsRequest(SetJobRequirementsRequestBase, JSONSchemaObject)
         required=list(SetJobRequirementsRequestBase._fields),
     )
 
+    def get_work_hours(self, event):
+        """
+        Returns the full hours requested, limited to the work hours of the event.
+        """
+        meta = event.labour_event_meta
+
+        start_time = parse_date(self.startTime)
+        end_time = start_time + timedelta(hours=self.hours - 1)  # -1 due to end parameter being inclusive
+
+        start_time = max(start_time, meta.work_begins)
+        end_time = min(end_time, meta.work_ends)
+
+        return full_hours_between(start_time, end_time)  # start/end inclusive
+
+
+SetJobCategoryRequirementsRequestBase = namedtuple("SetJobCategoryRequirementsRequest", "requirements")
+
+
+class SetJobCategoryRequirementsRequest(SetJobCategoryRequirementsRequestBase, JSONSchemaObject):
+    schema = dict(
+        type="object",
+        properties=dict(
+            requirements=dict(
+                type="array",
+                items=dict(
+                    SetJobRequirementsRequest.schema,
+                    properties=dict(
+                        SetJobRequirementsRequest.schema["properties"],
+                        job=dict(type="string", minLength=1),
+                    ),
+                    required=["job", *SetJobRequirementsRequest.schema["required"]],
+                ),
+            ),
+        ),
+        required=list(SetJobCategoryRequirementsRequestBase._fields),
+    )
+
+    def get_job_requests(self, job_category) -> "list[tuple[Job, SetJobRequirementsRequest]]":
+        job_slugs = {requirement["job"] for requirement in self.requirements}
+        jobs_by_slug = {job.slug: job for job in job_category.job_set.filter(slug__in=job_slugs)}
+
+        if missing_slugs := job_slugs - jobs_by_slug.keys():
+            raise Http404(f"No such jobs: {', '.join(sorted(missing_slugs))}")
+
+        return [
+            (jobs_by_slug[requirement["job"]], SetJobRequirementsRequest.from_dict(requirement))
+            for requirement in self.requirements
+        ]
+
 
 EditJobRequestBase = namedtuple("EditJobRequest", "title")
 
@@ -1,13 +1,15 @@
 import logging
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
 from functools import cached_property
+from itertools import batched
 from typing import TYPE_CHECKING
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
 from core.csv_export import CsvExportMixin
@@ -37,6 +39,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("kompassi")
 
+# side effects of mass state changes are applied in background tasks of this many signups each
+MASS_STATE_CHANGE_BATCH_SIZE = 100
+
 
 @dataclass
 class StateTransition:
@@ -359,10 +364,12 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
 
         if self.job_title:
             return self.job_title
-        elif self.job_categories_accepted.exists():
-            return self.job_categories_accepted.first().name
-        else:
-            return "Työvoima"
+
+        # NOTE: Iterate instead of .first() so that prefetched job_categories_accepted get used
+        for job_category in self.job_categories_accepted.all():
+            return job_category.name
+
+        return "Työvoima"
 
     @property
     def granted_privileges(self):
@@ -455,6 +462,31 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
             filter_func=cls.filter_signups_for_mass_send_shifts,
         )
 
+    @classmethod
+    def get_state_change_params(cls, old_state, new_state, t=None):
+        """
+        Returns the field values that change when a signup goes from old_state to new_state,
+        following the semantics of time_bool_property. Used to change the state of many signups
+        in a single UPDATE.
+        """
+        if t is None:
+            t = now()
+
+        old_flags = STATE_FLAGS_BY_NAME[old_state]
+        new_flags = STATE_FLAGS_BY_NAME[new_state]
+
+        params = {}
+        for time_field_name, old_flag, new_flag in zip(STATE_TIME_FIELDS, old_flags, new_flags, strict=True):
+            if old_flag != new_flag:
+                params[time_field_name] = t if new_flag else None
+
+        # First state flag is not a time bool field, but an actual bona fide boolean field.
+        params.pop(STATE_TIME_FIELDS[0], None)
+        if old_flags[0] != new_flags[0]:
+            params["is_active"] = new_flags[0]
+
+        return params
+
     @classmethod
     def _mass_state_change(cls, old_state, new_state, signups, filter_func=None):
         if filter_func is None:
@@ -462,13 +494,187 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
         else:
             signups = filter_func(signups)
 
-        for signup in signups:
-            signup.state = new_state
-            signup.save()
-            signup.apply_state()
+        t = now()
+        with transaction.atomic():
+            signup_ids = list(signups.order_by().values_list("id", flat=True).distinct())
+            signups = cls.objects.filter(id__in=signup_ids)
+            signups.update(**cls.get_state_change_params(old_state, new_state, t), updated_at=t)
+
+            cls.apply_state_many(signups)
 
         return signups
 
+    @classmethod
+    def apply_state_many(cls, signups: models.QuerySet["Signup"]):
+        """
+        Like apply_state, but for many signups at once. Group memberships are updated
+        right away in a fixed number of queries. Once the transaction commits, messages are sent
+        per message instead of per person, and the rest of apply_state is done in background tasks
+        of MASS_STATE_CHANGE_BATCH_SIZE signups each.
+
+        NOTE: Unlike in apply_state, group memberships are updated before job categories accepted and
+        personnel classes are ensured to be set. This only matters for signups being accepted, which are
+        accepted one by one with apply_state.
+        """
+        signup_ids = list(signups.values_list("id", flat=True))
+        if not signup_ids:
+            return
+
+        for event_id in signups.order_by().values_list("event_id", flat=True).distinct():
+            cls.apply_state_group_membership_many(signups.filter(event_id=event_id))
+
+        def _fan_out():
+            if "mailings" in settings.INSTALLED_APPS:
+                from core.models import Event
+                from mailings.models import Message
+
+                for event in Event.objects.filter(signup__in=signup_ids).distinct():
+                    Message.send_messages_many(
+                        event,
+                        "labour",
+                        signups.filter(event=event).values_list("person_id", flat=True),
+                    )
+
+            if "background_tasks" in settings.INSTALLED_APPS:
+                from ..tasks import signup_apply_state_many
+
+                for batch in batched(signup_ids, MASS_STATE_CHANGE_BATCH_SIZE):
+                    signup_apply_state_many.delay(list(batch))
+            else:
+                for batch in batched(signup_ids, MASS_STATE_CHANGE_BATCH_SIZE):
+                    cls._apply_state_many(list(batch))
+
+        transaction.on_commit(_fan_out)
+
+    @classmethod
+    def _apply_state_many(cls, signup_ids: list[int]):
+        signups = list(cls.objects.filter(id__in=signup_ids).select_related("event", "person"))
+
+        for signup in signups:
+            signup.apply_state_sync(create_badges=False)
+            signup.apply_state_email_aliases()
+
+        cls.apply_state_create_badges_many(signups)
+
+    @classmethod
+    def apply_state_create_badges_many(cls, signups: list["Signup"]):
+        if "badges" not in settings.INSTALLED_APPS:
+            return
+
+        from badges.models import Badge
+
+        persons_by_event = defaultdict(list)
+        for signup in signups:
+            persons_by_event[signup.event].append(signup.person)
+
+        for event, persons in persons_by_event.items():
+            if event.badges_event_meta is None:
+                continue
+
+            Badge.ensure_many(event=event, persons=persons)
+
+    @classmethod
+    def apply_state_group_membership_many(cls, signups: models.QuerySet["Signup"]):
+        """
+        Set-based apply_state_group_membership for signups of a single event.
+        """
+        from django.contrib.auth.models import Group, User
+
+        from core.event_box_registry import bump_user_versions
+
+        from .job_category import JobCategory
+        from .personnel_class import PersonnelClass
+
+        signups = list(signups.select_related("event__labour_event_meta", "person"))
+        if not signups:
+            return
+
+        event = signups[0].event
+        if any(signup.event_id != event.id for signup in signups):
+            raise ValueError("All signups must be of the same event")
+
+        meta = event.labour_event_meta
+        signup_ids = [signup.id for signup in signups]
+
+        job_category_slugs = dict(JobCategory.objects.filter(event=event).values_list("id", "slug"))
+        personnel_class_slugs = dict(
+            PersonnelClass.objects.filter(event=event, app_label="labour").values_list("id", "slug")
+        )
+
+        group_names = {
+            suffix: meta.make_group_name(event, suffix)
+            for suffix in [*SIGNUP_STATE_GROUPS, *job_category_slugs.values(), *personnel_class_slugs.values()]
+        }
+        group_ids_by_name = dict(Group.objects.filter(name__in=group_names.values()).values_list("name", "id"))
+        if missing_group_names := set(group_names.values()) - group_ids_by_name.keys():
+            raise Group.DoesNotExist(f"Missing groups: {', '.join(sorted(missing_group_names))}")
+        group_ids_by_suffix = {suffix: group_ids_by_name[name] for suffix, name in group_names.items()}
+
+        job_categories_accepted = defaultdict(set)
+        for signup_id, job_category_id in cls.objects.filter(
+            id__in=signup_ids,
+            job_categories_accepted__isnull=False,
+        ).values_list("id", "job_categories_accepted"):
+            job_categories_accepted[signup_id].add(job_category_id)
+
+        personnel_classes = defaultdict(set)
+        for signup_id, personnel_class_id in cls.objects.filter(
+            id__in=signup_ids,
+            personnel_classes__isnull=False,
+        ).values_list("id", "personnel_classes"):
+            personnel_classes[signup_id].add(personnel_class_id)
+
+        user_ids = set()
+        should_belong: set[tuple[int, int]] = set()
+        for signup in signups:
+            user_id = signup.person.user_id
+            if user_id is None:
+                logger.warning("Cannot apply group membership for Person without User: %s", signup.person)
+                continue
+
+            checks = [
+                *((group_suffix, getattr(signup, f"is_{group_suffix}")) for group_suffix in SIGNUP_STATE_GROUPS),
+                *((slug, id in job_categories_accepted[signup.id]) for id, slug in job_category_slugs.items()),
+                *((slug, id in personnel_classes[signup.id]) for id, slug in personnel_class_slugs.items()),
+            ]
+
+            # As in apply_state_group_membership, a group that is both added and removed
+            # (eg. a job category and a personnel class with the same slug) ends up removed.
+            belongs: dict[int, bool] = {}
+            for suffix, should_belong_to_group in checks:
+                group_id = group_ids_by_suffix[suffix]
+                belongs[group_id] = belongs.get(group_id, True) and should_belong_to_group
+
+            user_ids.add(user_id)
+            should_belong.update((user_id, group_id) for group_id, value in belongs.items() if value)
+
+        UserGroup = User.groups.through
+        belongs_now = set(
+            UserGroup.objects.filter(
+                user_id__in=user_ids,
+                group_id__in=group_ids_by_suffix.values(),
+            ).values_list("user_id", "group_id")
+        )
+
+        to_add = should_belong - belongs_now
+        UserGroup.objects.bulk_create(
+            [UserGroup(user_id=user_id, group_id=group_id) for user_id, group_id in to_add],
+            ignore_conflicts=True,
+        )
+
+        user_ids_to_remove_by_group_id = defaultdict(list)
+        for user_id, group_id in belongs_now - should_belong:
+            user_ids_to_remove_by_group_id[group_id].append(user_id)
+
+        if user_ids_to_remove_by_group_id:
+            q = models.Q()
+            for group_id, user_ids_to_remove in user_ids_to_remove_by_group_id.items():
+                q |= models.Q(group_id=group_id, user_id__in=user_ids_to_remove)
+            UserGroup.objects.filter(q).delete()
+
+        # bulk_create and QuerySet.delete on the through model send no m2m_changed
+        bump_user_versions(user_id for user_id, _group_id in to_add | (belongs_now - should_belong))
+
     def apply_state(self):
         self.apply_state_sync()
 
@@ -479,13 +685,14 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
         else:
             self._apply_state()
 
-    def apply_state_sync(self):
+    def apply_state_sync(self, create_badges=True):
         self.apply_state_ensure_job_categories_accepted_is_set()
         self.apply_state_ensure_personnel_class_is_set()
 
         self.signup_extra.apply_state()
 
-        self.apply_state_create_badges()
+        if create_badges:
+            self.apply_state_create_badges()
 
     def _apply_state(self):
         self.apply_state_group_membership()
@@ -496,12 +703,16 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
         from .job_category import JobCategory
         from .personnel_class import PersonnelClass
 
+        meta = self.event.labour_event_meta
+        job_category_ids_accepted = set(self.job_categories_accepted.values_list("id", flat=True))
+        personnel_class_ids = set(self.personnel_classes.values_list("id", flat=True))
+
         groups_to_add = set()
         groups_to_remove = set()
 
         for group_suffix in SIGNUP_STATE_GROUPS:
             should_belong_to_group = getattr(self, f"is_{group_suffix}")
-            group = self.event.labour_event_meta.get_group(group_suffix)
+            group = meta.get_group(group_suffix)
 
             if should_belong_to_group:
                 groups_to_add.add(group)
@@ -509,8 +720,8 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
                 groups_to_remove.add(group)
 
         for job_category in JobCategory.objects.filter(event=self.event):
-            should_belong_to_group = self.job_categories_accepted.filter(pk=job_category.pk).exists()
-            group = self.event.labour_event_meta.get_group(job_category.slug)
+            should_belong_to_group = job_category.id in job_category_ids_accepted
+            group = meta.get_group(job_category.slug)
 
             if should_belong_to_group:
                 groups_to_add.add(group)
@@ -518,8 +729,8 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
                 groups_to_remove.add(group)
 
         for personnel_class in PersonnelClass.objects.filter(event=self.event, app_label="labour"):
-            should_belong_to_group = self.personnel_classes.filter(pk=personnel_class.pk).exists()
-            group = self.event.labour_event_meta.get_group(personnel_class.slug)
+            should_belong_to_group = personnel_class.id in personnel_class_ids
+            group = meta.get_group(personnel_class.slug)
 
             if should_belong_to_group:
                 groups_to_add.add(group)
@@ -744,7 +955,8 @@ class Signup(CsvExportMixin, SignupMixin, models.Model):
         if self.xxx_interim_shifts:
             parts.append(self.xxx_interim_shifts)
 
-        parts.extend(str(shift) for shift in self.shifts.all().order_by("start_time"))
+        # sorted in Python so that prefetched shifts are used (see PersonMessage.create_many)
+        parts.extend(str(shift) for shift in sorted(self.shifts.all(), key=lambda shift: shift.start_time))
 
         return "\n\n".join(part for part in parts if part)
 
@@ -9,6 +9,13 @@ def signup_apply_state(signup_pk):
     signup._apply_state()
 
 
+@shared_task(ignore_result=True)
+def signup_apply_state_many(signup_pks):
+    from .models import Signup
+
+    Signup._apply_state_many(signup_pks)
+
+
 @shared_task(ignore_result=True)
 def labour_event_meta_create_groups(meta_pk):
     from .models import LabourEventMeta
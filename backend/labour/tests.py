@@ -1,12 +1,26 @@
 from io import BytesIO
 
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
 from access.models import CBACEntry
 from core.csv_export import export_csv
+from core.event_box_registry import USER_VERSION_KEY
 from core.models import Person
+from core.utils import ONE_HOUR, assert_max_queries, profile_queries
 
-from .models import JobCategory, LabourEventMeta, Qualification, Signup
+from .models import (
+    Job,
+    JobCategory,
+    JobRequirement,
+    LabourEventMeta,
+    Qualification,
+    RosterMatrix,
+    SetJobCategoryRequirementsRequest,
+    Shift,
+    Signup,
+)
 
 
 class LabourEventAdminTest(TestCase):
@@ -61,6 +75,33 @@ class SignupTest(TestCase):
         assert not params["time_accepted__isnull"]
         assert params["time_finished__isnull"]
 
+    def test_mass_request_confirmation(self):
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        meta = signup.event.labour_event_meta
+        user = signup.person.user
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Signup.mass_request_confirmation(Signup.objects.filter(event=signup.event))
+
+        signup = Signup.objects.get(pk=signup.pk)
+        assert signup.state == "confirmation"
+        assert user.groups.filter(pk=meta.get_group("confirmation").pk).exists()
+        assert not user.groups.filter(pk=meta.get_group("new").pk).exists()
+
+        # set-based group membership must agree with the one applied per signup
+        group_ids = set(user.groups.values_list("id", flat=True))
+        signup.apply_state_group_membership()
+        assert set(user.groups.values_list("id", flat=True)) == group_ids
+
+        # set-based group membership sends no m2m_changed, so it invalidates cached event boxes itself
+        confirmation_group = meta.get_group("confirmation")
+        User.groups.through.objects.filter(user=user, group=confirmation_group).delete()
+        version_key = USER_VERSION_KEY.format(user_id=user.id)
+        version = cache.get(version_key, 0)
+        Signup.apply_state_group_membership_many(Signup.objects.filter(pk=signup.pk))
+        assert user.groups.filter(pk=confirmation_group.pk).exists()
+        assert cache.get(version_key, 0) > version
+
 
 class JobCategoryTestCase(TestCase):
     def test_group(self):
@@ -81,6 +122,80 @@ class JobCategoryTestCase(TestCase):
         rg = RecipientGroup.objects.get(job_category=jc)
         assert rg.verbose_name == jc.name
 
+    def test_roster_matrix(self):
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        jc, unused = JobCategory.get_or_create_dummy()
+        event = jc.event
+        work_begins = event.labour_event_meta.work_begins
+
+        job1 = Job.objects.create(job_category=jc, title="Job 1")
+        job2 = Job.objects.create(job_category=jc, title="Job 2")
+        job3 = Job.objects.create(job_category=jc, title="Job 3")
+
+        for job, hour, count in [(job1, 0, 2), (job1, 1, 3), (job1, 5, 1), (job2, 2, 4), (job2, -1, 5)]:
+            JobRequirement.objects.create(job=job, start_time=work_begins + hour * ONE_HOUR, count=count)
+
+        for job, hour, hours in [(job1, -2, 4), (job1, 1, 2), (job1, 1, 2), (job2, 3, 3)]:
+            Shift.objects.create(job=job, signup=signup, start_time=work_begins + hour * ONE_HOUR, hours=hours)
+
+        with self.assertNumQueries(2):
+            matrix = RosterMatrix.for_job_categories(event, [jc])
+
+        for job in [job1, job2, job3]:
+            assert matrix.get_job_requirements(job.id) == JobRequirement.requirements_as_integer_array(
+                event, job.requirements.all()
+            )
+            assert matrix.get_job_allocated(job.id) == JobRequirement.allocated_as_integer_array(
+                event, job.shifts.all()
+            )
+
+        assert matrix.get_job_category_requirements(jc.id) == JobRequirement.requirements_as_integer_array(
+            event, JobRequirement.objects.filter(job__job_category=jc)
+        )
+        assert matrix.get_job_category_allocated(jc.id) == JobRequirement.allocated_as_integer_array(
+            event, Shift.objects.filter(job__job_category=jc)
+        )
+
+        doc = jc.as_roster_api_dict()
+        patch = jc.as_roster_api_patch(job_ids=[job2.id], signup_ids=[signup.id])
+        assert patch["allocated"] == matrix.get_job_category_allocated(jc.id)
+        assert patch["jobs"] == [
+            {key: value for (key, value) in job_doc.items() if key != "shifts"}
+            for job_doc in doc["jobs"]
+            if job_doc["slug"] == job2.slug
+        ]
+        assert patch["people"] == doc["people"]
+
+    def test_set_job_requirements(self):
+        jc, unused = JobCategory.get_or_create_dummy()
+        event = jc.event
+        work_begins = event.labour_event_meta.work_begins
+
+        job1 = Job.objects.create(job_category=jc, title="Job 1")
+        job2 = Job.objects.create(job_category=jc, title="Job 2")
+        JobRequirement.objects.create(job=job1, start_time=work_begins + ONE_HOUR, count=7)
+
+        body = SetJobCategoryRequirementsRequest.from_dict(
+            dict(
+                requirements=[
+                    dict(job=job1.slug, startTime=(work_begins - ONE_HOUR).isoformat(), hours=3, required=2),
+                    dict(job=job2.slug, startTime=work_begins.isoformat(), hours=2, required=1),
+                    dict(job=job2.slug, startTime=(work_begins + ONE_HOUR).isoformat(), hours=1, required=3),
+                ]
+            )
+        )
+
+        with self.assertNumQueries(2):
+            JobRequirement.set_requirements(event, body.get_job_requests(jc))
+
+        def get_requirements(job):
+            return list(job.requirements.order_by("start_time").values_list("start_time", "count"))
+
+        # clamped to work hours, existing requirement updated
+        assert get_requirements(job1) == [(work_begins, 2), (work_begins + ONE_HOUR, 2)]
+        # the later of overlapping ranges wins
+        assert get_requirements(job2) == [(work_begins, 1), (work_begins + ONE_HOUR, 3)]
+
 
 class ExcelExportTestCase(TestCase):
     def test_labour_excel_export(self):
@@ -89,3 +204,36 @@ class ExcelExportTestCase(TestCase):
 
         with BytesIO() as output_file:
             export_csv(signup.event, Signup, signups, output_file, m2m_mode="separate_columns", dialect="xlsx")
+
+
+class AdminSignupsViewTestCase(TestCase):
+    def test_admin_signups_view_query_budget(self):
+        """
+        Listing signups should take a constant number of queries regardless of the number of signups.
+        """
+        signup, unused = Signup.get_or_create_dummy(accepted=True)
+        event = signup.event
+        job_category = signup.job_categories.get()
+
+        event.labour_event_meta.admin_group.user_set.add(signup.person.user)
+        CBACEntry.ensure_admin_group_privileges_for_event(event)
+        self.client.force_login(signup.person.user)
+
+        def make_signups(num_signups):
+            for _ in range(num_signups):
+                person = Person.objects.create(first_name="Testi", surname="Testinen")
+                new_signup = Signup.objects.create(person=person, event=event)
+                new_signup.job_categories.set([job_category])
+
+        url = f"/events/{event.slug}/labour/admin/signups"
+
+        make_signups(1)
+        with profile_queries() as profile:
+            response = self.client.get(url)
+        assert response.status_code == 200
+
+        make_signups(5)
+        with assert_max_queries(profile.num_queries):
+            response = self.client.get(url)
+        assert response.status_code == 200
+        assert response.content.decode().count("Testinen") == 6
@@ -17,6 +17,7 @@ from .views import (
     api_job_categories_view,
     api_job_category_view,
     api_job_view,
+    api_set_job_category_requirements_view,
     api_set_job_requirements_view,
     api_shift_view,
     confirm_view,
@@ -144,6 +145,11 @@ urlpatterns = [
         api_job_category_view,
         name="api_job_category_view",
     ),
+    re_path(
+        r"^api/v1/events/(?P<event_slug>[a-z0-9-]+)/jobcategories/(?P<job_category_slug>[a-z0-9-]+)/requirements/?$",
+        api_set_job_category_requirements_view,
+        name="api_set_job_category_requirements_view",
+    ),
     re_path(
         r"^api/v1/events/(?P<event_slug>[a-z0-9-]+)/jobcategories/(?P<job_category_slug>[a-z0-9-]+)/jobs/?$",
         api_job_view,
@@ -17,6 +17,7 @@ from .api_views import (
     api_job_categories_view,
     api_job_category_view,
     api_job_view,
+    api_set_job_category_requirements_view,
     api_set_job_requirements_view,
     api_shift_view,
 )
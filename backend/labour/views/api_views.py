@@ -1,12 +1,9 @@
 import logging
-from datetime import timedelta
 
-from dateutil.parser import parse as parse_datetime
 from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_POST, require_safe
 
 from api.utils import MethodNotAllowed, api_view
-from core.utils import full_hours_between
 
 from ..helpers import labour_admin_required
 from ..models import (
@@ -15,6 +12,8 @@ from ..models import (
     Job,
     JobCategory,
     JobRequirement,
+    RosterMatrix,
+    SetJobCategoryRequirementsRequest,
     SetJobRequirementsRequest,
     Shift,
 )
@@ -26,7 +25,10 @@ logger = logging.getLogger("kompassi")
 @require_safe
 @api_view
 def api_job_categories_view(request, vars, event):
-    return [jc.as_dict(include_requirements=True) for jc in JobCategory.objects.filter(event=event, app_label="labour")]
+    job_categories = JobCategory.objects.filter(event=event, app_label="labour")
+    matrix = RosterMatrix.for_job_categories(event, job_categories)
+
+    return [jc.as_dict(include_requirements=True, matrix=matrix) for jc in job_categories]
 
 
 @labour_admin_required
@@ -67,7 +69,12 @@ def api_job_view(request, vars, event, job_category_slug, job_slug=None):
 @labour_admin_required
 @api_view
 def api_shift_view(request, vars, event, job_category_slug, shift_id=None):
+    """
+    Returns the whole job category like api_job_category_view, or with ?response=patch only the parts
+    affected by the edit (see JobCategory.as_roster_api_patch).
+    """
     job_category = get_object_or_404(JobCategory, event=event, slug=job_category_slug)
+    want_patch = request.GET.get("response") == "patch"
 
     if request.method == "POST" and shift_id is None:
         shift = Shift()
@@ -78,13 +85,35 @@ def api_shift_view(request, vars, event, job_category_slug, shift_id=None):
     elif request.method == "DELETE" and shift_id is not None:
         shift = get_object_or_404(Shift, id=int(shift_id), job__job_category=job_category)
         shift.delete()
+
+        if want_patch:
+            return job_category.as_roster_api_patch(
+                job_ids=[shift.job_id],
+                signup_ids=[shift.signup_id],
+                deleted_shift_id=int(shift_id),
+            )
+
         return job_category.as_roster_api_dict()
     else:
         raise MethodNotAllowed(request.method)
 
+    # the shift may be moved to another job or person, so the old ones are affected too
+    job_ids = {shift.job_id}
+    signup_ids = {shift.signup_id}
+
     edit_shift_request.update(job_category, shift)
     shift.save()
 
+    if want_patch:
+        job_ids.add(shift.job_id)
+        signup_ids.add(shift.signup_id)
+
+        return job_category.as_roster_api_patch(
+            job_ids=job_ids - {None},
+            signup_ids=signup_ids - {None},
+            shift=shift,
+        )
+
     return job_category.as_roster_api_dict()
 
 
@@ -96,25 +125,23 @@ def api_set_job_requirements_view(request, vars, event, job_category_slug, job_s
     job = get_object_or_404(Job, job_category=job_category, slug=job_slug)
 
     body = SetJobRequirementsRequest.from_json(request.body)
+    JobRequirement.set_requirements(event, [(job, body)])
 
-    start_time = parse_datetime(body.startTime)
-    end_time = start_time + timedelta(hours=body.hours - 1)  # -1 due to end parameter being inclusive
+    # Successful result emulates that of /api/v1/events/tracon11/jobcategories/conitea
+    return job_category.as_roster_api_dict()
 
-    start_time = max(start_time, event.labour_event_meta.work_begins)
-    end_time = min(end_time, event.labour_event_meta.work_ends)
 
-    for hour in full_hours_between(start_time, end_time):  # start/end inclusive
-        requirement, created = JobRequirement.objects.get_or_create(
-            job=job,
-            start_time=hour,
-            defaults=dict(
-                count=body.required,
-            ),
-        )
+@labour_admin_required
+@require_POST
+@api_view
+def api_set_job_category_requirements_view(request, vars, event, job_category_slug):
+    """
+    Sets requirements of many jobs of the job category at once. Each item of requirements is like the
+    request body of api_set_job_requirements_view plus the slug of the job.
+    """
+    job_category = get_object_or_404(JobCategory, event=event, slug=job_category_slug)
 
-        if not created:
-            requirement.count = body.required
-            requirement.save()
+    body = SetJobCategoryRequirementsRequest.from_json(request.body)
+    JobRequirement.set_requirements(event, body.get_job_requests(job_category))
 
-    # Successful result emulates that of /api/v1/events/tracon11/jobcategories/conitea
     return job_category.as_roster_api_dict()
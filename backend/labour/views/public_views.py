@@ -9,6 +9,7 @@ from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods, require_POST, require_safe
 
+from core.event_box_registry import EventBoxContext
 from core.helpers import person_required
 from core.models import Person
 from core.page_wizard import (
@@ -406,17 +407,9 @@ def labour_profile_menu_items(request):
 
 
 def labour_event_box_context(request, event):
-    signup = None
-    is_labour_admin = False
-
-    if request.user.is_authenticated:
-        is_labour_admin = event.labour_event_meta.is_user_admin(request.user)
-
-        try:
-            person = request.user.person
-            signup = Signup.objects.get(event=event, person=person)
-        except (Person.DoesNotExist, Signup.DoesNotExist):
-            pass
+    box = EventBoxContext.for_request(request, event)
+    is_labour_admin = box.is_user_admin(event.labour_event_meta)
+    signup = Signup.objects.filter(event=event, person=box.person).first() if box.person else None
 
     return dict(
         signup=signup,
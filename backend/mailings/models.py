@@ -1,8 +1,12 @@
 import logging
+from collections.abc import Iterable
 from datetime import datetime
 from hashlib import sha1
+from itertools import batched
+from typing import TYPE_CHECKING, Self
 
 from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
 from django.db import models
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
@@ -12,6 +16,9 @@ from django.utils.translation import gettext_lazy as _
 
 from labour.models import JobCategory, PersonnelClass
 
+if TYPE_CHECKING:
+    from core.models import Person
+
 logger = logging.getLogger("kompassi")
 APP_LABEL_CHOICES = [
     ("labour", "Työvoima"),
@@ -151,23 +158,35 @@ class Message(models.Model):
         message_send.delay(self.pk, [person.pk for person in recipients] if recipients is not None else None, resend)
 
     def _send(self, recipients, resend):
+        from core.models import Person
+
+        from .tasks import message_send_batch
+
         if recipients is None:
-            recipients = [user.person for user in self.recipient.group.user_set.all()]
+            recipients = Person.objects.filter(user__groups=self.recipient.group)
 
-        for person in recipients:
-            try:
-                person_message, created = PersonMessage.objects.get_or_create(
-                    person=person,
-                    message=self,
-                )
-            except PersonMessage.MultipleObjectsReturned:
+        recipients = list(recipients)
+
+        existing_person_messages: dict[int, PersonMessage] = {}
+        for person_message in PersonMessage.objects.filter(
+            message=self,
+            person__in=[person.pk for person in recipients],
+        ).order_by("id"):
+            if person_message.person_id in existing_person_messages:
                 # This actually happens sometimes.
                 logger.warning("A Person doth multiple PersonMessages for a single Message have!")
-                person_message = PersonMessage.objects.filter(person=person, message=self).first()
-                created = False
+            else:
+                existing_person_messages[person_message.person_id] = person_message
+
+        person_messages = PersonMessage.create_many(
+            self,
+            [person for person in recipients if person.pk not in existing_person_messages],
+        )
+        if resend:
+            person_messages.extend(existing_person_messages.values())
 
-            if created or resend:
-                person_message.actually_send()
+        for batch in batched(person_messages, settings.KOMPASSI_MAILINGS_BATCH_SIZE):
+            message_send_batch.delay([person_message.pk for person_message in batch])
 
     def expire(self):
         if self.expired_at is not None:
@@ -204,6 +223,24 @@ class Message(models.Model):
                 resend=False,
             )
 
+    @classmethod
+    def send_messages_many(cls, event, app_label, person_ids):
+        """
+        Like send_messages, but for many people at once. Each message is sent once to those of the people
+        that are in its recipient group.
+        """
+        from core.models import Person
+
+        for message in Message.objects.filter(
+            recipient__app_label=app_label,
+            recipient__event=event,
+            sent_at__isnull=False,
+            expired_at__isnull=True,
+        ).select_related("recipient"):
+            recipients = list(Person.objects.filter(pk__in=person_ids, user__groups=message.recipient.group_id))
+            if recipients:
+                message.send(recipients=recipients, resend=False)
+
     @property
     def event(self):
         return self.recipient.event
@@ -240,6 +277,26 @@ class DedupMixin:
             logger.warning("Multiple %s returned for hash %s", cls.__name__, the_hash)
             return cls.objects.filter(digest=the_hash, text=text).first(), False
 
+    @classmethod
+    def get_or_create_many(cls, texts: Iterable[str]) -> dict[str, Self]:
+        """
+        Like get_or_create, but for many texts at once. Returns a mapping of text to instance.
+        """
+        digests = {text: sha1(text.encode("UTF-8")).hexdigest() for text in texts}
+
+        instances = {}
+        for instance in cls.objects.filter(digest__in=set(digests.values())):
+            instances.setdefault(instance.text, instance)
+
+        instances.update(
+            (instance.text, instance)
+            for instance in cls.objects.bulk_create(
+                cls(digest=digest, text=text) for text, digest in digests.items() if text not in instances
+            )
+        )
+
+        return instances
+
 
 class PersonMessageSubject(models.Model, DedupMixin):
     digest = models.CharField(max_length=63, db_index=True)
@@ -291,11 +348,64 @@ class PersonMessage(models.Model):
     def render_message(self, template):
         return Template(template).render(Context(self.message_vars))
 
-    def actually_send(self):
-        from django.core.mail import EmailMessage
+    @classmethod
+    def create_many(cls, message: Message, persons: list["Person"]) -> list[Self]:
+        """
+        Renders and creates the PersonMessages of a mass message in a fixed number of queries.
+        The templates are compiled only once, and signups are loaded for all recipients at once.
+        """
+        if not persons:
+            return []
+
+        event = message.event
+        subject_template = Template(message.subject_template)
+        body_template = Template(message.body_template)
+
+        # TODO need a way to make app-specific vars in the apps themselves
+        signups = None
+        if "labour" in settings.INSTALLED_APPS:
+            from labour.models import Shift, Signup
+
+            signups = {
+                signup.person_id: signup
+                for signup in Signup.objects.filter(event=event, person__in=[person.pk for person in persons])
+                .select_related("person")
+                .prefetch_related(
+                    "job_categories",
+                    "job_categories_accepted",
+                    "personnel_classes",
+                    models.Prefetch("shifts", queryset=Shift.objects.select_related("job__job_category")),
+                )
+            }
+
+        rendered = []
+        for person in persons:
+            message_vars = dict(event=event, person=person)
+            if signups is not None:
+                message_vars.update(signup=signups.get(person.pk))
+
+            context = Context(message_vars)
+            rendered.append((person, subject_template.render(context), body_template.render(context)))
+
+        subjects = PersonMessageSubject.get_or_create_many(subject for _, subject, _ in rendered)
+        bodies = PersonMessageBody.get_or_create_many(body for _, _, body in rendered)
+
+        # NOTE: bulk_create bypasses save, which would render the message again
+        return cls.objects.bulk_create(
+            cls(
+                message=message,
+                person=person,
+                subject=subjects[subject],
+                body=bodies[body],
+            )
+            for person, subject, body in rendered
+        )
+
+    def get_email_message(self, meta=None) -> EmailMessage:
+        if meta is None:
+            meta = self.message.app_event_meta
 
         msgbcc = []
-        meta = self.message.app_event_meta
 
         if meta.monitor_email:
             msgbcc.append(meta.monitor_email)
@@ -305,11 +415,39 @@ class PersonMessage(models.Model):
 
         reply_to_tup = (reply_to_str,) if (reply_to_str := self.message.reply_to) else None
 
-        EmailMessage(
+        return EmailMessage(
             subject=self.subject.text,
             body=self.body.text,
             from_email=meta.cloaked_contact_email,
             to=(self.person.name_and_email,),
             bcc=msgbcc,
             reply_to=reply_to_tup,
-        ).send(fail_silently=True)
+        )
+
+    def actually_send(self):
+        self.get_email_message().send(fail_silently=True)
+
+    @classmethod
+    def send_many(cls, person_messages: models.QuerySet[Self]):
+        """
+        Sends PersonMessages over a single SMTP connection.
+        """
+        person_messages = list(
+            person_messages.select_related(
+                "message__recipient__event",
+                "person",
+                "subject",
+                "body",
+            )
+        )
+
+        metas = {}
+        email_messages = []
+        for person_message in person_messages:
+            message = person_message.message
+            if message.pk not in metas:
+                metas[message.pk] = message.app_event_meta
+            email_messages.append(person_message.get_email_message(metas[message.pk]))
+
+        with get_connection(fail_silently=True) as connection:
+            connection.send_messages(email_messages)
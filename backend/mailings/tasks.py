@@ -1,4 +1,5 @@
 from celery import shared_task
+from django.conf import settings
 
 
 @shared_task(ignore_result=True)
@@ -14,3 +15,10 @@ def message_send(message_id, recipient_ids=None, resend=False):
         recipients = Person.objects.filter(pk__in=recipient_ids)
 
     message._send(recipients, resend)
+
+
+@shared_task(ignore_result=True, rate_limit=settings.KOMPASSI_MAILINGS_BATCH_RATE_LIMIT)
+def message_send_batch(person_message_ids):
+    from .models import PersonMessage
+
+    PersonMessage.send_many(PersonMessage.objects.filter(pk__in=person_message_ids))
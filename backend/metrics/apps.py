@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class MetricsAppConfig(AppConfig):
+    name = "metrics"
+    verbose_name = "Metrics"
+
+    def ready(self):
+        from . import handlers  # noqa: F401
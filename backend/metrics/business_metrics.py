@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils.timezone import now
+from prometheus_client.core import GaugeMetricFamily
+
+CACHE_KEY = "metrics:business_metrics"
+
+# Only events that have not ended or ended recently are reported to keep the number of series in check
+RECENT_EVENT_DAYS = 30
+
+
+def get_business_metrics() -> list[tuple[str, str, dict[str, int]]]:
+    """
+    Returns (metric name, documentation, {event slug: value}) for each business metric.
+    Each metric is computed with a single aggregate query over recent events.
+    """
+    from badges.models import Badge, BadgeCounts
+    from core.models import Event
+    from forms.models import Response
+    from tickets.models import Order
+
+    events = Event.objects.filter(Q(end_time__isnull=True) | Q(end_time__gte=now() - timedelta(days=RECENT_EVENT_DAYS)))
+
+    orders = (
+        Order.objects.filter(event__in=events, cancellation_time__isnull=True)
+        .order_by()
+        .values("event__slug")
+        .annotate(
+            confirmed=Count("id", filter=Q(confirm_time__isnull=False)),
+            paid=Count("id", filter=Q(payment_date__isnull=False)),
+        )
+    )
+    badges = (
+        Badge.objects.filter(personnel_class__event__in=events)
+        .order_by()
+        .values("personnel_class__event__slug")
+        .annotate(printed=BadgeCounts.get_aggregates()["printed"])
+    )
+    responses = (
+        Response.objects.filter(form__event__in=events, form__survey__isnull=False)
+        .order_by()
+        .values("form__event__slug")
+        .annotate(num_responses=Count("id", distinct=True))
+    )
+
+    orders = list(orders)
+
+    return [
+        (
+            "kompassi_tickets_orders_confirmed",
+            "Number of confirmed orders that have not been cancelled",
+            {row["event__slug"]: row["confirmed"] for row in orders},
+        ),
+        (
+            "kompassi_tickets_orders_paid",
+            "Number of paid orders that have not been cancelled",
+            {row["event__slug"]: row["paid"] for row in orders},
+        ),
+        (
+            "kompassi_badges_printed",
+            "Number of badges printed",
+            {row["personnel_class__event__slug"]: row["printed"] for row in badges},
+        ),
+        (
+            "kompassi_forms_survey_responses",
+            "Number of responses to surveys",
+            {row["form__event__slug"]: row["num_responses"] for row in responses},
+        ),
+    ]
+
+
+class BusinessMetricsCollector:
+    """
+    Reports business metrics as gauges labeled by event. The values are cached for
+    KOMPASSI_METRICS_BUSINESS_CACHE_SECONDS so that scrapes stay cheap.
+    """
+
+    def describe(self):
+        # Do not compute the metrics when registering the collector
+        return []
+
+    def collect(self):
+        business_metrics = cache.get_or_set(
+            CACHE_KEY,
+            get_business_metrics,
+            settings.KOMPASSI_METRICS_BUSINESS_CACHE_SECONDS,
+        )
+
+        for name, documentation, values_by_event_slug in business_metrics:
+            gauge = GaugeMetricFamily(name, documentation, labels=["event"])
+            for event_slug, value in values_by_event_slug.items():
+                gauge.add_metric([event_slug], value)
+            yield gauge
@@ -0,0 +1,30 @@
+from time import perf_counter
+
+from celery.signals import task_postrun, task_prerun, worker_ready
+from django.conf import settings
+
+from .metrics import CELERY_TASK_DURATION, get_registry
+
+task_start_times: dict[str, float] = {}
+
+
+@task_prerun.connect
+def record_task_start(task_id, task, **kwargs):
+    task_start_times[task_id] = perf_counter()
+
+
+@task_postrun.connect
+def record_task_duration(task_id, task, state=None, **kwargs):
+    if (start := task_start_times.pop(task_id, None)) is not None:
+        CELERY_TASK_DURATION.labels(task=task.name, state=state or "UNKNOWN").observe(perf_counter() - start)
+
+
+@worker_ready.connect
+def start_metrics_server(**kwargs):
+    """
+    Celery workers do not serve HTTP, so expose their metrics on a port of their own if configured.
+    """
+    if settings.KOMPASSI_METRICS_CELERY_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.KOMPASSI_METRICS_CELERY_PORT, registry=get_registry(include_business_metrics=False))
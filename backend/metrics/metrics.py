@@ -0,0 +1,59 @@
+"""
+Prometheus metrics of Kompassi.
+
+When running multiple processes (gunicorn workers, Celery prefork workers), set the environment variable
+PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the processes. Metrics of all processes are then
+collected from there by the metrics view. See also gunicorn.conf.py and scripts/docker-entrypoint.sh.
+"""
+
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Histogram, multiprocess
+
+DB_QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf"))
+
+REQUEST_DURATION = Histogram(
+    "kompassi_http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["view", "method", "status"],
+)
+GRAPHQL_OPERATION_DURATION = Histogram(
+    "kompassi_graphql_operation_duration_seconds",
+    "Time spent handling GraphQL requests",
+    ["operation"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "kompassi_http_request_db_queries",
+    "Number of database queries made while handling a HTTP request",
+    ["view"],
+    buckets=DB_QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "kompassi_http_request_db_duration_seconds",
+    "Time spent in database queries while handling a HTTP request",
+    ["view"],
+)
+CELERY_TASK_DURATION = Histogram(
+    "kompassi_celery_task_duration_seconds",
+    "Time spent running Celery tasks",
+    ["task", "state"],
+)
+
+
+def get_registry(include_business_metrics=True) -> CollectorRegistry:
+    """
+    Returns a registry to expose. Metrics are collected from all processes if running in multiprocess mode.
+    """
+    from .business_metrics import BusinessMetricsCollector
+
+    registry = CollectorRegistry()
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(REGISTRY)
+
+    if include_business_metrics:
+        registry.register(BusinessMetricsCollector())
+
+    return registry
@@ -0,0 +1,91 @@
+import re
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.db import connections
+
+from .metrics import GRAPHQL_OPERATION_DURATION, REQUEST_DB_DURATION, REQUEST_DB_QUERIES, REQUEST_DURATION
+
+# GraphQL operation names come from the client, so only accept sane ones and only so many of them
+GRAPHQL_OPERATION_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+MAX_GRAPHQL_OPERATION_NAMES = 200
+
+
+class QueryStats:
+    """
+    Database execute wrapper that counts queries and the time spent in them.
+    """
+
+    def __init__(self):
+        self.num_queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.num_queries += 1
+            self.duration += perf_counter() - start
+
+
+class MetricsMiddleware:
+    """
+    Records request duration per view, database queries per request and GraphQL operation duration
+    into Prometheus metrics (see metrics/metrics.py).
+
+    Should be the first middleware so that time spent in other middleware is included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.graphql_operation_names = set()
+
+    def __call__(self, request):
+        query_stats = QueryStats()
+        start = perf_counter()
+        status = "5xx"
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(query_stats))
+
+                response = self.get_response(request)
+
+            status = f"{response.status_code // 100}xx"
+            return response
+        finally:
+            duration = perf_counter() - start
+            view = self.get_view_label(request)
+
+            REQUEST_DURATION.labels(view=view, method=request.method, status=status).observe(duration)
+            REQUEST_DB_QUERIES.labels(view=view).observe(query_stats.num_queries)
+            REQUEST_DB_DURATION.labels(view=view).observe(query_stats.duration)
+
+            # set by graphql_api.views.GraphQLView
+            if hasattr(request, "graphql_operation_name"):
+                operation = self.get_graphql_operation_label(request.graphql_operation_name)
+                GRAPHQL_OPERATION_DURATION.labels(operation=operation).observe(duration)
+
+    def get_view_label(self, request) -> str:
+        if resolver_match := getattr(request, "resolver_match", None):
+            return resolver_match.view_name
+
+        return "<unresolved>"
+
+    def get_graphql_operation_label(self, operation_name: str | None) -> str:
+        if not operation_name:
+            return "<anonymous>"
+
+        if operation_name in self.graphql_operation_names:
+            return operation_name
+
+        if (
+            GRAPHQL_OPERATION_NAME_RE.match(operation_name)
+            and len(self.graphql_operation_names) < MAX_GRAPHQL_OPERATION_NAMES
+        ):
+            self.graphql_operation_names.add(operation_name)
+            return operation_name
+
+        return "<other>"
@@ -0,0 +1,63 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils.timezone import now
+
+from tickets.models import Order
+
+from .middleware import MAX_GRAPHQL_OPERATION_NAMES, MetricsMiddleware
+
+
+@pytest.mark.django_db
+def test_metrics_view_without_token(client):
+    cache.clear()
+
+    # the first request is recorded after it has been responded to
+    assert client.get("/metrics").status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200
+
+    content = response.content.decode("UTF-8")
+    series = 'kompassi_http_request_duration_seconds_count{view="metrics.views.metrics_view",method="GET",status="2xx"}'
+    assert series in content
+    assert "kompassi_tickets_orders_confirmed" not in content
+
+
+@pytest.mark.django_db
+@override_settings(KOMPASSI_METRICS_TOKEN="sekrit")
+def test_metrics_view_with_token(client):
+    cache.clear()
+    order, unused = Order.get_or_create_dummy()
+    order.confirm_time = now()
+    order.save()
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+
+    response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer sekrit")
+    assert response.status_code == 200
+
+    content = response.content.decode("UTF-8")
+    assert f'kompassi_tickets_orders_confirmed{{event="{order.event.slug}"}} 1.0' in content
+    assert f'kompassi_tickets_orders_paid{{event="{order.event.slug}"}} 0.0' in content
+
+
+@pytest.mark.django_db
+def test_metrics_url_is_anchored(client):
+    assert client.get("/foo/metrics").status_code == 404
+
+
+def test_get_graphql_operation_label():
+    middleware = MetricsMiddleware(lambda request: None)
+
+    assert middleware.get_graphql_operation_label(None) == "<anonymous>"
+    assert middleware.get_graphql_operation_label("not a valid name") == "<other>"
+    assert middleware.get_graphql_operation_label("x" * 65) == "<other>"
+
+    for i in range(MAX_GRAPHQL_OPERATION_NAMES):
+        assert middleware.get_graphql_operation_label(f"Operation{i}") == f"Operation{i}"
+
+    # new names are no longer accepted, but known ones are still reported as themselves
+    assert middleware.get_graphql_operation_label("OneTooMany") == "<other>"
+    assert middleware.get_graphql_operation_label("Operation0") == "Operation0"
+    assert len(middleware.graphql_operation_names) == MAX_GRAPHQL_OPERATION_NAMES
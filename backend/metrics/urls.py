@@ -1,7 +1,7 @@
 from django.urls import re_path
 
-from .views import dummy_metrics_view
+from .views import metrics_view
 
 urlpatterns = [
-    re_path(r"metrics/?", dummy_metrics_view),
+    re_path(r"^metrics/?$", metrics_view),
 ]
@@ -1,11 +1,26 @@
+from hmac import compare_digest
+
+from django.conf import settings
 from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from .metrics import get_registry
+
 
-METRICS_RESPONSE = """
-# HELP kompassi_up Dummy metric to tell Prometheus we're up
-# TYPE kompassi_up gauge
-kompassi_up{} 1
-""".lstrip()
+def metrics_view(request):
+    """
+    If KOMPASSI_METRICS_TOKEN is set, scrapers need to present it as "Authorization: Bearer <token>" and
+    get business metrics (orders, badges etc.) too. Without a token, only the technical metrics (request
+    durations etc.) are exposed so as not to publish business figures to everyone.
+    """
+    token = settings.KOMPASSI_METRICS_TOKEN
 
+    if token:
+        authorization = request.headers.get("authorization", "")
+        if not compare_digest(authorization.encode("UTF-8"), f"Bearer {token}".encode()):
+            response = HttpResponse("Unauthorized", status=401, content_type="text/plain")
+            response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+            return response
 
-def dummy_metrics_view(request):
-    return HttpResponse(METRICS_RESPONSE, content_type="text/plain")
+    registry = get_registry(include_business_metrics=bool(token))
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
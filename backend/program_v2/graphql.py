@@ -1,9 +1,12 @@
+from collections.abc import Mapping
+
 import graphene
 from graphene.types.generic import GenericScalar
 from graphene_django import DjangoObjectType
 
 from access.cbac import graphql_check_instance
-from core.graphql.common import DimensionFilterInput
+from core.graphql.common import DimensionFilterInput, DimensionFilterMode
+from core.graphql.dataloader import DataLoader
 from core.utils import get_objects_within_period
 from forms.graphql.form import FormType
 from forms.models import Form
@@ -74,9 +77,35 @@ class ScheduleItemType(DjangoObjectType):
     end_time_unix_seconds = graphene.NonNull(graphene.Int)
 
 
+def batch_load_program_dimensions(program_ids: list[int]) -> Mapping[int, list[ProgramDimensionValue]]:
+    dimensions_by_program_id: dict[int, list[ProgramDimensionValue]] = {program_id: [] for program_id in program_ids}
+    for pdv in ProgramDimensionValue.objects.filter(program_id__in=program_ids).select_related("dimension", "value"):
+        dimensions_by_program_id[pdv.program_id].append(pdv)  # type: ignore
+    return dimensions_by_program_id
+
+
+def batch_load_schedule_items(program_ids: list[int]) -> Mapping[int, list[ScheduleItem]]:
+    schedule_items_by_program_id: dict[int, list[ScheduleItem]] = {program_id: [] for program_id in program_ids}
+    for schedule_item in ScheduleItem.objects.filter(program_id__in=program_ids).order_by("start_time"):
+        schedule_items_by_program_id[schedule_item.program_id].append(schedule_item)  # type: ignore
+    return schedule_items_by_program_id
+
+
 class ProgramType(DjangoObjectType):
     cached_dimensions = graphene.Field(GenericScalar)
 
+    @staticmethod
+    def resolve_dimensions(program: Program, info):
+        return DataLoader.for_request(info, batch_load_program_dimensions, default=[]).load(program.id)
+
+    dimensions = graphene.NonNull(graphene.List(graphene.NonNull(ProgramDimensionValueType)))
+
+    @staticmethod
+    def resolve_schedule_items(program: Program, info):
+        return DataLoader.for_request(info, batch_load_schedule_items, default=[]).load(program.id)
+
+    schedule_items = graphene.NonNull(graphene.List(graphene.NonNull(ScheduleItemType)))
+
     class Meta:
         model = Program
         fields = ("title", "slug", "dimensions", "cached_dimensions", "schedule_items")
@@ -115,6 +144,7 @@ class ProgramV2EventMetaType(DjangoObjectType):
     programs = graphene.List(
         graphene.NonNull(ProgramType),
         filters=graphene.List(DimensionFilterInput),
+        filter_mode=DimensionFilterMode(),
     )
 
     @staticmethod
@@ -122,20 +152,15 @@ class ProgramV2EventMetaType(DjangoObjectType):
         meta: ProgramV2EventMeta,
         info,
         filters: list[DimensionFilterInput] | None = None,
+        filter_mode: DimensionFilterMode = DimensionFilterMode.EXACT,
     ):
-        if filters is None:
-            filters = []
-
-        queryset = Program.objects.filter(event=meta.event)
+        programs = list(DimensionFilterInput.filter(Program.objects.filter(event=meta.event), filters, filter_mode))
 
-        if filters:
-            for filter in filters:
-                queryset = queryset.filter(
-                    dimensions__dimension__slug=filter.dimension,
-                    dimensions__value__slug__in=filter.values,
-                )
+        program_ids = [program.id for program in programs]
+        DataLoader.for_request(info, batch_load_program_dimensions, default=[]).prime(program_ids)
+        DataLoader.for_request(info, batch_load_schedule_items, default=[]).prime(program_ids)
 
-        return queryset
+        return programs
 
     dimensions = graphene.List(graphene.NonNull(DimensionType))
 
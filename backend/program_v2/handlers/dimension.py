@@ -18,7 +18,7 @@ def program_dimension_value_pre_save(sender, instance: ProgramDimensionValue, **
 @receiver([post_save, post_delete], sender=Dimension)
 @receiver([post_save, post_delete], sender=DimensionValue)
 def dimension_post_save(sender, instance: Dimension | DimensionValue, **kwargs):
-    Program.refresh_cached_dimensions(instance.event.programs.all())
+    Program.refresh_event_dimensions(instance.event)
 
 
 @receiver([post_save, post_delete], sender=ProgramDimensionValue)
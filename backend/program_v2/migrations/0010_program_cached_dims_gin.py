@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2024-03-12 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("program_v2", "0009_alter_dimension_title_alter_dimensionvalue_title_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="program",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["cached_dimensions"],
+                name="program_v2_program_cached_dims",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
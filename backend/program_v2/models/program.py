@@ -4,16 +4,19 @@ from typing import TYPE_CHECKING, Any, Optional
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models, transaction
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connection, models, transaction
+from pkg_resources import resource_string
 
 from core.models import Event
-from core.utils import log_delete, log_get_or_create, validate_slug
+from core.utils import CachedDimensionsQuerySet, log_delete, log_get_or_create, on_commit_once, validate_slug
 
 if TYPE_CHECKING:
     from .dimension import ProgramDimensionValue
 
 
 logger = logging.getLogger("kompassi")
+REFRESH_CACHED_DIMENSIONS_QUERY = resource_string(__name__, "queries/refresh_program_cached_dimensions.sql").decode()
 
 
 class Program(models.Model):
@@ -33,8 +36,17 @@ class Program(models.Model):
     # related fields
     dimensions: models.QuerySet["ProgramDimensionValue"]
 
+    objects = CachedDimensionsQuerySet.as_manager()
+
     class Meta:
         unique_together = ("event", "slug")
+        indexes = [
+            GinIndex(
+                fields=["cached_dimensions"],
+                opclasses=["jsonb_path_ops"],
+                name="program_v2_program_cached_dims",
+            ),
+        ]
 
     def __str__(self):
         return str(self.title)
@@ -45,7 +57,6 @@ class Program(models.Model):
         Used to populate cached_dimensions
         """
         # TODO should all event dimensions always be present, or only those with values?
-        # TODO when dimensions are changed for an event, refresh all cached_dimensions
         dimensions = {dimension.slug: [] for dimension in self.event.dimensions.all()}
         for pdv in self.dimensions.all():
             dimensions[pdv.dimension.slug].append(pdv.value.slug)
@@ -53,16 +64,34 @@ class Program(models.Model):
 
     @classmethod
     def refresh_cached_dimensions(cls, queryset: models.QuerySet["Program"]):
-        for program in (
-            queryset.select_for_update(of=("self",))
-            .only("id", "cached_dimensions")
-            .prefetch_related(
-                "dimensions__dimension__slug",
-                "dimensions__value__slug",
-            )
-        ):
-            program.cached_dimensions = program._dimensions
-            program.save(update_fields=["cached_dimensions"])
+        """
+        Rebuilds cached_dimensions of the given programs in a single UPDATE statement
+        (see queries/refresh_program_cached_dimensions.sql).
+        """
+        program_ids_sql, program_ids_params = queryset.order_by().values("id").query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(REFRESH_CACHED_DIMENSIONS_QUERY.format(program_ids=program_ids_sql), program_ids_params)
+
+    @classmethod
+    def refresh_event_dimensions(cls, event: Event):
+        """
+        Called when dimensions or their values of the event have changed. Refreshes cached dimensions
+        of all programs of the event once the current transaction commits, only once per transaction.
+        """
+        on_commit_once(
+            lambda: cls._schedule_refresh_event_dimensions(event.id),
+            key=("program_v2.Program.refresh_event_dimensions", event.id),
+        )
+
+    @classmethod
+    def _schedule_refresh_event_dimensions(cls, event_id: int):
+        if "background_tasks" in settings.INSTALLED_APPS:
+            from ..tasks import event_refresh_program_dimensions
+
+            event_refresh_program_dimensions.delay(event_id)
+        else:
+            cls.refresh_cached_dimensions(cls.objects.filter(event_id=event_id))
 
     @staticmethod
     def create_from_form_data(
@@ -0,0 +1,28 @@
+-- Rebuilds cached_dimensions (dimension slug -> list of value slugs) for the given programs.
+-- Every dimension of the event is included, with an empty list if the program has no values for it
+-- (see Program._dimensions).
+update program_v2_program as program
+set cached_dimensions = coalesce(
+    (
+        select jsonb_object_agg(
+            dimension.slug,
+            coalesce(
+                (
+                    select jsonb_agg(value.slug order by pdv.id)
+                    from
+                        program_v2_programdimensionvalue pdv
+                        join program_v2_dimensionvalue value on (pdv.value_id = value.id)
+                    where
+                        pdv.program_id = program.id
+                        and pdv.dimension_id = dimension.id
+                ),
+                jsonb_build_array()
+            )
+        )
+        from program_v2_dimension dimension
+        where dimension.event_id = program.event_id
+    ),
+    jsonb_build_object()
+)
+where
+    program.id in ({program_ids})
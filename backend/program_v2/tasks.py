@@ -0,0 +1,8 @@
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def event_refresh_program_dimensions(event_id):
+    from .models import Program
+
+    Program.refresh_cached_dimensions(Program.objects.filter(event_id=event_id))
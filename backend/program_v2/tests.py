@@ -1,8 +1,9 @@
 import pytest
 
+from core.graphql.common import DimensionFilterInput, DimensionFilterMode
 from core.models import Event
 
-from .models import Dimension, DimensionValue, Program
+from .models import Dimension, DimensionValue, Program, ProgramDimensionValue
 
 
 @pytest.mark.django_db
@@ -58,3 +59,56 @@ def test_program_from_form_data():
         this_field_should_be_in="other_fields",
         also_this_field_should_be_in="other_fields2",
     )
+
+
+@pytest.mark.django_db
+def test_dimension_filter():
+    event, _ = Event.get_or_create_dummy()
+
+    tag_dimension = Dimension.objects.create(event=event, slug="tag", title=dict(en="Tag"))
+    room_dimension = Dimension.objects.create(event=event, slug="room", title=dict(en="Room"))
+    tag_values = {
+        slug: DimensionValue.objects.create(dimension=tag_dimension, slug=slug, title=dict(en=slug))
+        for slug in ["cosplay", "anime", "k18"]
+    }
+    room_values = {
+        slug: DimensionValue.objects.create(dimension=room_dimension, slug=slug, title=dict(en=slug))
+        for slug in ["main-hall", "workshop"]
+    }
+
+    def make_program(slug: str, tags: list[str], room: str) -> Program:
+        program = Program.objects.create(event=event, slug=slug, title=slug)
+        ProgramDimensionValue.objects.bulk_create(
+            [ProgramDimensionValue(program=program, dimension=tag_dimension, value=tag_values[tag]) for tag in tags]
+            + [ProgramDimensionValue(program=program, dimension=room_dimension, value=room_values[room])]
+        )
+        program.cached_dimensions = dict(tag=tags, room=[room])
+        program.save(update_fields=["cached_dimensions"])
+        return program
+
+    both = make_program("both", ["cosplay", "anime"], "main-hall")
+    anime = make_program("anime", ["anime"], "workshop")
+    neither = make_program("neither", ["k18"], "main-hall")
+
+    programs = Program.objects.filter(event=event)
+
+    def filter_programs(*filters: tuple[str, list[str]]) -> list[Program]:
+        filter_inputs = [DimensionFilterInput(dimension=dimension, values=values) for dimension, values in filters]
+        result = list(DimensionFilterInput.filter(programs, filter_inputs).order_by("slug"))
+        cached_result = list(
+            DimensionFilterInput.filter(programs, filter_inputs, DimensionFilterMode.CACHED).order_by("slug")
+        )
+        assert cached_result == result
+        return result
+
+    # multiple matching values must not cause duplicate rows
+    assert filter_programs(("tag", ["cosplay", "anime"])) == [anime, both]
+    assert filter_programs(("tag", ["cosplay", "anime"]), ("room", ["main-hall"])) == [both]
+    assert filter_programs(("tag", ["anime"]), ("tag", ["cosplay"])) == [both]
+    assert filter_programs(("tag", ["nonexistent"])) == []
+    assert filter_programs(("nonexistent", ["anime"])) == []
+    assert len(filter_programs()) == 3
+
+    # values of the same dimension are ORed, dimensions are ANDed
+    with_dimensions = programs.with_dimensions(dict(tag=["cosplay", "k18"], room=["main-hall"]))
+    assert list(with_dimensions.order_by("slug")) == [both, neither]
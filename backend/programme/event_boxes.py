@@ -0,0 +1,9 @@
+from core.event_box_registry import ModelInvalidation, register
+
+from .views import programme_event_box_context
+
+register(
+    "programme",
+    programme_event_box_context,
+    invalidated_by=[ModelInvalidation("programme.ProgrammeEventMeta")],
+)
@@ -1 +1 @@
-from . import role, room, view, view_room
+from . import role, room, schedule_cache, view, view_room
@@ -0,0 +1,57 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from ..models import (
+    Category,
+    FreeformOrganizer,
+    Programme,
+    ProgrammeEventMeta,
+    ProgrammeRole,
+    Room,
+    SpecialStartTime,
+    Tag,
+    TimeBlock,
+    View,
+    ViewRoom,
+)
+from ..schedule_cache import bump_schedule_version
+
+
+def get_event_id(instance) -> int | None:
+    match instance:
+        case Programme():
+            return Category.objects.filter(id=instance.category_id).values_list("event_id", flat=True).first()
+        case ProgrammeRole() | FreeformOrganizer():
+            return (
+                Programme.objects.filter(id=instance.programme_id).values_list("category__event_id", flat=True).first()
+            )
+        case ViewRoom():
+            return View.objects.filter(id=instance.view_id).values_list("event_id", flat=True).first()
+        case _:
+            return instance.event_id
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=FreeformOrganizer)
+@receiver([post_save, post_delete], sender=Programme)
+@receiver([post_save, post_delete], sender=ProgrammeEventMeta)
+@receiver([post_save, post_delete], sender=ProgrammeRole)
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=SpecialStartTime)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=TimeBlock)
+@receiver([post_save, post_delete], sender=View)
+@receiver([post_save, post_delete], sender=ViewRoom)
+def schedule_changed(sender, instance, **kwargs):
+    if event_id := get_event_id(instance):
+        bump_schedule_version(event_id)
+
+
+@receiver(m2m_changed, sender=Programme.tags.through)
+def programme_tags_changed(sender, instance, action, reverse, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        if reverse:
+            # tag.programme_set.add(...)
+            bump_schedule_version(instance.event_id)
+        else:
+            schedule_changed(Programme, instance)
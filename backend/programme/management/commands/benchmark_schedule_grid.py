@@ -0,0 +1,136 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from dateutil.tz import tzlocal
+from django.core.management.base import BaseCommand
+
+from ...models import Programme, Room, ScheduleGrid
+
+ONE_HOUR = timedelta(hours=1)
+FIRST_DAY = datetime(2024, 7, 26, 10, 0, tzinfo=tzlocal())
+HOURS_PER_DAY = 14
+LENGTHS_MINUTES = [45, 60, 60, 90, 120, 180, 240]
+EMPTY_PROBABILITY = 0.3
+SPECIAL_START_TIME_PROBABILITY = 0.1
+
+
+def make_schedule(rng: random.Random, num_rooms: int, num_days: int):
+    """
+    Generates unsaved rooms and programmes for a synthetic event with one time block per day.
+    Some programmes start at special start times (half past) and some overlap.
+    """
+    rooms = [Room(id=room_id, name=f"Room {room_id}") for room_id in range(1, num_rooms + 1)]
+
+    hourly_start_times = [
+        FIRST_DAY + timedelta(days=day) + hour * ONE_HOUR
+        for day in range(num_days)
+        for hour in range(HOURS_PER_DAY + 1)
+    ]
+    start_times = list(hourly_start_times)
+
+    programmes = []
+    for room in rooms:
+        for start_time in hourly_start_times:
+            if rng.random() < EMPTY_PROBABILITY:
+                continue
+
+            if rng.random() < SPECIAL_START_TIME_PROBABILITY:
+                start_time += ONE_HOUR / 2
+                start_times.append(start_time)
+
+            length = rng.choice(LENGTHS_MINUTES)
+            programmes.append(
+                Programme(
+                    id=len(programmes) + 1,
+                    title=f"Programme {len(programmes) + 1}",
+                    room=room,
+                    start_time=start_time,
+                    length=length,
+                    end_time=start_time + timedelta(minutes=length),
+                )
+            )
+
+    return start_times, rooms, programmes
+
+
+def get_rows_naive(start_times: list[datetime], rooms: list[Room], programmes: list[Programme]):
+    """
+    The grid as computed by ViewMethodsMixin.get_programmes_by_start_time before ScheduleGrid,
+    with the database queries replaced by scans over the in-memory programmes.
+    """
+    start_times = sorted(set(start_times))
+    results = []
+    prev_start_time = None
+
+    for start_time in start_times:
+        cur_row = []
+
+        incontinuity = prev_start_time and (start_time - prev_start_time > ONE_HOUR)
+        incontinuity = "incontinuity" if incontinuity else ""
+        prev_start_time = start_time
+
+        results.append((start_time, incontinuity, cur_row))
+        for room in rooms:
+            room_programmes = [p for p in programmes if p.room_id == room.id]
+            starting = sorted(
+                (p for p in room_programmes if p.start_time == start_time),
+                key=lambda p: p.end_time,
+            )
+            if starting:
+                programme = starting[0]
+                rowspan = len([t for t in start_times if programme.start_time <= t < programme.end_time])
+                cur_row.append((programme, rowspan))
+            else:
+                earlier = sorted(
+                    (p for p in room_programmes if p.start_time < start_time),
+                    key=lambda p: (p.start_time, p.end_time),
+                )
+                if not (earlier and start_time < earlier[-1].end_time):
+                    cur_row.append((None, None))
+
+    return results
+
+
+class Command(BaseCommand):
+    help = "Benchmarks ScheduleGrid against the previous per-cell algorithm using a synthetic event"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=40)
+        parser.add_argument("--days", type=int, default=3)
+        parser.add_argument("--rounds", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--skip-naive",
+            action="store_true",
+            help="Do not run the (slow) reference implementation",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        start_times, rooms, programmes = make_schedule(rng, options["rooms"], options["days"])
+
+        self.stdout.write(
+            f"{len(rooms)} rooms, {len(set(start_times))} start times, {len(programmes)} programmes "
+            f"({len(rooms) * len(set(start_times))} cells)"
+        )
+
+        timings = []
+        for _ in range(options["rounds"]):
+            t0 = time.perf_counter()
+            rows = ScheduleGrid(start_times, rooms, programmes).get_rows()
+            timings.append(time.perf_counter() - t0)
+        self.stdout.write(f"ScheduleGrid: best of {options['rounds']}: {min(timings):.3f} s")
+
+        if options["skip_naive"]:
+            return
+
+        t0 = time.perf_counter()
+        naive_rows = get_rows_naive(start_times, rooms, programmes)
+        self.stdout.write(
+            f"Naive: {time.perf_counter() - t0:.3f} s "
+            "(before ScheduleGrid, each empty cell and rowspan was also a database query)"
+        )
+
+        if rows != naive_rows:
+            raise AssertionError("ScheduleGrid produced a different grid")
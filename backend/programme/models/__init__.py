@@ -10,6 +10,7 @@ from .role import Role
 from .room import Room
 from .schedule import (
     AllRoomsPseudoView,
+    ScheduleGrid,
     SpecialStartTime,
     TimeBlock,
     View,
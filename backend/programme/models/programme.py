@@ -1,8 +1,12 @@
+import json
 import logging
+from collections.abc import Iterable, Iterator
 from datetime import timedelta
 from functools import cached_property
+from itertools import batched
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
 from django.db import models
 from django.db.models import Q
@@ -1471,6 +1475,36 @@ class Programme(models.Model, CsvExportMixin):
 
         return ", ".join(parts)
 
+    @classmethod
+    def prefetch_formatted_hosts(cls, programmes: Iterable["Programme"]):
+        """
+        Computes formatted_hosts for many programmes in two queries instead of two per programme.
+        """
+        from .freeform_organizer import FreeformOrganizer
+        from .programme_role import ProgrammeRole
+
+        programmes = list(programmes)
+        parts_by_programme_id: dict[int, list[str]] = {
+            programme.id: [] for programme in programmes if not programme.hosts_from_host
+        }
+
+        for programme_id, text in FreeformOrganizer.objects.filter(
+            programme_id__in=parts_by_programme_id,
+        ).values_list("programme_id", "text"):
+            parts_by_programme_id[programme_id].append(text)
+
+        for programme_role in ProgrammeRole.objects.filter(
+            programme_id__in=parts_by_programme_id,
+            role__is_public=True,
+        ).select_related("person"):
+            parts_by_programme_id[programme_role.programme_id].append(programme_role.person.display_name)
+
+        for programme in programmes:
+            if programme.hosts_from_host:
+                programme.formatted_hosts = programme.hosts_from_host
+            else:
+                programme.formatted_hosts = ", ".join(parts_by_programme_id[programme.id])
+
     @property
     def is_blank(self):
         return False
@@ -1587,7 +1621,7 @@ class Programme(models.Model, CsvExportMixin):
                 location=self.room.name if self.room else None,
                 location_slug=self.room.slug if self.room else None,
                 presenter=self.formatted_hosts,
-                tags=list(self.tags.values_list("slug", flat=True)),
+                tags=[tag.slug for tag in self.tags.all()],
             )
         elif format == "ropecon":
             return pick_attrs(
@@ -1612,7 +1646,7 @@ class Programme(models.Model, CsvExportMixin):
                 if self.form_used and self.form_used.slug == "tyopaja"
                 else None,
                 identifier=f"p{self.id}",
-                tags=list(self.tags.values_list("slug", flat=True)),
+                tags=[tag.slug for tag in self.tags.all()],
                 ropecon2023_language=self.ropecon2023_language,
                 ropecon2023_suitable_for_all_ages=self.ropecon2023_suitable_for_all_ages,
                 ropecon2023_aimed_at_children_under_13=self.ropecon2023_aimed_at_children_under_13,
@@ -1673,6 +1707,30 @@ class Programme(models.Model, CsvExportMixin):
         else:
             raise NotImplementedError(format)
 
+    @classmethod
+    def as_json_chunks(
+        cls,
+        programmes: models.QuerySet["Programme"],
+        format="default",
+        chunk_size=500,
+    ) -> Iterator[str]:
+        """
+        Serializes programmes as a JSON array in `as_json` format, yielding it in pieces.
+        Related objects used by `as_json` are loaded in a fixed number of queries per chunk
+        of programmes instead of several queries per programme.
+        """
+        programmes = programmes.select_related("category__event", "room", "form_used").prefetch_related("tags")
+
+        yield "["
+        separator = ""
+        for chunk in batched(programmes.iterator(chunk_size=chunk_size), chunk_size):
+            cls.prefetch_formatted_hosts(chunk)
+            for programme in chunk:
+                yield separator
+                yield json.dumps(programme.as_json(format=format), cls=DjangoJSONEncoder)
+                separator = ","
+        yield "]"
+
     @property
     def ropecon_genres(self):
         found_genres = []
@@ -1857,11 +1915,10 @@ class Programme(models.Model, CsvExportMixin):
 
         from badges.models import Badge
 
-        for person in self.organizers.all():
-            Badge.ensure(event=self.event, person=person)
+        persons = list(self.organizers.all())
+        persons.extend(deleted_programme_role.person for deleted_programme_role in deleted_programme_roles)
 
-        for deleted_programme_role in deleted_programme_roles:
-            Badge.ensure(event=self.event, person=deleted_programme_role.person)
+        Badge.ensure_many(event=self.event, persons=persons)
 
     @classmethod
     def _get_in_states(cls, person, states, q=None, **extra_criteria):
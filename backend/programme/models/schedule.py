@@ -1,6 +1,8 @@
 import logging
+from bisect import bisect_left
 from collections import defaultdict
-from datetime import timedelta
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
 from typing import Any
 
 from dateutil.tz import tzlocal
@@ -46,16 +48,108 @@ class OrderingMixin:
         swappee.save()
 
 
+class ScheduleGrid:
+    """
+    Lays out programmes in a grid of start times (rows) × rooms (columns) in memory.
+
+    A cell is either a programme starting at that time in that room together with its rowspan,
+    (None, None) for an empty cell, or omitted altogether if a programme that started earlier
+    still continues in that room (it is covered by that programme's rowspan).
+
+    All inputs are loaded up front (see ViewMethodsMixin.get_schedule_grid), so laying out
+    the grid does not cause any further database queries.
+    """
+
+    def __init__(
+        self,
+        start_times: Sequence[datetime],
+        rooms: Sequence[Room],
+        programmes: Iterable[Programme],
+    ):
+        self.start_times = sorted(set(start_times))
+        self.rooms = list(rooms)
+
+        # room id -> programmes in that room ordered by start time (and end time for ties)
+        self.programmes_by_room_id: dict[int, list[Programme]] = defaultdict(list)
+        for programme in programmes:
+            self.programmes_by_room_id[programme.room_id].append(programme)  # type: ignore
+        for room_programmes in self.programmes_by_room_id.values():
+            room_programmes.sort(key=lambda programme: (programme.start_time, self.get_end_time(programme)))
+
+        # (room, start time) pairs that have multiple programmes starting at the same time
+        self.overlaps: list[tuple[Room, datetime]] = []
+
+    @staticmethod
+    def get_end_time(programme: Programme) -> datetime:
+        if programme.end_time is not None:
+            return programme.end_time
+
+        return programme.start_time + timedelta(minutes=programme.length)  # type: ignore
+
+    def get_slot_index(self, t: datetime) -> int:
+        """
+        Returns the index of the first start time that is at or after t.
+        """
+        return bisect_left(self.start_times, t)
+
+    def rowspan(self, programme: Programme) -> int:
+        """
+        Number of start times within [programme start time, programme end time).
+        """
+        return self.get_slot_index(self.get_end_time(programme)) - self.get_slot_index(programme.start_time)  # type: ignore
+
+    def get_rows(self) -> list[tuple[datetime, str, list[tuple[Programme | None, int | None]]]]:
+        rows = [(start_time, []) for start_time in self.start_times]
+        self.overlaps = []
+
+        for room in self.rooms:
+            room_programmes = self.programmes_by_room_id.get(room.id, [])
+            next_index = 0
+            latest_end_time: datetime | None = None
+
+            for start_time, cur_row in rows:
+                # the latest programme that started before this start time decides whether this cell is covered
+                while next_index < len(room_programmes) and room_programmes[next_index].start_time < start_time:
+                    latest_end_time = self.get_end_time(room_programmes[next_index])
+                    next_index += 1
+
+                end_index = next_index
+                while end_index < len(room_programmes) and room_programmes[end_index].start_time == start_time:
+                    end_index += 1
+                starting_programmes = room_programmes[next_index:end_index]
+
+                if starting_programmes:
+                    if len(starting_programmes) > 1:
+                        self.overlaps.append((room, start_time))
+
+                    programme = starting_programmes[0]
+                    cur_row.append((programme, self.rowspan(programme)))
+                elif latest_end_time is not None and start_time < latest_end_time:
+                    # programme still continues, handled by rowspan
+                    pass
+                else:
+                    # there is no (visible) programme in the room at start_time, insert a blank
+                    cur_row.append((None, None))
+
+        results = []
+        prev_start_time = None
+        for start_time, cur_row in rows:
+            incontinuity = prev_start_time and (start_time - prev_start_time > ONE_HOUR)
+            incontinuity = "incontinuity" if incontinuity else ""
+            prev_start_time = start_time
+
+            results.append((start_time, incontinuity, cur_row))
+
+        return results
+
+
 class ViewMethodsMixin:
     @property
     def programmes_by_start_time(self):
         return self.get_programmes_by_start_time()
 
-    def get_programmes_by_start_time(self, include_unpublished=False, request=None):
-        results = []
-        prev_start_time = None
-        cont_criteria = dict() if include_unpublished else dict(state="published")
-        rooms = self.rooms.all()
+    def get_schedule_grid(self, include_unpublished=False) -> ScheduleGrid:
+        rooms = list(self.rooms.all())
 
         criteria = dict(
             category__event=self.event,
@@ -66,57 +160,42 @@ class ViewMethodsMixin:
         if not include_unpublished:
             criteria.update(state="published")
 
-        # programme_index[start_time][room] = list of programmes
-        # TODO select_related
-        programme_index = defaultdict(lambda: defaultdict(list))
-        programmes = (
+        programmes = list(
             Programme.objects.filter(**criteria)
             .select_related("category__event")
             .select_related("room")
             .prefetch_related("tags")
         )
-        for programme in programmes:
-            programme_index[programme.start_time][programme.room_id].append(programme)
-
-        for start_time in self.start_times():
-            cur_row = []
-
-            incontinuity = prev_start_time and (start_time - prev_start_time > ONE_HOUR)
-            incontinuity = "incontinuity" if incontinuity else ""
-            prev_start_time = start_time
+        # the schedule shows the hosts of every programme
+        Programme.prefetch_formatted_hosts(programmes)
 
-            results.append((start_time, incontinuity, cur_row))
-            for room in rooms:
-                programmes = programme_index[start_time][room.id]
-                num_programmes = len(programmes)
-                if num_programmes == 0:
-                    if room.programme_continues_at(start_time, **cont_criteria):
-                        # programme still continues, handled by rowspan
-                        pass
-                    else:
-                        # there is no (visible) programme in the room at start_time, insert a blank
-                        cur_row.append((None, None))
-                else:
-                    if num_programmes > 1:
-                        logger.warning("Room %s has multiple programs starting at %s", room, start_time)
+        return ScheduleGrid(self.start_times(), rooms, programmes)
 
-                        if request is not None and self.event.programme_event_meta.is_user_admin(request.user):
-                            messages.warning(
-                                request,
-                                "Tilassa {room} on päällekkäisiä ohjelmanumeroita kello {start_time}".format(
-                                    room=room,
-                                    start_time=format_datetime(start_time.astimezone(tzlocal())),
-                                ),
-                            )
+    def get_programmes_by_start_time(self, include_unpublished=False, request=None):
+        grid = self.get_schedule_grid(include_unpublished=include_unpublished)
+        results = grid.get_rows()
 
-                    programme = programmes[0]
+        for room, start_time in grid.overlaps:
+            logger.warning("Room %s has multiple programs starting at %s", room, start_time)
 
-                    rowspan = self.rowspan(programme)
-                    cur_row.append((programme, rowspan))
+            if request is not None and self.event.programme_event_meta.is_user_admin(request.user):
+                messages.warning(
+                    request,
+                    "Tilassa {room} on päällekkäisiä ohjelmanumeroita kello {start_time}".format(
+                        room=room,
+                        start_time=format_datetime(start_time.astimezone(tzlocal())),
+                    ),
+                )
 
         return results
 
-    def start_times(self, programme=None):
+    def _get_start_times(self) -> list[datetime]:
+        """
+        All start times of the view in order. Loaded once per view instance.
+        """
+        if (start_times := getattr(self, "_start_times", None)) is not None:
+            return start_times
+
         result = [t.start_time for t in SpecialStartTime.objects.filter(event=self.event)]
 
         for time_block in TimeBlock.objects.filter(event=self.event):
@@ -125,16 +204,22 @@ class ViewMethodsMixin:
                 result.append(cur)
                 cur += ONE_HOUR
 
-        if programme:
-            result = [i for i in result if programme.start_time <= i < programme.end_time]
-
         if self.start_time:
             result = [i for i in result if i >= self.start_time]
 
         if self.end_time:
             result = [i for i in result if i < self.end_time]
 
-        return sorted(set(result))
+        self._start_times = sorted(set(result))
+        return self._start_times
+
+    def start_times(self, programme=None):
+        result = self._get_start_times()
+
+        if programme:
+            result = [i for i in result if programme.start_time <= i < programme.end_time]
+
+        return list(result)
 
     def rowspan(self, programme):
         return len(self.start_times(programme=programme))
@@ -0,0 +1,101 @@
+"""
+Versioned cache for the public schedule and the JSON feeds of an event.
+
+Each event has a schedule version that is bumped whenever something shown in the schedule
+is saved or deleted (see handlers/schedule_cache.py). Cached content remembers the version
+it was built from and is rebuilt once the version changes or the content gets older than
+KOMPASSI_PROGRAMME_SCHEDULE_CACHE_MAX_AGE_SECONDS. The max age catches changes that do not
+go through model signals (eg. QuerySet.update, people changing their names) and things that
+depend on the current time (eg. feedback links).
+
+Only one request rebuilds stale content at a time. Others keep serving the stale content
+meanwhile instead of all of them rebuilding it at once.
+"""
+
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.utils import on_commit_once
+
+VERSION_KEY = "programme:schedule_version:{event_id}"
+CONTENT_KEY = "programme:schedule_content:{event_id}:{variant}"
+LOCK_KEY = "programme:schedule_content:{event_id}:{variant}:lock"
+
+# stale content is served while being rebuilt, so keep it around for much longer than the max age
+CONTENT_TIMEOUT_SECONDS = 24 * 60 * 60
+LOCK_TIMEOUT_SECONDS = 60
+
+
+class CachedContent(NamedTuple):
+    version: int
+    built_at: float
+    content: str
+
+
+def get_schedule_version(event_id: int) -> int:
+    key = VERSION_KEY.format(event_id=event_id)
+    version = cache.get(key)
+
+    if version is None:
+        # Start from the current time so that a version evicted from the cache is not reused
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+
+    return version
+
+
+def _bump_schedule_version(event_id: int):
+    key = VERSION_KEY.format(event_id=event_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # not in cache
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_schedule_version(event_id: int):
+    """
+    Invalidates the cached schedule of the event once the current transaction commits.
+    Multiple bumps of the same event during a transaction are coalesced into one.
+    """
+    on_commit_once(
+        partial(_bump_schedule_version, event_id),
+        key=("programme.bump_schedule_version", event_id),
+    )
+
+
+def get_cached_content(event_id: int, variant: str, build: Callable[[], str]) -> str:
+    """
+    Returns the content identified by variant (eg. "json:desucon") for the current schedule version
+    of the event. If it is not cached, calls build to build it.
+    """
+    version = get_schedule_version(event_id)
+    content_key = CONTENT_KEY.format(event_id=event_id, variant=variant)
+    lock_key = LOCK_KEY.format(event_id=event_id, variant=variant)
+
+    cached: CachedContent | None = cache.get(content_key)
+    if (
+        cached is not None
+        and cached.version == version
+        and time.time() - cached.built_at < settings.KOMPASSI_PROGRAMME_SCHEDULE_CACHE_MAX_AGE_SECONDS
+    ):
+        return cached.content
+
+    have_lock = cache.add(lock_key, True, LOCK_TIMEOUT_SECONDS)
+    if cached is not None and not have_lock:
+        # someone else is already rebuilding it
+        return cached.content
+
+    try:
+        content = build()
+        cache.set(content_key, CachedContent(version, time.time(), content), CONTENT_TIMEOUT_SECONDS)
+    finally:
+        if have_lock:
+            cache.delete(lock_key)
+
+    return content
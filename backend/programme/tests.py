@@ -1,15 +1,21 @@
+import json
 from datetime import datetime, timedelta
 
 import pytest
 from dateutil.tz import tzlocal
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 
-from access.models import EmailAliasDomain, GroupPrivilege, InternalEmailAlias, Privilege, SlackAccess
+from access.models import CBACEntry, EmailAliasDomain, GroupPrivilege, InternalEmailAlias, Privilege, SlackAccess
+from core.models import Person
+from core.utils import assert_max_queries, profile_queries
 from labour.models import Signup
 from mailings.models import Message, PersonMessage, RecipientGroup
 
-from .models import Programme, ProgrammeEventMeta, ProgrammeRole
+from .models import FreeformOrganizer, Programme, ProgrammeEventMeta, ProgrammeRole, Room, Tag, TimeBlock, View
 from .utils import next_full_hour
 
 
@@ -143,7 +149,7 @@ class ProgrammeTestCase(TestCase):
 
 
 @pytest.mark.django_db
-def test_programme_mass_messages():
+def test_programme_mass_messages(mailoutbox):
     """
     Tests two programme message use cases:
     1. A programme message is sent before a programme host is added. They get the message when added.
@@ -183,3 +189,159 @@ def test_programme_mass_messages():
     person_message2 = PersonMessage.objects.get(message=message2)
 
     assert person_message2.person == person
+
+    assert [email.subject for email in mailoutbox] == ["Message 1", "Message 2"]
+
+
+def test_schedule_grid():
+    """
+    ScheduleGrid must produce the same grid as the previous per-cell algorithm.
+    """
+    import random
+
+    from .management.commands.benchmark_schedule_grid import get_rows_naive, make_schedule
+    from .models import ScheduleGrid
+
+    start_times, rooms, programmes = make_schedule(random.Random(0), num_rooms=5, num_days=2)
+
+    assert ScheduleGrid(start_times, rooms, programmes).get_rows() == get_rows_naive(start_times, rooms, programmes)
+
+
+@pytest.mark.django_db
+def test_json_view_schedule_cache(client, django_capture_on_commit_callbacks):
+    programme, _ = Programme.get_or_create_dummy()
+    event = programme.category.event
+    url = f"/api/v1/events/{event.slug}/programme"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [p["title"] for p in response.json()] == ["Dummy program"]
+    etag = response["ETag"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        programme.title = "Renamed program"
+        programme.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert [p["title"] for p in response.json()] == ["Renamed program"]
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_programme_as_json_chunks_query_count():
+    def make_programmes(num_programmes):
+        for i in range(num_programmes):
+            programme, _ = Programme.get_or_create_dummy(title=f"Dummy program {i}")
+            ProgrammeRole.get_or_create_dummy(programme=programme)
+            FreeformOrganizer.objects.get_or_create(programme=programme, text=f"Organizer {i}")
+            tag, _ = Tag.objects.get_or_create(event=programme.category.event, title=f"Tag {i}")
+            programme.tags.add(tag)
+
+    def count_queries(format):
+        with CaptureQueriesContext(connection) as queries:
+            programmes = json.loads("".join(Programme.as_json_chunks(Programme.objects.all(), format=format)))
+        return len(queries), programmes
+
+    formats = ["default", "desucon", "ropecon", "hitpoint"]
+
+    make_programmes(1)
+    query_counts = {format: count_queries(format)[0] for format in formats}
+
+    make_programmes(5)
+    for format in formats:
+        num_queries, programmes = count_queries(format)
+        assert len(programmes) == 5
+        assert num_queries == query_counts[format], format
+
+    # bulk formatted_hosts must agree with the one computed per programme
+    _, programmes = count_queries("default")
+    assert [p["formatted_hosts"] for p in programmes] == [
+        Programme.objects.get(title=p["title"]).formatted_hosts for p in programmes
+    ]
+
+
+@pytest.mark.django_db
+def test_schedule_view_query_budget(client):
+    """
+    Rendering the schedule should take a constant number of queries regardless of the number of programmes.
+    """
+    meta, _ = ProgrammeEventMeta.get_or_create_dummy()
+    event = meta.event
+    room, _ = Room.get_or_create_dummy()
+    view = View.objects.create(event=event, name="Dummy view", public=True, order=10)
+    view.rooms = [room]
+
+    start_time = datetime(2024, 7, 6, 10, 0, tzinfo=tzlocal())
+    TimeBlock.objects.create(event=event, start_time=start_time, end_time=start_time + timedelta(hours=12))
+
+    def make_programmes(first, last):
+        for i in range(first, last):
+            programme, _ = Programme.get_or_create_dummy(title=f"Dummy program {i}")
+            programme.room = room
+            programme.start_time = start_time + timedelta(hours=i)
+            programme.length = 60
+            programme.save()
+            ProgrammeRole.get_or_create_dummy(programme=programme)
+            FreeformOrganizer.objects.get_or_create(programme=programme, text=f"Organizer {i}")
+
+    def get_schedule():
+        # the schedule fragment is cached between requests
+        cache.clear()
+        response = client.get(f"/events/{event.slug}/programme")
+        assert response.status_code == 200
+        return response.content.decode()
+
+    make_programmes(0, 1)
+    with profile_queries() as profile:
+        get_schedule()
+
+    make_programmes(1, 6)
+    with assert_max_queries(profile.num_queries):
+        content = get_schedule()
+
+    assert "Dummy program 5" in content
+    assert "Organizer 5" in content
+
+
+@pytest.mark.django_db
+def test_schedule_view_overlap_warnings(client):
+    """
+    The schedule fragment is shared, but programme admins still get warnings about overlapping programmes.
+    """
+    meta, _ = ProgrammeEventMeta.get_or_create_dummy()
+    event = meta.event
+    room, _ = Room.get_or_create_dummy()
+    view = View.objects.create(event=event, name="Dummy view", public=True, order=10)
+    view.rooms = [room]
+
+    start_time = datetime(2024, 7, 6, 10, 0, tzinfo=tzlocal())
+    TimeBlock.objects.create(event=event, start_time=start_time, end_time=start_time + timedelta(hours=12))
+
+    for title in ["Dummy program 1", "Dummy program 2"]:
+        programme, _ = Programme.get_or_create_dummy(title=title)
+        programme.room = room
+        programme.start_time = start_time
+        programme.length = 60
+        programme.save()
+
+    url = f"/events/{event.slug}/programme"
+    warning = "päällekkäisiä ohjelmanumeroita"
+    cache.clear()
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert warning not in response.content.decode()
+
+    person, _ = Person.get_or_create_dummy()
+    meta.admin_group.user_set.add(person.user)
+    CBACEntry.ensure_admin_group_privileges_for_event(event)
+    client.force_login(person.user)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert warning in response.content.decode()
+    assert "max-age=0" in response["Cache-Control"]
@@ -2,17 +2,22 @@ from django.contrib.auth.decorators import user_passes_test
 from django.http import HttpResponse
 from django.shortcuts import render
 from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
-from django.views.decorators.cache import cache_control, cache_page
-from django.views.decorators.http import require_safe
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import conditional_page, require_safe
 
 from api.utils import api_view
+from core.event_box_registry import EventBoxContext
 from core.sort_and_filter import Filter
 from core.tabs import Tab
 from core.utils import url
 
 from ..helpers import group_programmes_by_start_time, programme_event_required, public_programme_required
 from ..models import AllRoomsPseudoView, Category, Programme, Room, View
+from ..schedule_cache import get_cached_content
 
 
 def get_schedule_tabs(request, event):
@@ -34,12 +39,13 @@ SCHEDULE_TEMPLATES = dict(
     reasonable="programme_schedule_view.pug",
     full_width="programme_full_width_schedule_view.pug",
 )
+SCHEDULE_FRAGMENT_TEMPLATE = "programme_schedule_fragment.pug"
 
 
 @public_programme_required
 @cache_control(public=True, max_age=5 * 60)
-@cache_page(5 * 60)  # XXX remove once nginx cache is in place
 @require_safe
+@conditional_page
 def schedule_view(
     request,
     event,
@@ -47,20 +53,48 @@ def schedule_view(
     template=None,
     show_programme_actions=False,
 ):
+    # The schedule fragment is the same for everyone, but the page around it may contain messages etc.
+    # so only the fragment is shared. It is rendered without the request for the same reason.
+    schedule_fragment = get_cached_content(
+        event.id,
+        f"schedule_fragment:{get_language()}:{internal_programmes}:{show_programme_actions}",
+        lambda: render_to_string(
+            SCHEDULE_FRAGMENT_TEMPLATE,
+            get_schedule_vars(
+                event,
+                internal_programmes=internal_programmes,
+                show_programme_actions=show_programme_actions,
+            ),
+        ),
+    )
+
+    if template == SCHEDULE_FRAGMENT_TEMPLATE:
+        return HttpResponse(schedule_fragment)
+
+    if template is None:
+        template = SCHEDULE_TEMPLATES[event.programme_event_meta.schedule_layout]
+
+    # Overlap warnings are for programme admins only, so they cannot be a part of the shared fragment
+    is_admin = event.programme_event_meta.is_user_admin(request.user)
+    if is_admin:
+        _views, all_rooms = get_views_and_all_rooms(event, internal_programmes)
+        all_rooms.get_programmes_by_start_time(request=request)
+
     vars = dict(
+        event=event,
+        schedule_fragment=mark_safe(schedule_fragment),
         # hide the user menu to prevent it getting cached
         login_page=True,
         tabs=get_schedule_tabs(request, event),
     )
 
-    return actual_schedule_view(
-        request,
-        event,
-        internal_programmes=internal_programmes,
-        template=template,
-        vars=vars,
-        show_programme_actions=show_programme_actions,
-    )
+    response = render(request, template, vars)
+
+    if is_admin:
+        # do not let shared caches reuse the page with the warnings (cache_control keeps the smaller max-age)
+        patch_cache_control(response, max_age=0)
+
+    return response
 
 
 # look, no cache
@@ -100,15 +134,37 @@ def actual_schedule_view(
     if not vars:
         vars = dict()
 
+    vars.update(
+        get_schedule_vars(
+            event,
+            internal_programmes=internal_programmes,
+            show_programme_actions=show_programme_actions,
+            request=request,
+        )
+    )
+
+    return render(request, template, vars)
+
+
+def get_views_and_all_rooms(event, internal_programmes=False):
     query = dict(event=event)
     if not internal_programmes:
         query.update(public=True)
 
     views = View.objects.filter(**query)
     rooms = Room.objects.filter(view_rooms__view__in=views).distinct()
-    all_rooms = AllRoomsPseudoView(event, rooms=rooms)
 
-    vars.update(
+    return views, AllRoomsPseudoView(event, rooms=rooms)
+
+
+def get_schedule_vars(event, internal_programmes=False, show_programme_actions=False, request=None):
+    query = dict(event=event)
+    if not internal_programmes:
+        query.update(public=True)
+
+    views, all_rooms = get_views_and_all_rooms(event, internal_programmes)
+
+    return dict(
         event=event,
         views=views,
         categories=Category.objects.filter(**query),
@@ -117,8 +173,6 @@ def actual_schedule_view(
         show_programme_actions=show_programme_actions,
     )
 
-    return render(request, template, vars)
-
 
 @public_programme_required
 @require_safe
@@ -191,13 +245,19 @@ def internal_dumpdata_view(request):
 
 
 @cache_control(public=True, max_age=1 * 60)
-@cache_page(1 * 60)  # XXX remove once nginx cache is in place
 @public_programme_required
 @require_safe
+@conditional_page
 def mobile_schedule_view(request, event):
     vars = dict(event=event)
 
-    return render(request, "programme_mobile_schedule.pug", vars)
+    return HttpResponse(
+        get_cached_content(
+            event.id,
+            f"mobile_schedule:{get_language()}",
+            lambda: render_to_string("programme_mobile_schedule.pug", vars, request=request),
+        )
+    )
 
 
 @programme_event_required
@@ -225,23 +285,21 @@ def plaintext_view(request, event):
 
 @programme_event_required
 @require_safe
+@conditional_page
 @api_view
 def json_view(request, event, format="default", include_unpublished=False):
-    criteria = dict(category__event=event)
+    def build():
+        criteria = dict(category__event=event)
 
-    if not include_unpublished:
-        criteria.update(state="published")
-
-    programmes = (
-        Programme.objects.filter(**criteria)
-        .select_related("category__event")
-        .select_related("room")
-        .prefetch_related("tags")
-        # Does not do the needful due to formatted_organizers operating on the "through" model
-        # .prefetch_related('organizers')
-    )
+        if not include_unpublished:
+            criteria.update(state="published")
 
-    return [programme.as_json(format=format) for programme in programmes]
+        return "".join(Programme.as_json_chunks(Programme.objects.filter(**criteria), format=format))
+
+    return HttpResponse(
+        get_cached_content(event.id, f"json:{format}:{include_unpublished}", build),
+        content_type="application/json",
+    )
 
 
 def programme_profile_menu_items(request):
@@ -260,6 +318,8 @@ def programme_profile_menu_items(request):
 
 
 def programme_event_box_context(request, event):
+    box = EventBoxContext.for_request(request, event)
+
     return dict(
-        is_programme_admin=event.programme_event_meta.is_user_admin(request.user),
+        is_programme_admin=box.is_user_admin(event.programme_event_meta),
     )
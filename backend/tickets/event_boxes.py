@@ -0,0 +1,9 @@
+from core.event_box_registry import ModelInvalidation, register
+
+from .views import tickets_event_box_context
+
+register(
+    "tickets",
+    tickets_event_box_context,
+    invalidated_by=[ModelInvalidation("tickets.TicketsEventMeta")],
+)
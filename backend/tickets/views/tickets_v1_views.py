@@ -4,6 +4,7 @@ from django.http import HttpResponseNotAllowed
 from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 
+from core.event_box_registry import EventBoxContext
 from core.utils import initialize_form, url
 from payments.models.checkout_payment import CHECKOUT_PAYMENT_WALL_ORIGIN
 
@@ -431,9 +432,6 @@ for num, phase in enumerate(ALL_PHASES):
 
 
 def tickets_event_box_context(request, event):
-    if event.tickets_event_meta:
-        is_tickets_admin = event.tickets_event_meta.is_user_admin(request.user)
-    else:
-        is_tickets_admin = False
+    box = EventBoxContext.for_request(request, event)
 
-    return dict(is_tickets_admin=is_tickets_admin)
+    return dict(is_tickets_admin=box.is_user_admin(event.tickets_event_meta))